@@ -3,18 +3,171 @@ Audio Capture Module
 Handles real-time audio input from microphone or instrument
 """
 
+import sys
+import threading
+import time
 import numpy as np
 from typing import Callable, Optional
 import config
 
-# Try to import sounddevice, but allow graceful degradation
-try:
-    import sounddevice as sd
-    AUDIO_AVAILABLE = True
-except (OSError, ImportError) as e:
-    AUDIO_AVAILABLE = False
-    print(f"Warning: Audio input not available ({e})")
-    print("Audio capture will not work, but other modules can still be used.")
+NO_ADC_TIME = float('nan')  # Ring entry for blocks without a driver timestamp
+
+# sounddevice (and PortAudio behind it) is loaded on first use so that
+# modules which never open a stream do not pay for it at startup
+_sd = None
+AUDIO_AVAILABLE: Optional[bool] = None  # None until the first load attempt
+
+
+def _load_sounddevice():
+    """Import sounddevice on first use, degrading gracefully if unavailable"""
+    global _sd, AUDIO_AVAILABLE
+    if AUDIO_AVAILABLE is None:
+        try:
+            import sounddevice
+            _sd = sounddevice
+            AUDIO_AVAILABLE = True
+        except (OSError, ImportError) as e:
+            AUDIO_AVAILABLE = False
+            print(f"Warning: Audio input not available ({e})", file=sys.stderr)
+            print("Audio capture will not work, but other modules can still be used.", file=sys.stderr)
+    return _sd
+
+
+def is_audio_available() -> bool:
+    """Check whether sounddevice/PortAudio can be used"""
+    return _load_sounddevice() is not None
+
+
+def get_adc_time(time_info) -> Optional[float]:
+    """
+    Capture time of a callback's first sample from PortAudio's time info
+    
+    Returns None when the host API does not provide it (reported as 0).
+    """
+    adc_time = getattr(time_info, 'inputBufferAdcTime', 0.0) if time_info is not None else 0.0
+    return float(adc_time) if adc_time else None
+
+
+class AudioRingBuffer:
+    """
+    Preallocated single-producer / single-consumer ring of audio blocks
+    
+    The audio callback is the only writer and the analysis worker the only
+    reader. Each side advances its own counter only, so neither needs a lock
+    and the callback never waits on analysis.
+    """
+    
+    def __init__(self, capacity: int = config.RING_BUFFER_BLOCKS,
+                 block_size: int = config.BUFFER_SIZE):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.blocks = np.zeros((capacity, block_size), dtype=np.float32)
+        self.frames = np.zeros(capacity, dtype=np.int64)
+        self.positions = np.zeros(capacity, dtype=np.int64)      # First sample index
+        self.adc_times = np.full(capacity, NO_ADC_TIME, dtype=np.float64)
+        self.write_count = 0  # Advanced by the producer only
+        self.read_count = 0   # Advanced by the consumer only
+        self.overflows = 0    # Blocks dropped because the ring was full
+    
+    def available(self) -> int:
+        """Number of blocks written but not yet consumed"""
+        return self.write_count - self.read_count
+    
+    def write(self, data: np.ndarray, position: int = 0,
+              adc_time: Optional[float] = None) -> bool:
+        """
+        Copy one block into the ring (producer side)
+        
+        Args:
+            data: 1-D audio block (longer blocks are truncated)
+            position: Sample index of the block's first sample
+            adc_time: Driver capture time of the first sample, if known
+            
+        Returns:
+            False if the ring was full and the block was dropped
+        """
+        if self.write_count - self.read_count >= self.capacity:
+            self.overflows += 1
+            return False
+        
+        slot = self.write_count % self.capacity
+        frames = min(len(data), self.block_size)
+        self.blocks[slot, :frames] = data[:frames]
+        self.frames[slot] = frames
+        self.positions[slot] = position
+        self.adc_times[slot] = NO_ADC_TIME if adc_time is None else adc_time
+        self.write_count += 1
+        return True
+    
+    def peek(self) -> Optional[np.ndarray]:
+        """
+        Get the oldest unread block (consumer side)
+        
+        The returned array is a view into the ring and stays valid only
+        until advance() is called.
+        """
+        if self.write_count == self.read_count:
+            return None
+        slot = self.read_count % self.capacity
+        return self.blocks[slot, :self.frames[slot]]
+    
+    def peek_timing(self) -> tuple:
+        """
+        Get (position, adc_time) of the block returned by peek()
+        
+        adc_time is None when the block had no driver timestamp.
+        """
+        slot = self.read_count % self.capacity
+        adc_time = self.adc_times[slot]
+        return int(self.positions[slot]), None if np.isnan(adc_time) else float(adc_time)
+    
+    def advance(self):
+        """Release the block returned by peek() back to the producer"""
+        if self.read_count < self.write_count:
+            self.read_count += 1
+    
+    def reset(self):
+        """Discard all pending blocks and counters"""
+        self.write_count = 0
+        self.read_count = 0
+        self.overflows = 0
+
+
+class AudioBlockPool:
+    """
+    Small pool of preallocated mono float32 blocks, reused in turn
+    
+    Used when the stream callback calls the analysis directly: each block is
+    copied into the next buffer instead of a fresh array, so capture does not
+    allocate. A block stays valid until the pool wraps around, i.e. for the
+    next size - 1 blocks.
+    """
+    
+    def __init__(self, size: int = config.BLOCK_POOL_SIZE,
+                 block_size: int = config.BUFFER_SIZE):
+        self.size = size
+        self.block_size = block_size
+        self.blocks = np.zeros((size, block_size), dtype=np.float32)
+        self.next_index = 0
+    
+    def fill(self, data: np.ndarray) -> np.ndarray:
+        """
+        Copy a block into the next buffer
+        
+        Args:
+            data: Audio as (frames,) or (frames, channels); only the first
+                  channel is kept
+        
+        Returns:
+            1-D contiguous view of the buffer holding the block
+        """
+        if data.ndim > 1:
+            data = data[:, 0]
+        frames = min(len(data), self.block_size)
+        block = self.blocks[self.next_index, :frames]
+        np.copyto(block, data[:frames])
+        self.next_index = (self.next_index + 1) % self.size
+        return block
 
 
 class AudioCapture:
@@ -22,39 +175,177 @@ class AudioCapture:
     
     def __init__(self, sample_rate: int = config.SAMPLE_RATE,
                  buffer_size: int = config.BUFFER_SIZE,
-                 channels: int = config.CHANNELS):
+                 channels: int = config.CHANNELS,
+                 threaded: bool = config.ANALYSIS_WORKER,
+                 ring_blocks: int = config.RING_BUFFER_BLOCKS):
         self.sample_rate = sample_rate
         self.buffer_size = buffer_size
         self.channels = channels
-        self.stream: Optional[sd.InputStream] = None
+        self.stream = None
         self.is_capturing = False
         self.audio_buffer = []
         
-    def start(self, callback: Callable[[np.ndarray, int], None]):
+        # Worker mode: the stream callback only copies into the ring buffer
+        # and a separate thread runs the (slow) analysis callback
+        self.threaded = threaded
+        self.ring_buffer = AudioRingBuffer(ring_blocks, buffer_size) if threaded else None
+        self.block_pool: Optional[AudioBlockPool] = None
+        self.worker: Optional[threading.Thread] = None
+        
+        # Overflow counters
+        self.input_overflows = 0  # Reported by PortAudio (audio lost before us)
+        self.status_events = 0    # Any non-empty callback status
+        self.blocks_captured = 0
+        self.blocks_processed = 0
+        self.worker_errors = 0
+        
+        # Samples delivered by the stream, including blocks later dropped
+        self.samples_captured = 0
+        self.with_timing = False
+        
+    def start(self, callback: Callable[..., None], with_timing: bool = False):
         """
         Start capturing audio
         
         Args:
             callback: Function to call with audio data (audio_chunk, sample_rate)
+            with_timing: Call callback(audio_chunk, sample_rate, position, adc_time)
+                         instead, where position is the sample index of the
+                         block's first sample since start and adc_time its
+                         driver capture time (None if the host API has none)
         """
-        if not AUDIO_AVAILABLE:
+        sd = _load_sounddevice()
+        if sd is None:
             raise RuntimeError("Audio input is not available. sounddevice/PortAudio not properly installed.")
         
-        def audio_callback(indata, frames, time_info, status):
-            if status:
-                print(f"Audio status: {status}")
-            # Convert to mono if needed
-            audio_data = indata[:, 0] if self.channels == 1 and indata.shape[1] > 1 else indata
-            callback(audio_data.copy(), self.sample_rate)
-        
-        self.stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            blocksize=self.buffer_size,
-            callback=audio_callback
-        )
-        self.stream.start()
+        self.reset_stats()
+        if self.threaded:
+            self.start_worker(callback, with_timing)
+            stream_callback = self._ring_callback
+        else:
+            self.block_pool = AudioBlockPool(config.BLOCK_POOL_SIZE, self.buffer_size)
+            self.with_timing = with_timing
+            stream_callback = lambda *args: self._direct_callback(callback, *args)
+        
+        try:
+            self.stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                blocksize=self.buffer_size,
+                dtype='float32',
+                callback=stream_callback
+            )
+            self.stream.start()
+        except Exception:
+            # The device could not be opened: do not leave the worker polling
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.stop()
+            raise
         self.is_capturing = True
+    
+    def reset_stats(self):
+        """Reset the capture health counters for a new session"""
+        self.input_overflows = 0
+        self.status_events = 0
+        self.blocks_captured = 0
+        self.blocks_processed = 0
+        self.worker_errors = 0
+        self.samples_captured = 0
+        if self.ring_buffer is not None:
+            self.ring_buffer.reset()
+    
+    def start_worker(self, callback: Callable[..., None], with_timing: bool = False):
+        """
+        Start the analysis worker thread that consumes the ring buffer
+        
+        Args:
+            callback: Function to call with each block (audio_chunk, sample_rate).
+                      The block is a view into the ring and must not be kept.
+            with_timing: Also pass the block's position and ADC time (see start)
+        """
+        if self.ring_buffer is None:
+            self.ring_buffer = AudioRingBuffer(config.RING_BUFFER_BLOCKS, self.buffer_size)
+        self.ring_buffer.reset()
+        self.samples_captured = 0
+        self.with_timing = with_timing
+        self.is_capturing = True
+        self.worker = threading.Thread(
+            target=self._worker_loop,
+            args=(callback,),
+            name='HonorHeroAnalysis',
+            daemon=True
+        )
+        self.worker.start()
+    
+    def _ring_callback(self, indata, frames, time_info, status):
+        """PortAudio callback in worker mode: count, copy, return"""
+        if status:
+            self.status_events += 1
+            if getattr(status, 'input_overflow', False):
+                self.input_overflows += 1
+        
+        position = self.samples_captured
+        self.samples_captured += frames
+        self.blocks_captured += 1
+        self.ring_buffer.write(indata[:, 0] if indata.ndim > 1 else indata,
+                               position, get_adc_time(time_info))
+    
+    def _direct_callback(self, callback: Callable[..., None], indata, frames, time_info, status):
+        """PortAudio callback without the worker: copy to a pooled block and analyze"""
+        if status:
+            print(f"Audio status: {status}")
+        position = self.samples_captured
+        self.samples_captured += frames
+        # Mono, 1-D and contiguous (PortAudio delivers (frames, channels))
+        audio_data = self.block_pool.fill(indata)
+        if self.with_timing:
+            callback(audio_data, self.sample_rate, position, get_adc_time(time_info))
+        else:
+            callback(audio_data, self.sample_rate)
+    
+    def _worker_loop(self, callback: Callable[..., None]):
+        """Consume blocks until capture stops and the ring is drained"""
+        ring = self.ring_buffer
+        idle_sleep = self.buffer_size / self.sample_rate / 4
+        
+        while self.is_capturing or ring.available():
+            block = ring.peek()
+            if block is None:
+                time.sleep(idle_sleep)
+                continue
+            
+            try:
+                if self.with_timing:
+                    callback(block, self.sample_rate, *ring.peek_timing())
+                else:
+                    callback(block, self.sample_rate)
+            except Exception as e:
+                self.worker_errors += 1
+                if self.worker_errors == 1:
+                    print(f"Warning: Audio analysis failed ({e})")
+            finally:
+                ring.advance()
+                self.blocks_processed += 1
+    
+    def get_overflow_stats(self) -> dict:
+        """
+        Get capture health counters
+        
+        Returns:
+            Dictionary with overflow and throughput counters. A growing
+            'dropped_blocks' means the analyzer is falling behind.
+        """
+        return {
+            'input_overflows': self.input_overflows,
+            'status_events': self.status_events,
+            'dropped_blocks': self.ring_buffer.overflows if self.ring_buffer else 0,
+            'pending_blocks': self.ring_buffer.available() if self.ring_buffer else 0,
+            'blocks_captured': self.blocks_captured,
+            'blocks_processed': self.blocks_processed,
+            'worker_errors': self.worker_errors
+        }
         
     def stop(self):
         """Stop capturing audio"""
@@ -64,8 +355,14 @@ class AudioCapture:
             self.stream = None
         self.is_capturing = False
         
+        # Let the worker drain what was already captured
+        if self.worker:
+            self.worker.join()
+            self.worker = None
+        
     def get_devices(self):
         """Get available audio input devices"""
-        if not AUDIO_AVAILABLE:
+        sd = _load_sounddevice()
+        if sd is None:
             return []
         return sd.query_devices()
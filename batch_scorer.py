@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Batch Scoring Module
+Scores directories or manifests of recordings across all CPU cores
+
+Each worker process keeps its own OfflineScorer (analyzer stack without
+live audio capture). Results stream out as JSON lines in completion order
+with per-file timing.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import config
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.aiff', '.aif')
+
+# Per-process scorer, created once by the pool initializer
+_worker_scorer = None
+
+
+def find_audio_files(directory: str) -> List[str]:
+    """Find audio files under a directory (recursive, sorted)"""
+    return sorted(
+        str(path) for path in Path(directory).rglob('*')
+        if path.suffix.lower() in AUDIO_EXTENSIONS and path.is_file()
+    )
+
+
+def read_manifest(manifest_path: str) -> List[str]:
+    """
+    Read a manifest of recordings
+    
+    One path per line, or JSON lines with a "path" key. Blank lines and
+    lines starting with '#' are skipped; relative paths are resolved
+    against the manifest's directory.
+    """
+    base = Path(manifest_path).parent
+    paths = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                line = json.loads(line)['path']
+            path = Path(line)
+            paths.append(str(path if path.is_absolute() else base / path))
+    return paths
+
+
+def _init_worker(profile: Optional[str], pitch_backend: Optional[str]):
+    """Pool initializer: build this process's analyzer stack once"""
+    global _worker_scorer
+    from offline_scorer import OfflineScorer
+    _worker_scorer = OfflineScorer(profile=profile, pitch_backend=pitch_backend)
+
+
+def _score_one(path: str) -> Dict:
+    """Score one file in a worker process and flatten the result"""
+    started = time.perf_counter()
+    try:
+        results = _worker_scorer.score_file(path)
+    except Exception as e:
+        return {
+            'file': path,
+            'error': f"{type(e).__name__}: {e}",
+            'wall_time': time.perf_counter() - started,
+            'worker': os.getpid()
+        }
+    
+    return {
+        'file': path,
+        'honor_score': float(results['final_honor_score']),
+        'tier': results['tier'],
+        'components': {name: float(score) for name, score in results['components'].items()},
+        'duration': results['duration'],
+        'analysis_time': results['analysis_time'],
+        'realtime_factor': results['realtime_factor'],
+        'wall_time': time.perf_counter() - started,
+        'worker': os.getpid()
+    }
+
+
+def iter_batch_scores(paths: Iterable[str], profile: str = None,
+                      pitch_backend: str = None, workers: int = None) -> Iterator[Dict]:
+    """
+    Score many recordings in parallel
+    
+    Args:
+        paths: Audio file paths
+        profile: Name in config.PROFILES (default: current config tolerances)
+        pitch_backend: Pitch backend name (default: config.PITCH_BACKEND)
+        workers: Worker processes (default: one per CPU core)
+        
+    Yields:
+        One result dictionary per file, in completion order. Failed files
+        yield a dictionary with an 'error' key instead of scores.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(profile, pitch_backend)) as executor:
+        futures = [executor.submit(_score_one, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='HonorHero batch scoring - score many recordings as JSON lines'
+    )
+    parser.add_argument('source', help='Directory of recordings or a manifest file')
+    parser.add_argument(
+        '--profile',
+        type=str,
+        choices=list(config.PROFILES),
+        default=None,
+        help='User profile: beginner | intermediate | advanced | therapy'
+    )
+    parser.add_argument(
+        '--pitch-backend',
+        type=str,
+        default=None,
+        help='Pitch backend: piptrack | yin (default: config.PITCH_BACKEND)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes (default: number of CPU cores)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default=None,
+        help='Write JSON lines to this file instead of stdout'
+    )
+    args = parser.parse_args()
+    
+    if os.path.isdir(args.source):
+        paths = find_audio_files(args.source)
+    else:
+        paths = read_manifest(args.source)
+    
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    started = time.perf_counter()
+    scored = failed = 0
+    audio_seconds = 0.0
+    
+    try:
+        for row in iter_batch_scores(paths, args.profile, args.pitch_backend, args.workers):
+            output.write(json.dumps(row, ensure_ascii=False) + '\n')
+            output.flush()
+            if 'error' in row:
+                failed += 1
+            else:
+                scored += 1
+                audio_seconds += row['duration']
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"Scored {scored} files ({failed} failed) in {elapsed:.1f}s, "
+          f"{audio_seconds / elapsed if elapsed > 0 else 0:.0f}x real time", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Onset Detection Benchmark
+Compares accuracy and per-block cost of the onset detectors on synthetic
+click tracks and note sequences with known onset times
+"""
+
+import argparse
+import time
+import numpy as np
+import config
+from onset_detector import ONSET_DETECTORS, get_onset_detector
+
+# A detection within this distance of a true onset counts as a hit
+MATCH_WINDOW = 0.05
+
+
+def make_clicks(duration: float, sample_rate: int, noise: float, seed: int = 0) -> tuple:
+    """Noise bursts roughly every 0.5 s over a sustained tone"""
+    rng = np.random.default_rng(seed)
+    n = int(duration * sample_rate)
+    audio = 0.2 * np.sin(2 * np.pi * 220 * np.arange(n) / sample_rate)
+    burst = int(0.03 * sample_rate)
+    envelope = np.exp(-np.arange(burst) / (0.005 * sample_rate))
+    onsets = []
+    t = 0.5
+    while t < duration - 0.5:
+        start = int(t * sample_rate)
+        audio[start:start + burst] += 0.6 * rng.standard_normal(burst) * envelope
+        onsets.append(start / sample_rate)
+        t += 0.5 + rng.uniform(-0.01, 0.01)
+    audio += noise * rng.standard_normal(n)
+    return audio.astype(np.float32), np.array(onsets)
+
+
+def make_notes(duration: float, sample_rate: int, noise: float, seed: int = 0) -> tuple:
+    """Decaying tones with a 5 ms attack at irregular intervals"""
+    rng = np.random.default_rng(seed)
+    n = int(duration * sample_rate)
+    audio = np.zeros(n)
+    length = int(0.45 * sample_rate)
+    t_note = np.arange(length) / sample_rate
+    envelope = (np.minimum(t_note / 0.005, 1) * np.exp(-t_note / 0.4) *
+                np.minimum((t_note[-1] - t_note) / 0.03, 1))
+    onsets = []
+    t = 0.3
+    while t < duration - 0.5:
+        freq = 220 * 2 ** (rng.integers(0, 12) / 12)
+        start = int(t * sample_rate)
+        note = 0.4 * envelope * np.sin(2 * np.pi * freq * t_note)
+        end = min(n, start + length)
+        audio[start:end] += note[:end - start]
+        onsets.append(start / sample_rate)
+        t += rng.uniform(0.25, 0.6)
+    audio += noise * rng.standard_normal(n)
+    return audio.astype(np.float32), np.array(onsets)
+
+
+def run_detector(name: str, audio: np.ndarray, sample_rate: int, block_size: int) -> tuple:
+    """Stream audio through a fresh detector; returns (onsets, seconds per block)"""
+    detector = get_onset_detector(name)
+    found = []
+    blocks = 0
+    start = time.perf_counter()
+    for offset in range(0, len(audio) - block_size + 1, block_size):
+        found += detector.detect(audio[offset:offset + block_size], sample_rate, offset / sample_rate)
+        blocks += 1
+    elapsed = time.perf_counter() - start
+    return np.array(found), elapsed / max(blocks, 1)
+
+
+def evaluate(found: np.ndarray, truth: np.ndarray) -> dict:
+    """Match detections to true onsets one-to-one, nearest first"""
+    errors = []
+    used = set()
+    for onset in truth:
+        if len(found) == 0:
+            break
+        distance = np.abs(found - onset)
+        distance[list(used)] = np.inf
+        index = int(np.argmin(distance))
+        if distance[index] <= MATCH_WINDOW:
+            used.add(index)
+            errors.append(distance[index])
+    
+    hits = len(errors)
+    precision = hits / len(found) if len(found) else 0.0
+    recall = hits / len(truth) if len(truth) else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if hits else 0.0
+    return {
+        'detections': len(found),
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'median_error_ms': float(np.median(errors)) * 1000 if errors else float('nan'),
+        'max_error_ms': float(np.max(errors)) * 1000 if errors else float('nan')
+    }
+
+
+def main():
+    """Run the benchmark and print an accuracy table"""
+    parser = argparse.ArgumentParser(description='Onset detection benchmark')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per signal (default: 10)')
+    parser.add_argument('--noise', type=float, default=0.003, help='Background noise level (default: 0.003)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+    
+    sample_rate = config.SAMPLE_RATE
+    block_size = config.BUFFER_SIZE
+    signals = [
+        ('clicks', make_clicks(args.duration, sample_rate, args.noise, args.seed)),
+        ('notes', make_notes(args.duration, sample_rate, args.noise, args.seed)),
+    ]
+    
+    print(f"Block: {block_size} samples @ {sample_rate} Hz, noise {args.noise}")
+    print(f"{'Signal':<8}{'Detector':<15}{'found':>6}{'prec':>7}{'recall':>8}{'F1':>6}"
+          f"{'med ms':>8}{'max ms':>8}{'us/block':>10}")
+    print("-" * 76)
+    
+    for signal_name, (audio, truth) in signals:
+        for name in ONSET_DETECTORS:
+            found, per_block = run_detector(name, audio, sample_rate, block_size)
+            result = evaluate(found, truth)
+            print(f"{signal_name:<8}{name:<15}{result['detections']:>6}"
+                  f"{result['precision']:>7.2f}{result['recall']:>8.2f}{result['f1']:>6.2f}"
+                  f"{result['median_error_ms']:>8.1f}{result['max_error_ms']:>8.1f}"
+                  f"{per_block * 1e6:>10.0f}")
+        print(f"{signal_name:<8}{len(truth)} true onsets")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pitch Extraction Microbenchmark
+Compares per-block latency of the pitch backends against the original
+per-frame Python loop over librosa.piptrack output
+"""
+
+import argparse
+import time
+import numpy as np
+import librosa
+import config
+from pitch_backends import PITCH_BACKENDS, get_pitch_backend
+
+
+def legacy_piptrack_pitch(audio_chunk: np.ndarray, sample_rate: int) -> float:
+    """Original PitchAnalyzer extraction: piptrack plus a per-frame loop"""
+    pitches, magnitudes = librosa.piptrack(
+        y=audio_chunk,
+        sr=sample_rate,
+        fmin=librosa.note_to_hz('C2'),
+        fmax=librosa.note_to_hz('C7')
+    )
+    pitch_values = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        pitch = pitches[index, t]
+        if pitch > 0:
+            pitch_values.append(pitch)
+    return float(np.mean(pitch_values)) if pitch_values else 0.0
+
+
+def make_blocks(count: int, block_size: int, sample_rate: int) -> list:
+    """Generate detuned harmonic tones with a little noise"""
+    rng = np.random.default_rng(0)
+    t = np.arange(block_size) / sample_rate
+    blocks = []
+    for i in range(count):
+        freq = 110 * 2 ** (rng.uniform(0, 36) / 12)
+        tone = 0.5 * np.sin(2 * np.pi * freq * t) + 0.2 * np.sin(4 * np.pi * freq * t)
+        blocks.append((tone + rng.normal(0, 0.01, block_size)).astype(np.float32))
+    return blocks
+
+
+def time_per_block(estimate, blocks: list, sample_rate: int, repeats: int) -> float:
+    """Best-of-N mean latency per block in milliseconds"""
+    estimate(blocks[0], sample_rate)  # Warm up caches / JIT
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for block in blocks:
+            estimate(block, sample_rate)
+        best = min(best, (time.perf_counter() - start) / len(blocks))
+    return best * 1000
+
+
+def main():
+    """Run the benchmark and print a latency table"""
+    parser = argparse.ArgumentParser(description='Pitch extraction microbenchmark')
+    parser.add_argument('--blocks', type=int, default=100, help='Blocks per run (default: 100)')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per estimator (default: 3)')
+    args = parser.parse_args()
+    
+    sample_rate = config.SAMPLE_RATE
+    blocks = make_blocks(args.blocks, config.BUFFER_SIZE, sample_rate)
+    budget_ms = config.BUFFER_SIZE / sample_rate * 1000
+    
+    estimators = [('piptrack (legacy loop)', legacy_piptrack_pitch)]
+    for name in PITCH_BACKENDS:
+        estimators.append((name, get_pitch_backend(name).estimate))
+    
+    print(f"Block: {config.BUFFER_SIZE} samples @ {sample_rate} Hz "
+          f"(real-time budget {budget_ms:.1f} ms)")
+    print(f"{'Estimator':<26}{'ms/block':>10}{'x real time':>14}")
+    print("-" * 50)
+    
+    for name, estimate in estimators:
+        ms = time_per_block(estimate, blocks, sample_rate, args.repeats)
+        print(f"{name:<26}{ms:>10.3f}{budget_ms / ms:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
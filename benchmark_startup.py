@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures cold import time of each entry point in a fresh interpreter and
+reports the heaviest top-level dependencies via python -X importtime
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+ENTRY_POINTS = ['ui', 'piano_roll_ui', 'view_stats', 'honorhero', 'offline_scorer', 'batch_scorer', 'profile_scoring', 'rescore_history']
+
+# Optional native dependencies that should only load when actually used
+HEAVY_MODULES = ['librosa', 'sounddevice', 'soundfile', 'scipy', 'numba', 'sklearn']
+
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "import json\n"
+    "print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))\n"
+)
+
+
+def parse_importtime(stderr: str, module: str) -> Dict[str, int]:
+    """Cumulative microseconds of each direct import of a module from -X importtime output"""
+    totals: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            continue  # Header line
+        name = fields[2].rstrip()
+        # Nesting is shown by indentation: top-level imports sit at one space
+        # and their direct imports at three. Children are printed before
+        # their parent, so restart whenever another top-level import ends.
+        if not name.startswith('  '):
+            if name.strip() == module:
+                return totals
+            totals = {}
+        elif not name.startswith('    '):
+            package = name.strip().split('.')[0]
+            totals[package] = totals.get(package, 0) + cumulative
+    return totals
+
+
+def measure_entry_point(module: str, repeats: int = 3) -> Dict:
+    """
+    Import a module in fresh interpreters
+    
+    Returns:
+        Best wall time, heavy modules left in sys.modules and the
+        slowest direct dependencies
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    best = float('inf')
+    loaded: List[str] = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, env=env, check=True)
+        elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        best = min(best, elapsed)
+    
+    trace = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                           capture_output=True, text=True, env=env, check=True)
+    totals = parse_importtime(trace.stderr, module)
+    slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:5]
+    
+    return {
+        'module': module,
+        'import_ms': best * 1000,
+        'heavy_loaded': loaded,
+        'slowest': [{'package': name, 'ms': us / 1000} for name, us in slowest]
+    }
+
+
+def main():
+    """Run the benchmark and print a startup table"""
+    parser = argparse.ArgumentParser(description='Entry point startup benchmark')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='Modules to import')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per module (default: 3)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    
+    results = [measure_entry_point(module, args.repeats) for module in args.modules]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{'Entry point':<18}{'import ms':>10}  {'heavy modules':<24}slowest dependencies")
+    print("-" * 90)
+    for row in results:
+        heavy = ', '.join(row['heavy_loaded']) or '-'
+        slowest = ', '.join(f"{item['package']} {item['ms']:.0f}ms" for item in row['slowest'][:3])
+        print(f"{row['module']:<18}{row['import_ms']:>10.1f}  {heavy:<24}{slowest}")
+
+
+if __name__ == '__main__':
+    main()
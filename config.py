@@ -8,6 +8,15 @@ SAMPLE_RATE = 22050  # Hz
 BUFFER_SIZE = 2048
 CHANNELS = 1
 
+# Real-time pipeline: the audio callback only copies into a ring buffer and
+# analysis runs on a separate worker thread
+ANALYSIS_WORKER = True
+RING_BUFFER_BLOCKS = 32  # ~3 seconds of audio at the default settings
+BLOCK_POOL_SIZE = 4  # Reused mono buffers handed out by the callback without the worker
+METRICS_UPDATE_RATE = 2.0  # Honor Score updates per second
+UI_TARGET_FPS = 10.0  # Frames per second drawn by the UI render thread
+OFFLINE_CHUNK_BLOCKS = 64  # Blocks read from disk at a time when scoring files
+
 # Performance evaluation thresholds (tolerant ranges)
 PITCH_TOLERANCE = 50  # cents (half semitone)
 TIMING_TOLERANCE = 0.15  # seconds
@@ -33,9 +42,39 @@ WEIGHTS = {
 }
 
 # Analysis parameters
+PITCH_BACKEND = 'piptrack'  # 'piptrack' (librosa STFT) | 'yin' (low-latency, NumPy only)
+PITCH_FMIN = 65.40639132514966  # C2
+PITCH_FMAX = 2093.004522404789  # C7
+YIN_THRESHOLD = 0.15  # CMNDF dip threshold for the YIN detector
+PITCH_CANDIDATES = 3  # Spectral peaks kept per block as pitch candidates
 MIN_CONFIDENCE = 0.5  # Minimum confidence for pitch detection
+PITCH_HARMONICS = 8  # Harmonics whose energy counts as piptrack confidence
 WINDOW_SIZE = 0.5  # seconds for analysis windows
 
+# Onset detection
+ONSET_DETECTOR = 'spectral_flux'  # 'spectral_flux' | 'energy' (original block-energy detector)
+ONSET_FRAME_SIZE = 512  # Spectral flux frame length in samples
+ONSET_HOP_SIZE = 128  # Frame hop (~6 ms at 22050 Hz)
+ONSET_THRESHOLD_WINDOW = 0.5  # Seconds of flux averaged for the adaptive threshold
+ONSET_THRESHOLD_RATIO = 3.0  # Flux must exceed local mean + ratio * local std + delta
+ONSET_THRESHOLD_DELTA = 0.001  # Absolute floor so silence and steady noise never trigger
+ONSET_COMPRESSION = 1.0  # Log compression of magnitudes: log(1 + c * |X|)
+ONSET_MIN_INTERVAL = 0.05  # Minimum seconds between onsets
+
+# Streaming statistics
+PITCH_HISTORY_SIZE = 2048  # Raw pitch entries kept (None = unbounded)
+PITCH_SCORE_DECAY = None  # Weight of newest score in the recent mean (None = off)
+DYNAMICS_HISTORY_SIZE = 2048  # Raw amplitude/dB entries kept (None = unbounded)
+DYNAMICS_WINDOW = None  # Seconds of dynamic range to score (None = whole session)
+TIMING_HISTORY_SIZE = 4096  # Onsets/intervals kept (None = unbounded)
+RHYTHM_WINDOW = None  # Recent onset intervals scored for timing/rhythm (None = whole session)
+METRICS_HISTORY_SIZE = 7200  # Metric updates kept by consistency/scoring (1 h at 2 Hz)
+CONSISTENCY_WINDOW = None  # Metric updates in the consistency statistics (None = whole session)
+CONSISTENCY_DECAY = None  # Weight of the newest update instead of a window (None = off)
+
+# Session history storage: 'jsonl' (append-only) | 'sqlite' | 'json' (original format)
+SESSION_BACKEND = 'jsonl'
+
 # User Profiles - Different tolerance levels for different skill levels and needs
 PROFILES = {
     'beginner': {
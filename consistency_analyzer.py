@@ -4,20 +4,43 @@ Measures overall performance consistency over time
 """
 
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
 import config
+from streaming_stats import RunningMoments
+from timeseries import TimeSeries
 
 
 class ConsistencyAnalyzer:
-    """Analyzes consistency across all performance metrics"""
+    """
+    Analyzes consistency across all performance metrics
     
-    def __init__(self, threshold: float = config.CONSISTENCY_THRESHOLD):
+    Mean and spread of each metric are kept in running accumulators, so an
+    update costs the same at any session length. By default they cover the
+    whole session; a window or decay makes consistency reflect recent
+    playing instead.
+    """
+    
+    def __init__(self, threshold: float = config.CONSISTENCY_THRESHOLD,
+                 history_size: Optional[int] = config.METRICS_HISTORY_SIZE,
+                 window: Optional[int] = config.CONSISTENCY_WINDOW,
+                 decay: Optional[float] = config.CONSISTENCY_DECAY):
+        """
+        Args:
+            threshold: Overall consistency that earns full marks
+            history_size: Raw metric values kept (None = unbounded)
+            window: Only the last `window` updates count (None = all)
+            decay: Weight of the newest update, fading older ones (None = off)
+        """
         self.threshold = threshold
         self.metric_history = {
-            'pitch': [],
-            'timing': [],
-            'rhythm': [],
-            'dynamics': []
+            'pitch': TimeSeries(history_size, np.float32),
+            'timing': TimeSeries(history_size, np.float32),
+            'rhythm': TimeSeries(history_size, np.float32),
+            'dynamics': TimeSeries(history_size, np.float32)
+        }
+        self.metric_stats = {
+            name: RunningMoments(window=window, decay=decay)
+            for name in self.metric_history
         }
         
     def add_metrics(self, pitch_score: float, timing_score: float,
@@ -31,10 +54,15 @@ class ConsistencyAnalyzer:
             rhythm_score: Rhythm score (0-100)
             dynamics_score: Dynamics score (0-100)
         """
-        self.metric_history['pitch'].append(pitch_score)
-        self.metric_history['timing'].append(timing_score)
-        self.metric_history['rhythm'].append(rhythm_score)
-        self.metric_history['dynamics'].append(dynamics_score)
+        scores = {
+            'pitch': pitch_score,
+            'timing': timing_score,
+            'rhythm': rhythm_score,
+            'dynamics': dynamics_score
+        }
+        for name, score in scores.items():
+            self.metric_history[name].append(score)
+            self.metric_stats[name].add(score)
     
     def analyze(self) -> dict:
         """
@@ -43,7 +71,7 @@ class ConsistencyAnalyzer:
         Returns:
             Dictionary with consistency analysis
         """
-        if not self.metric_history['pitch']:
+        if self.metric_stats['pitch'].count == 0:
             return {
                 'score': 70,  # Default good score
                 'overall_consistency': self.threshold,
@@ -53,14 +81,14 @@ class ConsistencyAnalyzer:
         metric_consistencies = {}
         total_consistency = 0
         
-        for metric_name, values in self.metric_history.items():
-            if len(values) < 2:
+        for metric_name, stats in self.metric_stats.items():
+            if stats.count < 2:
                 consistency = 1.0
             else:
                 # Calculate coefficient of variation
-                mean_val = np.mean(values)
+                mean_val = stats.mean
                 if mean_val > 0:
-                    cv = np.std(values) / mean_val
+                    cv = stats.std / mean_val
                     consistency = max(0, 1 - cv)
                 else:
                     consistency = 0.5
@@ -69,7 +97,7 @@ class ConsistencyAnalyzer:
             total_consistency += consistency
         
         # Average consistency
-        overall_consistency = total_consistency / len(self.metric_history)
+        overall_consistency = total_consistency / len(self.metric_stats)
         
         # Score based on consistency
         if overall_consistency >= self.threshold:
@@ -86,5 +114,7 @@ class ConsistencyAnalyzer:
     
     def reset(self):
         """Reset consistency history"""
-        for metric in self.metric_history:
-            self.metric_history[metric] = []
+        for values in self.metric_history.values():
+            values.clear()
+        for stats in self.metric_stats.values():
+            stats.reset()
@@ -8,7 +8,7 @@ import random
 import traceback
 from collections import deque
 from piano_roll_ui import PianoRollUI
-import librosa
+from note_utils import note_to_midi, midi_to_hz
 
 
 def simulate_piano_roll_demo():
@@ -55,8 +55,8 @@ def simulate_piano_roll_demo():
             note_name = scale_notes[note_index % len(scale_notes)]
             
             # Convert note to frequency
-            midi_note = librosa.note_to_midi(note_name)
-            frequency = librosa.midi_to_hz(midi_note)
+            midi_note = note_to_midi(note_name)
+            frequency = midi_to_hz(midi_note)
             
             # Vary dynamics: crescendo up, diminuendo down
             position = note_index % len(scale_notes)
@@ -76,7 +76,7 @@ def simulate_piano_roll_demo():
             # Add note to buffer
             ui.note_buffer.append({
                 'timestamp': current_time,
-                'note': note_name,
+                'midi': midi_note,
                 'frequency': frequency,
                 'score': score,
                 'velocity': velocity
@@ -108,6 +108,8 @@ def simulate_piano_roll_demo():
         time.sleep(0.5)
     
     # Show final summary
+    ui.renderer.close()
+    stats = ui.renderer.get_stats()
     print()
     print("=" * 90)
     print("Demo completed!".center(90))
@@ -117,6 +119,7 @@ def simulate_piano_roll_demo():
     print("and show your notes as you play them in real-time.")
     print()
     print(f"Notes simulated: {len(ui.note_buffer)}")
+    print(f"Frames rendered: {stats['frames']} ({stats['bytes_per_frame']:.0f} bytes/frame)")
     if ui.recent_scores:
         print(f"Average score: {sum(ui.recent_scores) / len(ui.recent_scores):.1f}")
         print(f"Score range: {min(ui.recent_scores):.1f} - {max(ui.recent_scores):.1f}")
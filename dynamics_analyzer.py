@@ -4,17 +4,32 @@ Analyzes volume dynamics and expression
 """
 
 import numpy as np
-from typing import List
+from typing import List, Optional
 import config
+from feature_extractor import FeatureFrame, level_db
+from streaming_stats import RunningExtrema, SlidingWindowRange
+from timeseries import TimeSeries
 
 
 class DynamicsAnalyzer:
     """Analyzes dynamics and expressive volume control"""
     
-    def __init__(self, tolerance: float = config.DYNAMICS_TOLERANCE):
+    def __init__(self, tolerance: float = config.DYNAMICS_TOLERANCE,
+                 window_seconds: Optional[float] = config.DYNAMICS_WINDOW,
+                 history_size: Optional[int] = config.DYNAMICS_HISTORY_SIZE,
+                 block_duration: float = config.BUFFER_SIZE / config.SAMPLE_RATE):
         self.tolerance = tolerance  # dB
-        self.amplitude_history = []
-        self.db_history = []
+        self.history_size = history_size
+        self.amplitude_history = TimeSeries(history_size, np.float32)
+        self.db_history = TimeSeries(history_size, np.float32)
+        
+        # Streaming dynamic range: whole session, or the last window_seconds
+        self.window_seconds = window_seconds
+        self.db_extrema = RunningExtrema()
+        self.db_window = None
+        if window_seconds is not None:
+            window_blocks = max(2, int(round(window_seconds / block_duration)))
+            self.db_window = SlidingWindowRange(window_blocks)
         
     def analyze(self, audio_chunk: np.ndarray) -> dict:
         """
@@ -27,58 +42,72 @@ class DynamicsAnalyzer:
             Dictionary with dynamics analysis
         """
         # Calculate RMS amplitude
-        rms = np.sqrt(np.mean(audio_chunk ** 2))
-        
-        # Convert to dB (with floor to avoid log(0))
-        if rms > 1e-10:
-            db = 20 * np.log10(rms)
-        else:
-            db = -100  # Very quiet
+        rms = float(np.sqrt(np.vdot(audio_chunk, audio_chunk) / audio_chunk.size)) if audio_chunk.size else 0.0
+        return self._add_level(rms, level_db(rms))
+    
+    def analyze_frame(self, frame: FeatureFrame) -> dict:
+        """
+        Analyze dynamics from a block's shared features
         
+        Args:
+            frame: FeatureFrame of the block
+            
+        Returns:
+            Dictionary with dynamics analysis (as analyze())
+        """
+        return self._add_level(frame.rms, frame.db)
+    
+    def _add_level(self, rms: float, db: float) -> dict:
+        """Record one block level and score the dynamic range"""
         self.amplitude_history.append(rms)
         self.db_history.append(db)
+        self.db_extrema.add(db)
+        if self.db_window is not None:
+            self.db_window.add(db)
         
         # Calculate dynamic range
-        if len(self.db_history) > 1:
-            dynamic_range = max(self.db_history) - min(self.db_history)
-        else:
-            dynamic_range = 0
-        
-        # Score based on dynamic control
-        # Good dynamics show variation but not excessive
-        if 5 <= dynamic_range <= self.tolerance:
-            score = 100
-        elif dynamic_range < 5:
-            # Too flat
-            score = 60 + (dynamic_range * 8)
-        else:
-            # Too much variation
-            excess = dynamic_range - self.tolerance
-            score = max(0, 100 - (excess * 2))
+        dynamic_range = self.get_dynamic_range()
         
         return {
             'amplitude': rms,
             'db': db,
             'dynamic_range': dynamic_range,
-            'score': score
+            'score': self._score_range(dynamic_range)
         }
     
-    def get_average_score(self) -> float:
-        """Get average dynamics score"""
-        if len(self.db_history) < 2:
-            return 70.0  # Default good score
-        
-        dynamic_range = max(self.db_history) - min(self.db_history)
+    def get_dynamic_range(self) -> float:
+        """Get current dynamic range in dB (windowed if a window is configured)"""
+        if self.db_window is not None:
+            return self.db_window.range
+        return self.db_extrema.range
+    
+    def _score_range(self, dynamic_range: float) -> float:
+        """
+        Score based on dynamic control
         
+        Good dynamics show variation but not excessive
+        """
         if 5 <= dynamic_range <= self.tolerance:
             return 100.0
         elif dynamic_range < 5:
+            # Too flat
             return 60.0 + (dynamic_range * 8)
         else:
+            # Too much variation
             excess = dynamic_range - self.tolerance
             return max(0, 100 - (excess * 2))
     
+    def get_average_score(self) -> float:
+        """Get average dynamics score"""
+        if self.db_extrema.count < 2:
+            return 70.0  # Default good score
+        
+        return self._score_range(self.get_dynamic_range())
+    
     def reset(self):
         """Reset dynamics history"""
-        self.amplitude_history = []
-        self.db_history = []
+        self.amplitude_history.clear()
+        self.db_history.clear()
+        self.db_extrema.reset()
+        if self.db_window is not None:
+            self.db_window.reset()
@@ -0,0 +1,180 @@
+"""
+Feature Cache Module
+Persists the tolerance-independent features of recordings, keyed by content
+
+Profiles only change tolerances, so a recording's pitch deviations, onset
+times and block levels are the same under every profile. They are extracted
+once, stored as .npz under a hash of the audio bytes and the analysis
+settings, and scored from there (see profile_scoring).
+"""
+
+import hashlib
+import os
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+import config
+
+# Bump when extraction changes in a way that invalidates cached features
+FEATURE_VERSION = 2
+
+# Settings that change what is extracted; part of every cache key
+EXTRACTION_SETTINGS = [
+    'SAMPLE_RATE', 'BUFFER_SIZE', 'METRICS_UPDATE_RATE', 'MIN_CONFIDENCE',
+    'PITCH_FMIN', 'PITCH_FMAX', 'PITCH_CANDIDATES', 'PITCH_HARMONICS',
+    'YIN_THRESHOLD', 'ONSET_DETECTOR', 'ONSET_FRAME_SIZE', 'ONSET_HOP_SIZE',
+    'ONSET_THRESHOLD_WINDOW',
+    'ONSET_THRESHOLD_RATIO', 'ONSET_THRESHOLD_DELTA', 'ONSET_COMPRESSION',
+    'ONSET_MIN_INTERVAL'
+]
+
+HASH_CHUNK = 1 << 20  # Bytes read at a time when hashing audio files
+
+
+class PerformanceFeatures:
+    """
+    Everything the scorers need from one recording, without tolerances
+    
+    update_counts has one row per metrics update of the live schedule:
+    how many pitch deviations, onsets and levels had been seen at that
+    tick. Consistency depends on the scores at each tick, so those prefix
+    lengths are enough to replay it under any profile.
+    """
+    
+    def __init__(self, pitch_deviations: np.ndarray, onset_times: np.ndarray,
+                 levels_db: np.ndarray, update_counts: np.ndarray,
+                 sample_rate: int, block_size: int, duration: float):
+        """
+        Args:
+            pitch_deviations: Cents from the nearest note, detected blocks only
+            onset_times: Onset times in seconds
+            levels_db: Level of every block in dB
+            update_counts: (updates, 3) prefix lengths of the three series
+            sample_rate: Sample rate of the recording
+            block_size: Analysis block size used
+            duration: Length of the analyzed audio in seconds
+        """
+        self.pitch_deviations = pitch_deviations
+        self.onset_times = onset_times
+        self.levels_db = levels_db
+        self.update_counts = update_counts
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.duration = duration
+    
+    def save(self, path: str):
+        """Write the features to an .npz file atomically"""
+        path = Path(path)
+        fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    version=FEATURE_VERSION,
+                    pitch_deviations=self.pitch_deviations,
+                    onset_times=self.onset_times,
+                    levels_db=self.levels_db,
+                    update_counts=self.update_counts,
+                    sample_rate=self.sample_rate,
+                    block_size=self.block_size,
+                    duration=self.duration
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    @classmethod
+    def load(cls, path: str) -> 'PerformanceFeatures':
+        """Read features written by save()"""
+        with np.load(path) as data:
+            if int(data['version']) != FEATURE_VERSION:
+                raise ValueError(f"{path}: feature version {int(data['version'])}, expected {FEATURE_VERSION}")
+            return cls(
+                pitch_deviations=data['pitch_deviations'],
+                onset_times=data['onset_times'],
+                levels_db=data['levels_db'],
+                update_counts=data['update_counts'],
+                sample_rate=int(data['sample_rate']),
+                block_size=int(data['block_size']),
+                duration=float(data['duration'])
+            )
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Content-addressed store of PerformanceFeatures
+    
+    The key combines the audio file's SHA-256 with the pitch backend and
+    the extraction settings in config, so a renamed file is still a hit and
+    changing a setting never returns stale features.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, pitch_backend: str = None):
+        """
+        Args:
+            cache_dir: Directory for .npz files (default: ~/.honorhero/features)
+            pitch_backend: Pitch backend used for extraction (default: config.PITCH_BACKEND)
+        """
+        if cache_dir is None:
+            cache_dir = Path.home() / '.honorhero' / 'features'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.pitch_backend = pitch_backend or config.PITCH_BACKEND
+        self.hits = 0
+        self.misses = 0
+        self._scorer = None  # OfflineScorer, created on the first miss
+    
+    def key(self, path: str) -> str:
+        """Cache key of a recording under the current settings"""
+        settings = [f"v{FEATURE_VERSION}", self.pitch_backend]
+        settings += [f"{name}={getattr(config, name)!r}" for name in EXTRACTION_SETTINGS]
+        digest = hashlib.sha256(file_digest(path).encode())
+        digest.update('|'.join(settings).encode())
+        return digest.hexdigest()
+    
+    def get(self, path: str) -> PerformanceFeatures:
+        """
+        Features of a recording, extracted and stored on first use
+        
+        Args:
+            path: Audio file path
+        
+        Returns:
+            PerformanceFeatures of the recording
+        """
+        cache_path = self.cache_dir / f"{self.key(path)}.npz"
+        if cache_path.exists():
+            try:
+                features = PerformanceFeatures.load(cache_path)
+                self.hits += 1
+                return features
+            except (OSError, ValueError, KeyError):
+                pass  # Unreadable or outdated entry: extract again
+        
+        if self._scorer is None:
+            from offline_scorer import OfflineScorer
+            self._scorer = OfflineScorer(pitch_backend=self.pitch_backend)
+        features = self._scorer.extract_features(path)
+        features.save(cache_path)
+        self.misses += 1
+        return features
+    
+    def get_stats(self) -> Dict:
+        """Get cache hit/miss counters"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(list(self.cache_dir.glob('*.npz')))
+        }
@@ -0,0 +1,196 @@
+"""
+Feature Extractor Module
+Computes the per-block features shared by all analyzers in one pass
+"""
+
+import numpy as np
+from typing import Optional
+import config
+from fft_utils import rfft_into
+
+# Level reported for digital silence
+SILENCE_DB = -100.0
+SILENCE_RMS = 1e-10
+
+
+def level_db(rms: float) -> float:
+    """RMS amplitude in dB (with a floor to avoid log(0))"""
+    if rms > SILENCE_RMS:
+        return 20 * float(np.log10(rms))
+    return SILENCE_DB
+
+
+class FeatureFrame:
+    """
+    Features of one audio block
+    
+    Array attributes are buffers owned by the FeatureExtractor and are
+    overwritten by the next block: analyzers read them during their
+    analyze_frame() call and copy anything they keep.
+    """
+    
+    def __init__(self):
+        self.audio: Optional[np.ndarray] = None       # The block itself
+        self.sample_rate = 0
+        self.timestamp = 0.0                           # Time of the first sample (s)
+        self.energy = 0.0                              # Sum of squares
+        self.rms = 0.0
+        self.db = SILENCE_DB
+        self.spectrum: Optional[np.ndarray] = None     # Hann-windowed |rfft|
+        self.frequencies: Optional[np.ndarray] = None  # Bin centre frequencies (Hz)
+        self.spectral_flux = 0.0                       # Mean log-magnitude rise vs previous block
+        self.pitch_candidates: Optional[np.ndarray] = None  # Strongest peaks in the pitch range (Hz, 0 = none)
+        self.candidate_magnitudes: Optional[np.ndarray] = None
+        self.pitch = 0.0                               # Pitch backend estimate (Hz, 0 = none)
+        self.pitch_confidence = 0.0
+
+
+class FeatureExtractor:
+    """
+    Turns each audio block into a FeatureFrame
+    
+    Level, spectrum, spectral flux and pitch candidates are computed once per
+    block into buffers allocated when the block size changes, so adding an
+    analyzer adds scoring logic without another pass over the audio. With a
+    pitch backend, its estimate is stored in the frame as well.
+    """
+    
+    def __init__(self, pitch_backend=None,
+                 fmin: float = config.PITCH_FMIN,
+                 fmax: float = config.PITCH_FMAX,
+                 candidates: int = config.PITCH_CANDIDATES):
+        """
+        Args:
+            pitch_backend: PitchBackend whose estimate goes into frame.pitch
+                           (None = leave pitch at 0)
+            fmin: Lowest pitch candidate frequency (Hz)
+            fmax: Highest pitch candidate frequency (Hz)
+            candidates: Number of pitch candidates kept per block
+        """
+        self.pitch_backend = pitch_backend
+        self.fmin = fmin
+        self.fmax = fmax
+        self.candidates = candidates
+        self.frame = FeatureFrame()
+        self.has_previous = False
+        self._plan_key = None
+    
+    def _plan(self, block_size: int, sample_rate: int):
+        """Allocate buffers for a block size / sample rate"""
+        key = (block_size, sample_rate)
+        if key == self._plan_key:
+            return
+        
+        bins = block_size // 2 + 1
+        # Periodic Hann window, as librosa's STFT uses. Work is done in
+        # float64 because NumPy's float32 FFT and complex-to-float32 abs
+        # allocate conversion buffers on every call.
+        self.window = np.hanning(block_size + 1)[:-1]
+        self.windowed = np.zeros(block_size, dtype=np.float64)
+        self.transform = np.zeros(bins, dtype=np.complex128)
+        self.log_spectrum = np.zeros(bins, dtype=np.float64)
+        self.previous_log = np.zeros(bins, dtype=np.float64)
+        self.rise = np.zeros(bins, dtype=np.float64)
+        self.has_previous = False
+        
+        frame = self.frame
+        frame.spectrum = np.zeros(bins, dtype=np.float64)
+        frame.frequencies = np.fft.rfftfreq(block_size, 1.0 / sample_rate)
+        frame.pitch_candidates = np.zeros(self.candidates, dtype=np.float64)
+        frame.candidate_magnitudes = np.zeros(self.candidates, dtype=np.float64)
+        
+        # Interior bins whose frequency lies in the pitch range
+        band = np.flatnonzero((frame.frequencies >= self.fmin) & (frame.frequencies <= self.fmax))
+        band = band[(band > 0) & (band < bins - 1)]
+        self.band_start = int(band[0]) if len(band) else 1
+        self.band_stop = int(band[-1]) + 1 if len(band) else 1
+        width = max(0, self.band_stop - self.band_start)
+        self.peak_mask = np.zeros(width, dtype=bool)
+        self.edge_mask = np.zeros(width, dtype=bool)
+        self.peak_levels = np.zeros(width, dtype=np.float64)
+        self._plan_key = key
+    
+    def extract(self, audio_chunk: np.ndarray, sample_rate: int,
+                timestamp: float = 0.0) -> FeatureFrame:
+        """
+        Compute the features of the next block
+        
+        Args:
+            audio_chunk: 1-D audio data
+            sample_rate: Sample rate in Hz
+            timestamp: Time of the block's first sample in seconds
+        
+        Returns:
+            The extractor's FeatureFrame, refilled for this block
+        """
+        self._plan(len(audio_chunk), sample_rate)
+        frame = self.frame
+        frame.audio = audio_chunk
+        frame.sample_rate = sample_rate
+        frame.timestamp = timestamp
+        
+        # Level
+        frame.energy = float(np.dot(audio_chunk, audio_chunk))
+        frame.rms = float(np.sqrt(frame.energy / len(audio_chunk))) if len(audio_chunk) else 0.0
+        frame.db = level_db(frame.rms)
+        
+        # Magnitude spectrum
+        np.copyto(self.windowed, audio_chunk)
+        np.multiply(self.windowed, self.window, out=self.windowed)
+        rfft_into(self.windowed, self.transform)
+        np.abs(self.transform, out=frame.spectrum)
+        
+        # Spectral flux against the previous block
+        np.log1p(frame.spectrum, out=self.log_spectrum)
+        if self.has_previous:
+            np.subtract(self.log_spectrum, self.previous_log, out=self.rise)
+            np.maximum(self.rise, 0.0, out=self.rise)
+            frame.spectral_flux = float(self.rise.mean())
+        else:
+            frame.spectral_flux = 0.0
+        self.previous_log[:] = self.log_spectrum
+        self.has_previous = True
+        
+        self._find_candidates(frame)
+        
+        if self.pitch_backend is not None:
+            frame.pitch, frame.pitch_confidence = self.pitch_backend.estimate_frame(frame)
+        return frame
+    
+    def _find_candidates(self, frame: FeatureFrame):
+        """Strongest spectral peaks in the pitch range, parabolically refined"""
+        frame.pitch_candidates[:] = 0.0
+        frame.candidate_magnitudes[:] = 0.0
+        start, stop = self.band_start, self.band_stop
+        if stop <= start or self.candidates == 0:
+            return
+        
+        # Local maxima of the band, zero elsewhere
+        spectrum = frame.spectrum
+        band = spectrum[start:stop]
+        np.greater(band, spectrum[start - 1:stop - 1], out=self.peak_mask)
+        np.greater_equal(band, spectrum[start + 1:stop + 1], out=self.edge_mask)
+        np.logical_and(self.peak_mask, self.edge_mask, out=self.peak_mask)
+        np.multiply(band, self.peak_mask, out=self.peak_levels)
+        
+        # Strongest first; few candidates, so repeated argmax beats sorting
+        log_spectrum = self.log_spectrum
+        bin_width = frame.sample_rate / (2 * (len(spectrum) - 1))
+        for index in range(self.candidates):
+            peak = int(self.peak_levels.argmax())
+            level = self.peak_levels[peak]
+            if level <= 0:
+                break
+            self.peak_levels[peak] = 0.0
+            peak += start
+            
+            # Parabola through the log magnitudes around the peak
+            left, centre, right = log_spectrum[peak - 1], log_spectrum[peak], log_spectrum[peak + 1]
+            curvature = left - 2 * centre + right
+            offset = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+            frame.pitch_candidates[index] = (peak + offset) * bin_width
+            frame.candidate_magnitudes[index] = level
+    
+    def reset(self):
+        """Forget the previous block (spectral flux restarts at 0)"""
+        self.has_previous = False
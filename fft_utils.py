@@ -0,0 +1,47 @@
+"""
+FFT Utilities Module
+Real FFTs written into preallocated buffers on every supported NumPy
+"""
+
+import numpy as np
+
+
+def _fft_out_supported() -> bool:
+    """Whether np.fft accepts out= (NumPy 2.0 and later)"""
+    try:
+        np.fft.rfft(np.zeros(2), out=np.zeros(2, dtype=np.complex128))
+    except TypeError:
+        return False
+    return True
+
+
+# NumPy 1.x has no out= on np.fft; there the result is copied into the
+# buffer, which allocates a temporary once per call
+FFT_OUT_SUPPORTED = _fft_out_supported()
+
+
+def rfft_into(a: np.ndarray, out: np.ndarray, n: int = None, axis: int = -1) -> np.ndarray:
+    """
+    np.fft.rfft of a, stored in out
+    
+    Args:
+        a: Real input
+        out: Complex128 buffer of the result's shape
+        n: FFT length (default: length of a along axis)
+        axis: Axis to transform
+    
+    Returns:
+        out
+    """
+    if FFT_OUT_SUPPORTED:
+        return np.fft.rfft(a, n, axis=axis, out=out)
+    out[...] = np.fft.rfft(a, n, axis=axis)
+    return out
+
+
+def irfft_into(a: np.ndarray, out: np.ndarray, n: int = None, axis: int = -1) -> np.ndarray:
+    """np.fft.irfft of a, stored in out (see rfft_into)"""
+    if FFT_OUT_SUPPORTED:
+        return np.fft.irfft(a, n, axis=axis, out=out)
+    out[...] = np.fft.irfft(a, n, axis=axis)
+    return out
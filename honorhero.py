@@ -4,6 +4,7 @@ Coordinates all analysis modules and provides real-time evaluation
 """
 
 import numpy as np
+import threading
 import time
 from typing import Dict, Optional
 from audio_capture import AudioCapture
@@ -11,9 +12,13 @@ from pitch_analyzer import PitchAnalyzer
 from timing_analyzer import TimingAnalyzer
 from dynamics_analyzer import DynamicsAnalyzer
 from consistency_analyzer import ConsistencyAnalyzer
+from feature_extractor import FeatureExtractor
 from scoring_system import ScoringSystem
 from session_history import SessionHistory
 from feedback_generator import FeedbackGenerator
+from metrics_scheduler import MetricsScheduler
+from render_loop import LatestValueMailbox
+from sample_clock import SampleClock
 import config
 
 
@@ -25,16 +30,61 @@ class HonorHero:
     Performance never stops - mistakes are measured, not punished.
     """
     
-    def __init__(self):
+    def __init__(self, profile: str = None, pitch_backend: str = None,
+                 session_history: Optional[SessionHistory] = None,
+                 use_history: bool = True):
+        """
+        Initialize the engine
+        
+        Args:
+            profile: Name in config.PROFILES (default: the tolerances currently
+                     set in config, which the UIs update from their profile)
+            pitch_backend: Pitch backend name (default: config.PITCH_BACKEND)
+            session_history: History to compare against and record into
+                             (default: ~/.honorhero)
+            use_history: False to neither load nor record session history,
+                         e.g. when batch-scoring recordings
+        """
+        if profile is not None:
+            tolerances = config.PROFILES[profile]
+        else:
+            tolerances = {
+                'PITCH_TOLERANCE': config.PITCH_TOLERANCE,
+                'TIMING_TOLERANCE': config.TIMING_TOLERANCE,
+                'RHYTHM_TOLERANCE': config.RHYTHM_TOLERANCE,
+                'DYNAMICS_TOLERANCE': config.DYNAMICS_TOLERANCE,
+                'CONSISTENCY_THRESHOLD': config.CONSISTENCY_THRESHOLD
+            }
+        
         # Initialize modules
         self.audio_capture = AudioCapture()
-        self.pitch_analyzer = PitchAnalyzer()
-        self.timing_analyzer = TimingAnalyzer()
-        self.dynamics_analyzer = DynamicsAnalyzer()
-        self.consistency_analyzer = ConsistencyAnalyzer()
+        self.pitch_analyzer = PitchAnalyzer(tolerances['PITCH_TOLERANCE'], backend=pitch_backend)
+        self.timing_analyzer = TimingAnalyzer(tolerances['TIMING_TOLERANCE'],
+                                              tolerances['RHYTHM_TOLERANCE'])
+        self.dynamics_analyzer = DynamicsAnalyzer(tolerances['DYNAMICS_TOLERANCE'])
+        self.consistency_analyzer = ConsistencyAnalyzer(tolerances['CONSISTENCY_THRESHOLD'])
+        # One DSP pass per block, shared by the per-block analyzers
+        self.feature_extractor = FeatureExtractor(self.pitch_analyzer.backend)
         self.scoring_system = ScoringSystem()
-        self.session_history = SessionHistory()
+        if use_history:
+            self.session_history = session_history or SessionHistory()
+        else:
+            self.session_history = None
         self.feedback_generator = FeedbackGenerator()
+        self.metrics_scheduler = MetricsScheduler(
+            config.METRICS_UPDATE_RATE,
+            callback=self._scheduled_update
+        )
+        
+        # Guards analyzer state shared by the audio and metrics threads
+        self._lock = threading.Lock()
+        
+        # Latest metrics snapshot for UIs rendering on their own thread
+        self.snapshots = LatestValueMailbox()
+        
+        # Block timestamps come from the captured sample count, not from
+        # when the analysis thread gets around to each block
+        self.clock = SampleClock(self.audio_capture.sample_rate)
         
         # State
         self.is_running = False
@@ -48,18 +98,23 @@ class HonorHero:
         Start evaluating performance
         
         Args:
-            update_callback: Optional callback function for real-time updates
+            update_callback: Optional callback function for real-time updates.
+                             It runs on the metrics thread; UIs with slow
+                             output should read self.snapshots instead.
         """
         self.is_running = True
         self.start_time = time.time()
         self.update_callback = update_callback
+        self.snapshots.clear()
+        self.clock.reset(self.audio_capture.sample_rate)
         
         print("🎵 HonorHero iniciado - ¡Comienza a tocar!")
         print("La performance nunca se detiene. Los errores se miden, no se castigan.")
         print("-" * 60)
         
-        # Start audio capture
-        self.audio_capture.start(self._process_audio_chunk)
+        # Start audio capture and the fixed-rate metrics updates
+        self.audio_capture.start(self._process_audio_chunk, with_timing=True)
+        self.metrics_scheduler.start()
         
     def stop_performance(self) -> Dict:
         """
@@ -68,11 +123,14 @@ class HonorHero:
         Returns:
             Final performance summary
         """
-        self.is_running = False
+        # Stop the stream first: blocks still in the ring are analyzed while
+        # the worker drains it, so is_running stays set until it is done
         self.audio_capture.stop()
+        self.is_running = False
+        self.metrics_scheduler.stop()
         
         # Calculate final scores
-        final_results = self._calculate_final_scores()
+        final_results = self.finalize()
         
         print("\n" + "=" * 60)
         print("🏆 Performance finalizada")
@@ -80,30 +138,89 @@ class HonorHero:
         
         return final_results
     
-    def _process_audio_chunk(self, audio_chunk: np.ndarray, sample_rate: int):
-        """Process incoming audio data"""
+    def _process_audio_chunk(self, audio_chunk: np.ndarray, sample_rate: int,
+                             position: Optional[int] = None,
+                             adc_time: Optional[float] = None):
+        """
+        Process incoming audio data
+        
+        Args:
+            audio_chunk: 1-D audio data
+            sample_rate: Sample rate in Hz
+            position: Sample index of the block's first sample (default:
+                      right after the previous block)
+            adc_time: Driver capture time of the block's first sample
+        """
         if not self.is_running:
             return
         
-        current_time = time.time() - self.start_time
+        current_time = self.clock.block_time(len(audio_chunk), position, adc_time,
+                                             time.time() - self.start_time)
+        self.process_block(audio_chunk, sample_rate, current_time)
+    
+    def process_block(self, audio_chunk: np.ndarray, sample_rate: int, current_time: float):
+        """
+        Run the per-block analyzers on one audio block
         
-        # Analyze pitch
-        pitch_result = self.pitch_analyzer.analyze(audio_chunk, sample_rate)
+        Args:
+            audio_chunk: 1-D audio data
+            sample_rate: Sample rate in Hz
+            current_time: Block timestamp in seconds since the performance started
+            
+        Returns:
+            Dictionary with the 'pitch', 'timing' and 'dynamics' results
+        """
+        with self._lock:
+            frame = self.feature_extractor.extract(audio_chunk, sample_rate, current_time)
+            
+            # Analyze pitch
+            pitch_result = self.pitch_analyzer.analyze_frame(frame)
+            
+            # Detect timing/rhythm
+            timing_result = self.timing_analyzer.analyze_frame(frame)
+            
+            # Analyze dynamics
+            dynamics_result = self.dynamics_analyzer.analyze_frame(frame)
         
-        # Detect timing/rhythm
-        timing_result = self.timing_analyzer.detect_onset(
-            audio_chunk, sample_rate, current_time
-        )
+        return {
+            'pitch': pitch_result,
+            'timing': timing_result,
+            'dynamics': dynamics_result
+        }
+    
+    def _scheduled_update(self):
+        """Metrics scheduler tick"""
+        if self.is_running:
+            self.update_metrics()
+    
+    def update_metrics(self):
+        """
+        Calculate and publish current metrics
+        
+        Called by the metrics scheduler during a live session; offline
+        scoring calls it on its own sample-time schedule.
+        """
+        with self._lock:
+            self._compute_metrics()
+            snapshot = self._make_snapshot()
         
-        # Analyze dynamics
-        dynamics_result = self.dynamics_analyzer.analyze(audio_chunk)
+        self.snapshots.publish(snapshot)
         
-        # Update metrics periodically
-        if int(current_time * 2) % 2 == 0:  # Every ~0.5 seconds
-            self._update_metrics()
+        # Call update callback if provided (outside the lock so UI work
+        # never blocks audio analysis)
+        if self.update_callback:
+            self.update_callback(self.current_metrics)
+    
+    def _make_snapshot(self) -> Dict:
+        """Copy of the current metrics plus the latest pitch, safe to read from any thread"""
+        snapshot = dict(self.current_metrics)
+        pitch_history = self.pitch_analyzer.pitch_history
+        snapshot['pitch'] = dict(pitch_history[-1]) if pitch_history else None
+        snapshot['time'] = time.time()
+        return snapshot
     
-    def _update_metrics(self):
-        """Calculate and update current metrics"""
+    def _compute_metrics(self):
+        """Score the analyzers' current state into current_metrics"""
         # Get component scores
         pitch_score = self.pitch_analyzer.get_average_score()
         timing_analysis = self.timing_analyzer.analyze_timing()
@@ -143,22 +260,29 @@ class HonorHero:
             'tier': honor_result['tier'],
             'message': honor_result['message'],
             'human_feedback': human_feedback,
-            'components': metrics
+            'components': metrics,
+            'clock': self.clock.get_stats()
         }
         
         # Save previous for comparison
         self.previous_metrics = self.current_metrics.copy()
-        
-        # Call update callback if provided
-        if self.update_callback:
-            self.update_callback(self.current_metrics)
     
-    def _calculate_final_scores(self) -> Dict:
-        """Calculate final performance summary"""
+    def finalize(self, duration: float = None) -> Dict:
+        """
+        Calculate the final performance summary of the blocks processed
+        
+        stop_performance() calls this after stopping capture; offline
+        scoring calls it directly once a file has been streamed.
+        
+        Args:
+            duration: Session length in seconds (default: wall-clock time
+                      since start_performance)
+        """
         # Calculate session duration
-        duration = 0
-        if self.start_time:
-            duration = time.time() - self.start_time
+        if duration is None:
+            duration = 0
+            if self.start_time:
+                duration = time.time() - self.start_time
         
         # Get final component scores
         pitch_score = self.pitch_analyzer.get_average_score()
@@ -180,10 +304,13 @@ class HonorHero:
         progress_summary = self.scoring_system.get_progress_summary()
         
         # Compare with session history
-        comparison = self.session_history.compare_with_previous(
-            honor_result['honor_score'],
-            metrics
-        )
+        if self.session_history is not None:
+            comparison = self.session_history.compare_with_previous(
+                honor_result['honor_score'],
+                metrics
+            )
+        else:
+            comparison = {'has_history': False}
         
         # Generate human-friendly summary
         human_summary = self.feedback_generator.generate_session_summary(
@@ -196,12 +323,13 @@ class HonorHero:
         )
         
         # Save to session history
-        self.session_history.add_session({
-            'final_honor_score': honor_result['honor_score'],
-            'tier': honor_result['tier'],
-            'components': metrics,
-            'duration': duration
-        })
+        if self.session_history is not None:
+            self.session_history.add_session({
+                'final_honor_score': honor_result['honor_score'],
+                'tier': honor_result['tier'],
+                'components': metrics,
+                'duration': duration
+            })
         
         return {
             'final_honor_score': honor_result['honor_score'],
@@ -220,18 +348,36 @@ class HonorHero:
     
     def reset(self):
         """Reset all analyzers for a new performance"""
+        self.feature_extractor.reset()
         self.pitch_analyzer.reset()
         self.timing_analyzer.reset()
         self.dynamics_analyzer.reset()
         self.consistency_analyzer.reset()
         self.scoring_system.reset()
+        self.clock.reset()
         self.current_metrics = {}
         self.previous_metrics = {}
     
+    def get_scheduler_statistics(self) -> Dict:
+        """Get metrics scheduler tick counters"""
+        return self.metrics_scheduler.get_stats()
+    
+    def get_clock_statistics(self) -> Dict:
+        """Get sample, wall and ADC clock times and their drift"""
+        return self.clock.get_stats()
+    
+    def get_capture_statistics(self) -> Dict:
+        """Get audio capture overflow counters"""
+        return self.audio_capture.get_overflow_stats()
+    
     def get_session_statistics(self) -> Dict:
         """Get statistics from session history"""
+        if self.session_history is None:
+            return {}
         return self.session_history.get_statistics()
     
     def get_recent_sessions(self, count: int = 10) -> list:
         """Get recent practice sessions"""
+        if self.session_history is None:
+            return []
         return self.session_history.get_recent_sessions(count)
@@ -0,0 +1,119 @@
+"""
+Metrics Scheduler Module
+Drives periodic metric updates at a fixed rate, decoupled from audio blocks
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+import config
+
+
+class MetricsScheduler:
+    """
+    Fixed-rate tick source for metric updates
+    
+    Ticks sit on a fixed grid (start + k * period) regardless of when audio
+    blocks arrive. If the consumer is slower than the period, the ticks it
+    missed are coalesced into a single update instead of being replayed in
+    a burst.
+    
+    The scheduler can run on its own thread (start/stop) or be polled with
+    an external clock, e.g. sample positions in offline analysis.
+    """
+    
+    def __init__(self, rate: float = config.METRICS_UPDATE_RATE,
+                 callback: Optional[Callable[[], None]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 name: str = 'HonorHeroMetrics'):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.callback = callback
+        self.clock = clock
+        self.name = name
+        
+        self.next_tick = None
+        self.ticks = 0
+        self.coalesced = 0  # Ticks skipped because the consumer fell behind
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+    
+    def reset(self, start_time: float = None):
+        """
+        Restart the tick grid
+        
+        Args:
+            start_time: Time of tick zero (default: now on the scheduler clock)
+        """
+        if start_time is None:
+            start_time = self.clock()
+        self.next_tick = start_time + self.period
+        self.ticks = 0
+        self.coalesced = 0
+    
+    def poll(self, now: float) -> bool:
+        """
+        Check whether a tick is due at `now` and advance the grid
+        
+        Args:
+            now: Current time on the scheduler clock
+            
+        Returns:
+            True if one update should run now
+        """
+        if self.next_tick is None:
+            self.reset(now)
+            return False
+        
+        if now < self.next_tick:
+            return False
+        
+        missed = int((now - self.next_tick) // self.period)
+        self.coalesced += missed
+        self.next_tick += (missed + 1) * self.period
+        self.ticks += 1
+        return True
+    
+    def start(self):
+        """Start ticking on a background thread"""
+        if self.callback is None:
+            raise ValueError("A callback is required to run the scheduler thread")
+        
+        self.stop()
+        self.reset()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=self.name,
+            daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background thread and wait for the current tick to finish"""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+    
+    def _run(self):
+        """Thread body: sleep until the next grid point, then run one update"""
+        while not self._stop_event.is_set():
+            if self.poll(self.clock()):
+                try:
+                    self.callback()
+                except Exception as e:
+                    print(f"Warning: Metrics update failed ({e})")
+            else:
+                self._stop_event.wait(max(0.0, self.next_tick - self.clock()))
+    
+    def get_stats(self) -> dict:
+        """Get tick counters"""
+        return {
+            'rate': self.rate,
+            'ticks': self.ticks,
+            'coalesced': self.coalesced
+        }
@@ -0,0 +1,71 @@
+"""
+Note Utilities Module
+Frequency / MIDI / note-name conversions without the librosa dependency
+"""
+
+import math
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+# Accepted spellings when parsing note names
+_NOTE_OFFSETS = {name: i for i, name in enumerate(NOTE_NAMES)}
+_NOTE_OFFSETS.update({'Db': 1, 'Eb': 3, 'Gb': 6, 'Ab': 8, 'Bb': 10,
+                      'C♯': 1, 'D♯': 3, 'F♯': 6, 'G♯': 8, 'A♯': 10,
+                      'D♭': 1, 'E♭': 3, 'G♭': 6, 'A♭': 8, 'B♭': 10})
+
+A4_MIDI = 69
+A4_FREQUENCY = 440.0
+
+# Precomputed lookup tables over the full MIDI range so the real-time path
+# never formats or parses note names
+MIDI_RANGE = 128
+MIDI_NOTE_NAMES = tuple(f"{NOTE_NAMES[m % 12]}{m // 12 - 1}" for m in range(MIDI_RANGE))
+NOTE_NAME_TO_MIDI = {name: m for m, name in enumerate(MIDI_NOTE_NAMES)}
+
+
+def hz_to_midi(frequency: float) -> float:
+    """Convert a frequency in Hz to a (fractional) MIDI note number"""
+    return 12 * math.log2(frequency / A4_FREQUENCY) + A4_MIDI
+
+
+def midi_to_hz(midi: float) -> float:
+    """Convert a MIDI note number to a frequency in Hz"""
+    return A4_FREQUENCY * 2 ** ((midi - A4_MIDI) / 12)
+
+
+def nearest_midi(frequency: float) -> int:
+    """Get the closest integer MIDI note number for a frequency"""
+    return round(12 * math.log2(frequency / A4_FREQUENCY)) + A4_MIDI
+
+
+def midi_to_note(midi: int) -> str:
+    """Convert an integer MIDI note number to a name like 'C#4'"""
+    midi = int(midi)
+    if 0 <= midi < MIDI_RANGE:
+        return MIDI_NOTE_NAMES[midi]
+    return f"{NOTE_NAMES[midi % 12]}{midi // 12 - 1}"
+
+
+def note_to_midi(note_name: str) -> int:
+    """
+    Convert a note name like 'A4', 'C#3' or 'Bb2' to a MIDI note number
+    
+    Raises:
+        ValueError: If the note name cannot be parsed
+    """
+    midi = NOTE_NAME_TO_MIDI.get(note_name)
+    if midi is not None:
+        return midi
+    for split in range(len(note_name) - 1, 0, -1):
+        pitch_class, octave = note_name[:split], note_name[split:]
+        if pitch_class in _NOTE_OFFSETS:
+            try:
+                return (int(octave) + 1) * 12 + _NOTE_OFFSETS[pitch_class]
+            except ValueError:
+                break
+    raise ValueError(f"Invalid note name: {note_name!r}")
+
+
+def note_to_hz(note_name: str) -> float:
+    """Convert a note name to a frequency in Hz"""
+    return midi_to_hz(note_to_midi(note_name))
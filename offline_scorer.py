@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Offline Scoring Module
+Scores recorded performances (WAV/FLAC) faster than real time
+
+Feeds the same analyzers as the live engine, but stamps each block with
+its sample position instead of the wall clock, so results are
+deterministic and independent of machine load.
+"""
+
+import time
+import wave
+import numpy as np
+from typing import Dict, Iterator, Optional
+from honorhero import HonorHero
+from feature_cache import PerformanceFeatures
+import config
+
+# soundfile reads WAV/FLAC/OGG; the standard wave module covers PCM WAV only.
+# It is imported on first use to keep startup light.
+_sf = None
+SOUNDFILE_AVAILABLE: Optional[bool] = None  # None until the first load attempt
+
+
+def _load_soundfile():
+    """Import soundfile on first use, returning None if unavailable"""
+    global _sf, SOUNDFILE_AVAILABLE
+    if SOUNDFILE_AVAILABLE is None:
+        try:
+            import soundfile
+            _sf = soundfile
+            SOUNDFILE_AVAILABLE = True
+        except (OSError, ImportError):
+            SOUNDFILE_AVAILABLE = False
+    return _sf if SOUNDFILE_AVAILABLE else None
+
+
+def get_sample_rate(path: str) -> int:
+    """Get the sample rate of an audio file"""
+    sf = _load_soundfile()
+    if sf is not None:
+        return sf.info(path).samplerate
+    with wave.open(str(path), 'rb') as reader:
+        return reader.getframerate()
+
+
+def read_audio_chunks(path: str, chunk_frames: int) -> Iterator[np.ndarray]:
+    """
+    Read an audio file in large chunks
+    
+    Args:
+        path: Audio file path
+        chunk_frames: Frames per chunk
+    
+    Yields:
+        1-D float32 mono chunks (channels are averaged)
+    """
+    sf = _load_soundfile()
+    if sf is not None:
+        for block in sf.blocks(path, blocksize=chunk_frames, dtype='float32', always_2d=True):
+            yield block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+        return
+    
+    if not str(path).lower().endswith('.wav'):
+        raise RuntimeError(f"Cannot read {path}: install soundfile for non-WAV formats")
+    
+    with wave.open(str(path), 'rb') as reader:
+        sample_width = reader.getsampwidth()
+        if sample_width not in (1, 2, 4):
+            raise RuntimeError(f"Unsupported WAV sample width: {sample_width * 8} bits")
+        
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[sample_width]
+        scale = float(2 ** (8 * sample_width - 1))
+        channels = reader.getnchannels()
+        
+        while True:
+            raw = reader.readframes(chunk_frames)
+            if not raw:
+                break
+            data = np.frombuffer(raw, dtype=dtype).astype(np.float32)
+            if sample_width == 1:
+                data -= 128.0
+            data /= scale
+            yield data.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+
+class OfflineScorer:
+    """
+    Scores audio files with the HonorHero analyzer stack, no audio device
+    
+    One scorer holds one engine and reuses it for every file, so it can be
+    kept per worker process in batch jobs.
+    """
+    
+    def __init__(self, profile: str = None, pitch_backend: str = None,
+                 chunk_blocks: int = config.OFFLINE_CHUNK_BLOCKS):
+        """
+        Initialize offline scorer
+        
+        Args:
+            profile: Name in config.PROFILES (default: current config tolerances)
+            pitch_backend: Pitch backend name (default: config.PITCH_BACKEND)
+            chunk_blocks: Analysis blocks read from disk at a time
+        """
+        self.profile = profile
+        self.chunk_blocks = chunk_blocks
+        self.engine = HonorHero(profile=profile, pitch_backend=pitch_backend, use_history=False)
+    
+    def _stream_file(self, path: str, on_block=None, on_update=None) -> tuple:
+        """
+        Run every block of a recording through the engine
+        
+        A trailing partial block is zero-padded to the block size, so every
+        sample of the file is analyzed.
+        
+        Args:
+            path: Audio file path
+            on_block: Called with process_block's results for each block
+            on_update: Called at each metrics tick (sample-time schedule)
+        
+        Returns:
+            (sample_rate, block_size, duration in seconds)
+        """
+        engine = self.engine
+        engine.reset()
+        
+        # Keep the live block duration at any file sample rate
+        sample_rate = get_sample_rate(path)
+        block_size = max(1, int(round(config.BUFFER_SIZE * sample_rate / config.SAMPLE_RATE)))
+        chunks = read_audio_chunks(path, block_size * self.chunk_blocks)
+        
+        scheduler = engine.metrics_scheduler
+        scheduler.reset(0.0)
+        engine.clock.reset(sample_rate)
+        position = 0
+        pending = np.zeros(0, dtype=np.float32)
+        
+        def run_block(block: np.ndarray, frames: int):
+            nonlocal position
+            results = engine.process_block(block, sample_rate,
+                                           engine.clock.block_time(frames, position))
+            if on_block is not None:
+                on_block(results)
+            position += frames
+            if scheduler.poll(position / sample_rate) and on_update is not None:
+                on_update()
+        
+        for chunk in chunks:
+            if pending.size:
+                chunk = np.concatenate((pending, chunk))
+            full = len(chunk) - len(chunk) % block_size
+            
+            for start in range(0, full, block_size):
+                run_block(chunk[start:start + block_size], block_size)
+            
+            pending = chunk[full:]
+        
+        if pending.size:
+            last = np.zeros(block_size, dtype=np.float32)
+            last[:len(pending)] = pending
+            run_block(last, len(pending))
+        
+        return sample_rate, block_size, position / sample_rate
+    
+    def score_file(self, path: str) -> Dict:
+        """
+        Score one recording
+        
+        Args:
+            path: Audio file path
+        
+        Returns:
+            The engine's final results plus 'file', 'sample_rate',
+            'analysis_time' and 'realtime_factor'
+        """
+        started = time.perf_counter()
+        engine = self.engine
+        sample_rate, _, duration = self._stream_file(path, on_update=engine.update_metrics)
+        results = engine.finalize(duration=duration)
+        
+        analysis_time = time.perf_counter() - started
+        results['file'] = str(path)
+        results['sample_rate'] = sample_rate
+        results['analysis_time'] = analysis_time
+        results['realtime_factor'] = duration / analysis_time if analysis_time > 0 else 0.0
+        return results
+    
+    def extract_features(self, path: str) -> PerformanceFeatures:
+        """
+        Extract the tolerance-independent features of a recording
+        
+        Runs the same DSP as score_file but scores nothing, so the result
+        can be scored under any profile (see profile_scoring).
+        
+        Args:
+            path: Audio file path
+        
+        Returns:
+            PerformanceFeatures of the recording
+        """
+        deviations = []
+        onsets = []
+        levels = []
+        updates = []
+        
+        def on_block(results):
+            if results['pitch']['detected']:
+                deviations.append(results['pitch']['deviation'])
+            onsets.extend(results['timing']['onsets'])
+            levels.append(results['dynamics']['db'])
+        
+        def on_update():
+            updates.append((len(deviations), len(onsets), len(levels)))
+        
+        sample_rate, block_size, duration = self._stream_file(path, on_block, on_update)
+        return PerformanceFeatures(
+            pitch_deviations=np.array(deviations, dtype=np.float64),
+            onset_times=np.array(onsets, dtype=np.float64),
+            levels_db=np.array(levels, dtype=np.float64),
+            update_counts=np.array(updates, dtype=np.int64).reshape(-1, 3),
+            sample_rate=sample_rate,
+            block_size=block_size,
+            duration=duration
+        )
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='HonorHero offline scoring - score a recorded performance'
+    )
+    parser.add_argument('file', help='Audio file (WAV, FLAC, ...)')
+    parser.add_argument(
+        '--profile',
+        type=str,
+        choices=list(config.PROFILES),
+        default=None,
+        help='User profile: beginner | intermediate | advanced | therapy'
+    )
+    parser.add_argument(
+        '--pitch-backend',
+        type=str,
+        default=None,
+        help='Pitch backend: piptrack | yin (default: config.PITCH_BACKEND)'
+    )
+    args = parser.parse_args()
+    
+    scorer = OfflineScorer(profile=args.profile, pitch_backend=args.pitch_backend)
+    results = scorer.score_file(args.file)
+    
+    print(f"Archivo:      {results['file']}")
+    print(f"Honor Score:  {results['final_honor_score']:.1f} ({results['tier']})")
+    for name, score in results['components'].items():
+        print(f"  {name:<12} {score:5.1f}")
+    print(f"Duración:     {results['duration']:.1f}s "
+          f"(analizado en {results['analysis_time']:.2f}s, "
+          f"{results['realtime_factor']:.0f}x tiempo real)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+"""
+Onset Detector Module
+Pluggable note-onset detectors used by TimingAnalyzer
+"""
+
+import numpy as np
+from typing import Dict, List, Type, Union
+import config
+from fft_utils import rfft_into
+
+
+class OnsetDetector:
+    """
+    Interface for streaming onset detectors
+    
+    A detector is fed consecutive audio blocks and returns the onset times
+    it found. Detectors may keep state across blocks (and may report an
+    onset one block late), so each analyzer needs its own instance.
+    """
+    
+    name = 'base'
+    
+    def detect(self, audio_chunk: np.ndarray, sample_rate: int, timestamp: float) -> List[float]:
+        """
+        Find onsets in the next audio block
+        
+        Args:
+            audio_chunk: 1-D audio data following the previous block
+            sample_rate: Sample rate in Hz
+            timestamp: Time of the block's first sample in seconds
+        
+        Returns:
+            Onset times in seconds, in order
+        """
+        raise NotImplementedError
+    
+    def reset(self):
+        """Forget all state from previous blocks"""
+
+
+class EnergyOnsetDetector(OnsetDetector):
+    """
+    Original block-energy detector
+    
+    Reports the block timestamp whenever the block's total energy exceeds
+    a fixed threshold, at most once per min_interval. Resolution is one
+    block and sustained notes keep re-triggering.
+    """
+    
+    name = 'energy'
+    
+    def __init__(self, threshold: float = 0.01, min_interval: float = 0.1):
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self.last_onset = None
+    
+    def detect(self, audio_chunk: np.ndarray, sample_rate: int, timestamp: float) -> List[float]:
+        energy = float(np.dot(audio_chunk, audio_chunk))
+        if energy > self.threshold and (self.last_onset is None or
+                                        timestamp - self.last_onset > self.min_interval):
+            self.last_onset = timestamp
+            return [timestamp]
+        return []
+    
+    def reset(self):
+        self.last_onset = None
+
+
+class SpectralFluxOnsetDetector(OnsetDetector):
+    """
+    Spectral-flux detector with an adaptive threshold
+    
+    Each block is cut into hop-spaced frames that continue across block
+    boundaries. The flux of a frame is the mean increase of log-compressed
+    magnitudes over the previous frame; a frame is an onset when its flux
+    is a local peak above mean + ratio * std + delta of the flux over the
+    preceding threshold window. Peak picking needs the next frame, so an
+    onset in the last frame of a block is reported with the following block.
+    
+    The onset is then placed to the sample inside the peak frame where the
+    short-term energy rises fastest.
+    
+    All per-frame work happens in buffers that only grow when a larger
+    block arrives, so steady-state blocks allocate no arrays.
+    """
+    
+    name = 'spectral_flux'
+    
+    def __init__(self, frame_size: int = config.ONSET_FRAME_SIZE,
+                 hop_size: int = config.ONSET_HOP_SIZE,
+                 threshold_window: float = config.ONSET_THRESHOLD_WINDOW,
+                 threshold_ratio: float = config.ONSET_THRESHOLD_RATIO,
+                 threshold_delta: float = config.ONSET_THRESHOLD_DELTA,
+                 min_interval: float = config.ONSET_MIN_INTERVAL,
+                 compression: float = config.ONSET_COMPRESSION):
+        if hop_size <= 0 or frame_size < hop_size:
+            raise ValueError("Need 0 < hop_size <= frame_size")
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.threshold_window = threshold_window
+        self.threshold_ratio = threshold_ratio
+        self.threshold_delta = threshold_delta
+        self.min_interval = min_interval
+        self.compression = compression
+        self.window = np.hanning(frame_size)
+        self.bins = frame_size // 2 + 1
+        self.sample_rate = None
+        self.window_frames = 1
+        self.frame_capacity = 0
+        # Sample buffer plus a spare of the same size to compact into
+        self.buffer = np.zeros(0, dtype=np.float64)
+        self.spare = np.zeros(0, dtype=np.float64)
+        # Onset refinement looks at most one frame plus one hop
+        span = frame_size + hop_size
+        self.squares = np.zeros(span, dtype=np.float64)
+        self.energy = np.zeros(span + 1, dtype=np.float64)
+        self.after = np.zeros(span, dtype=np.float64)
+        self.before = np.zeros(span, dtype=np.float64)
+        self.reset()
+    
+    def reset(self):
+        self.sample_rate = None
+        self.length = 0             # Samples held in buffer
+        self.buffer_start = 0       # Absolute sample index of buffer[0]
+        self.samples_seen = 0       # Absolute sample index after the last block
+        self.next_frame = 0         # Absolute start of the next frame to analyze
+        self.has_previous = False   # magnitudes[0] holds the previous frame
+        self.flux_count = 0         # Frames analyzed so far
+        # Last analyzed frame, still waiting for its right neighbour
+        self.pending_flux = 0.0
+        self.pending_threshold = np.inf
+        self.pending_start = 0
+        self.before_flux = 0.0
+        self.last_onset_sample = None
+    
+    def _plan(self, sample_rate: int):
+        """Size the threshold window for a sample rate"""
+        self.reset()
+        self.sample_rate = sample_rate
+        self.window_frames = max(1, int(round(self.threshold_window * sample_rate / self.hop_size)))
+        self.flux_tail = np.zeros(self.window_frames, dtype=np.float64)
+        self.frame_capacity = 0  # Reallocate frame buffers for the new window
+    
+    def _reserve_samples(self, length: int):
+        """Make room for length samples in the buffer"""
+        if length <= len(self.buffer):
+            return
+        grown = np.zeros(length, dtype=np.float64)
+        grown[:self.length] = self.buffer[:self.length]
+        self.buffer = grown
+        self.spare = np.zeros(length, dtype=np.float64)
+    
+    def _reserve_frames(self, count: int):
+        """Make room for count frames in the per-frame buffers"""
+        if count <= self.frame_capacity:
+            return
+        history = self.window_frames + count
+        previous = self.magnitudes[0].copy() if self.frame_capacity else None
+        self.windowed = np.zeros((count, self.frame_size), dtype=np.float64)
+        self.spectra = np.zeros((count, self.bins), dtype=np.complex128)
+        self.magnitudes = np.zeros((count + 1, self.bins), dtype=np.float64)
+        if previous is not None:
+            self.magnitudes[0] = previous
+        self.rises = np.zeros((count, self.bins), dtype=np.float64)
+        self.flux = np.zeros(count, dtype=np.float64)
+        self.history = np.zeros(history, dtype=np.float64)
+        self.squared = np.zeros(history, dtype=np.float64)
+        self.sums = np.zeros(history + 1, dtype=np.float64)
+        self.square_sums = np.zeros(history + 1, dtype=np.float64)
+        self.offsets = np.arange(count, dtype=np.float64)
+        self.counts = np.zeros(count, dtype=np.float64)
+        self.local_mean = np.zeros(count, dtype=np.float64)
+        self.local_std = np.zeros(count, dtype=np.float64)
+        self.thresholds = np.zeros(count, dtype=np.float64)
+        self.values = np.zeros(count + 2, dtype=np.float64)
+        self.candidate_thresholds = np.zeros(count, dtype=np.float64)
+        self.peaks = np.zeros(count, dtype=bool)
+        self.condition = np.zeros(count, dtype=bool)
+        self.frame_capacity = count
+    
+    def detect(self, audio_chunk: np.ndarray, sample_rate: int, timestamp: float) -> List[float]:
+        if sample_rate != self.sample_rate:
+            self._plan(sample_rate)
+        
+        block_start = self.samples_seen
+        size = len(audio_chunk)
+        self.samples_seen += size
+        self._reserve_samples(self.length + size)
+        np.copyto(self.buffer[self.length:self.length + size], audio_chunk)
+        self.length += size
+        
+        # All complete frames, continuing from the previous block
+        offset = self.next_frame - self.buffer_start
+        count = (self.length - offset - self.frame_size) // self.hop_size + 1
+        onsets = []
+        if count > 0:
+            self._reserve_frames(count)
+            first = self.next_frame
+            self.next_frame += count * self.hop_size
+            
+            for onset_sample in self._pick_peaks(offset, first, count):
+                onsets.append(timestamp + (onset_sample - block_start) / sample_rate)
+        
+        # Keep enough history for the next frame and the onset refinement
+        keep_from = max(self.buffer_start, self.next_frame - self.frame_size - self.hop_size)
+        shift = keep_from - self.buffer_start
+        if shift:
+            kept = self.length - shift
+            np.copyto(self.spare[:kept], self.buffer[shift:self.length])
+            self.buffer, self.spare = self.spare, self.buffer
+            self.length = kept
+            self.buffer_start = keep_from
+        return onsets
+    
+    def _pick_peaks(self, offset: int, first: int, count: int) -> List[int]:
+        """Flux, adaptive threshold and peak picking for count frames from buffer[offset]"""
+        # Log-compressed magnitudes; row 0 holds the previous block's last frame
+        windowed = self.windowed[:count]
+        # Row by row: NumPy copies overlapping frame views before a ufunc
+        for row in range(count):
+            start = offset + row * self.hop_size
+            np.multiply(self.buffer[start:start + self.frame_size], self.window, out=windowed[row])
+        spectra = rfft_into(windowed, self.spectra[:count], axis=1)
+        magnitudes = self.magnitudes[:count + 1]
+        current = magnitudes[1:]
+        np.abs(spectra, out=current)
+        current *= self.compression
+        np.log1p(current, out=current)
+        if not self.has_previous:
+            magnitudes[0] = magnitudes[1]
+            self.has_previous = True
+        
+        rises = self.rises[:count]
+        np.subtract(current, magnitudes[:-1], out=rises)
+        np.maximum(rises, 0.0, out=rises)
+        flux = np.mean(rises, axis=1, out=self.flux[:count])
+        magnitudes[0] = magnitudes[count]
+        
+        # Threshold from the mean and spread of the preceding flux values
+        # (only the frames seen so far while the window is filling up)
+        window = self.window_frames
+        history = self.history[:window + count]
+        history[:window] = self.flux_tail
+        history[window:] = flux
+        sums = self.sums[:window + count + 1]
+        np.add.accumulate(history, out=sums[1:])
+        square_sums = self.square_sums[:window + count + 1]
+        squared = np.multiply(history, history, out=self.squared[:window + count])
+        np.add.accumulate(squared, out=square_sums[1:])
+        
+        counts = np.add(self.offsets[:count], self.flux_count, out=self.counts[:count])
+        np.clip(counts, 1, window, out=counts)
+        local_mean = np.subtract(sums[window:window + count], sums[:count], out=self.local_mean[:count])
+        local_mean /= counts
+        local_std = np.subtract(square_sums[window:window + count], square_sums[:count],
+                                out=self.local_std[:count])
+        local_std /= counts
+        thresholds = np.multiply(local_mean, local_mean, out=self.thresholds[:count])
+        local_std -= thresholds
+        np.maximum(local_std, 0.0, out=local_std)
+        np.sqrt(local_std, out=local_std)
+        np.multiply(local_std, self.threshold_ratio, out=thresholds)
+        thresholds += local_mean
+        thresholds += self.threshold_delta
+        warming_up = np.less_equal(counts, window // 4, out=self.condition[:count])
+        np.copyto(thresholds, np.inf, where=warming_up)  # Too little context yet
+        self.flux_tail[:] = history[count:]
+        self.flux_count += count
+        
+        # Candidates: the pending frame plus all new frames but the last
+        values = self.values[:count + 2]
+        values[0] = self.before_flux
+        values[1] = self.pending_flux
+        values[2:] = flux
+        candidate_thresholds = self.candidate_thresholds[:count]
+        candidate_thresholds[0] = self.pending_threshold
+        candidate_thresholds[1:] = thresholds[:-1]
+        middle = values[1:-1]
+        peaks = np.greater(middle, candidate_thresholds, out=self.peaks[:count])
+        condition = self.condition[:count]
+        peaks &= np.greater_equal(middle, values[:-2], out=condition)
+        peaks &= np.greater(middle, values[2:], out=condition)
+        
+        pending_start = self.pending_start
+        self.before_flux = float(values[-2])
+        self.pending_flux = float(flux[-1])
+        self.pending_threshold = float(thresholds[-1])
+        self.pending_start = first + (count - 1) * self.hop_size
+        
+        onsets = []
+        if not peaks.any():
+            return onsets
+        min_gap = self.min_interval * self.sample_rate
+        for index in np.flatnonzero(peaks):
+            frame_start = pending_start if index == 0 else first + (int(index) - 1) * self.hop_size
+            onset_sample = self._refine(frame_start)
+            if self.last_onset_sample is not None and onset_sample - self.last_onset_sample < min_gap:
+                continue
+            self.last_onset_sample = onset_sample
+            onsets.append(onset_sample)
+        return onsets
+    
+    def _refine(self, frame_start: int) -> int:
+        """Sample in and just before a frame where short-term energy rises fastest"""
+        begin = max(self.buffer_start, frame_start - self.hop_size)
+        segment = self.buffer[begin - self.buffer_start:frame_start + self.frame_size - self.buffer_start]
+        width = max(1, self.hop_size // 4)
+        length = len(segment)
+        if length < 2 * width + 1:
+            return frame_start
+        
+        # Energy in the width samples after minus before each position
+        energy = self.energy[:length + 1]
+        np.multiply(segment, segment, out=self.squares[:length])
+        np.add.accumulate(self.squares[:length], out=energy[1:])
+        count = length - 2 * width + 1
+        after = np.subtract(energy[2 * width:], energy[width:length - width + 1], out=self.after[:count])
+        before = np.subtract(energy[width:length - width + 1], energy[:count], out=self.before[:count])
+        after -= before
+        return begin + width + int(after.argmax())
+
+
+# Registry of available detectors by name
+ONSET_DETECTORS: Dict[str, Type[OnsetDetector]] = {
+    'energy': EnergyOnsetDetector,
+    'spectral_flux': SpectralFluxOnsetDetector,
+}
+
+
+def register_onset_detector(name: str, detector_class: Type[OnsetDetector]):
+    """
+    Register an onset detector so it can be selected by name
+    
+    Args:
+        name: Name used in config.ONSET_DETECTOR / TimingAnalyzer(onset_detector=...)
+        detector_class: OnsetDetector subclass
+    """
+    ONSET_DETECTORS[name] = detector_class
+
+
+def get_onset_detector(detector: Union[str, OnsetDetector] = None) -> OnsetDetector:
+    """
+    Get an onset detector instance
+    
+    Args:
+        detector: Detector name, an existing OnsetDetector instance, or None
+                  for config.ONSET_DETECTOR
+    """
+    if isinstance(detector, OnsetDetector):
+        return detector
+    
+    name = detector or config.ONSET_DETECTOR
+    if name not in ONSET_DETECTORS:
+        available = ', '.join(sorted(ONSET_DETECTORS))
+        raise ValueError(f"Unknown onset detector '{name}' (available: {available})")
+    return ONSET_DETECTORS[name]()
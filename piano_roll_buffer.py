@@ -0,0 +1,81 @@
+"""
+Piano Roll Buffer Module
+Circular column store backing the piano roll display
+"""
+
+import numpy as np
+from typing import Optional
+
+
+class PianoRollBuffer:
+    """
+    Circular 2-D array of piano roll columns (rows = pitches, columns = time)
+    
+    Each column covers window_seconds / columns seconds. Time only moves
+    forward, so advancing clears just the columns that scrolled out and
+    stamping writes one cell, which keeps the per-frame cost proportional
+    to elapsed time and new notes rather than to the window length.
+    Cells hold a small integer level (0 = empty).
+    """
+    
+    def __init__(self, rows: int, columns: int, window_seconds: float):
+        self.rows = rows
+        self.columns = columns
+        self.window_seconds = window_seconds
+        self.column_duration = window_seconds / columns
+        self.cells = np.zeros((rows, columns), dtype=np.uint8)
+        self.head: Optional[int] = None  # Absolute index of the newest column
+    
+    def column_index(self, timestamp: float) -> int:
+        """Absolute column index of a timestamp"""
+        return int(timestamp // self.column_duration)
+    
+    def advance(self, now: float) -> int:
+        """
+        Scroll the roll forward to the column containing now
+        
+        Returns:
+            Number of columns scrolled
+        """
+        column = self.column_index(now)
+        if self.head is None:
+            self.head = column
+            return 0
+        
+        steps = column - self.head
+        if steps <= 0:
+            return 0  # Clock did not move (or went backwards)
+        
+        if steps >= self.columns:
+            self.cells[:] = 0
+        else:
+            cleared = (self.head + 1 + np.arange(steps)) % self.columns
+            self.cells[:, cleared] = 0
+        self.head = column
+        return steps
+    
+    def stamp(self, timestamp: float, row: int, level: int) -> bool:
+        """
+        Mark a note in the column containing timestamp
+        
+        Returns:
+            False if the note falls outside the window or the row range
+        """
+        if self.head is None or not 0 <= row < self.rows:
+            return False
+        column = self.column_index(timestamp)
+        if column > self.head or column <= self.head - self.columns:
+            return False
+        self.cells[row, column % self.columns] = level
+        return True
+    
+    def view(self) -> np.ndarray:
+        """Get the roll as a rows x columns array, oldest column first"""
+        if self.head is None:
+            return self.cells
+        return np.roll(self.cells, -(self.head + 1) % self.columns, axis=1)
+    
+    def clear(self):
+        """Remove all notes"""
+        self.cells[:] = 0
+        self.head = None
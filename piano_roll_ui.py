@@ -6,13 +6,21 @@ Enhanced with visual identity and gamification features
 
 import time
 import sys
+import numpy as np
 from collections import deque
-from typing import Dict, List, Tuple
-import librosa
+from typing import Dict, List, Optional, Tuple
 from honorhero import HonorHero
 import config
+from note_utils import NOTE_NAMES, MIDI_RANGE, MIDI_NOTE_NAMES, NOTE_NAME_TO_MIDI, nearest_midi
 from themes import get_theme, get_score_color, Icons, VisualFeedback, format_with_theme, Colors
 from achievements import AchievementSystem
+from terminal_renderer import TerminalRenderer
+from piano_roll_buffer import PianoRollBuffer
+from render_loop import RenderThread
+
+
+# Roll cell level -> character (0 = empty, 4 = loudest)
+VELOCITY_CHARS = ' ░▒▓█'
 
 
 class PianoRollUI:
@@ -60,7 +68,7 @@ class PianoRollUI:
         self.engine = HonorHero()
         
         # Temporal buffer for notes
-        # Each entry: {'timestamp': float, 'note': str, 'frequency': float, 'score': float, 'velocity': float}
+        # Each entry: {'timestamp': float, 'midi': int, 'frequency': float, 'score': float, 'velocity': float}
         self.note_buffer = deque(maxlen=100)  # Keep last 100 notes
         
         # Piano roll display configuration
@@ -69,32 +77,47 @@ class PianoRollUI:
         self.total_rows = (self.octave_range[1] - self.octave_range[0] + 1) * self.notes_per_octave
         self.display_width = 80  # Width of the piano roll
         
+        # Circular column store: scrolls with time, only new notes are stamped
+        self.roll = PianoRollBuffer(self.total_rows, self.display_width, window_seconds)
+        self._last_stamped = None
+        
         # Note names for display
-        self.note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+        self.note_names = list(NOTE_NAMES)
+        
+        # Lookup tables: MIDI number -> row (-1 outside the roll) and row -> label
+        lowest_midi = (self.octave_range[0] + 1) * self.notes_per_octave
+        highest_midi = lowest_midi + self.total_rows - 1
+        self.midi_rows = np.full(MIDI_RANGE, -1, dtype=np.int32)
+        self.midi_rows[lowest_midi:highest_midi + 1] = np.arange(self.total_rows - 1, -1, -1)
+        self.row_labels = [f"{MIDI_NOTE_NAMES[highest_midi - row]:>4}" for row in range(self.total_rows)]
         
         # Performance metrics for trend display
         self.recent_scores = deque(maxlen=30)  # Last 30 evaluations
         self.last_update_time = 0
         
+        # Differential renderer: redraws only changed cells, one write per frame
+        self.renderer = TerminalRenderer()
+        
+        # Frames are drawn on their own thread from the engine's latest snapshot
+        self.render_thread = RenderThread(self.render_snapshot, self.engine.snapshots,
+                                          fps=config.UI_TARGET_FPS)
+        
     def clear_screen(self):
         """Clear console screen"""
         print('\033[2J\033[H', end='')
         
+    def get_midi_row(self, midi: int) -> int:
+        """Convert MIDI note number to row index in the piano roll (-1 if out of range)"""
+        if 0 <= midi < MIDI_RANGE:
+            return int(self.midi_rows[midi])
+        return -1
+    
     def get_note_row(self, note_name: str) -> int:
         """Convert note name to row index in the piano roll"""
-        try:
-            # Parse note (e.g., "C4" -> note="C", octave=4)
-            note = note_name[:-1]
-            octave = int(note_name[-1])
-            
-            if octave < self.octave_range[0] or octave > self.octave_range[1]:
-                return -1  # Out of range
-            
-            note_index = self.note_names.index(note)
-            row = (self.octave_range[1] - octave) * self.notes_per_octave + (11 - note_index)
-            return row
-        except (ValueError, IndexError):
+        midi = NOTE_NAME_TO_MIDI.get(note_name)
+        if midi is None:
             return -1
+        return self.get_midi_row(midi)
     
     def get_color_for_score(self, score: float) -> str:
         """Get ANSI color code based on score using theme"""
@@ -102,64 +125,56 @@ class PianoRollUI:
     
     def get_velocity_char(self, velocity: float) -> str:
         """Get character representing velocity/dynamics"""
+        return VELOCITY_CHARS[self.get_velocity_level(velocity)]
+    
+    def get_velocity_level(self, velocity: float) -> int:
+        """Get the roll cell level (1-4) for a velocity"""
         if velocity >= 0.8:
-            return '█'
+            return 4
         elif velocity >= 0.6:
-            return '▓'
+            return 3
         elif velocity >= 0.4:
-            return '▒'
+            return 2
         else:
-            return '░'
+            return 1
+    
+    def _stamp_new_notes(self):
+        """Stamp notes added to the buffer since the previous frame into the roll"""
+        new_notes = []
+        for note_entry in reversed(self.note_buffer):
+            if note_entry is self._last_stamped:
+                break
+            new_notes.append(note_entry)
+        
+        for note_entry in reversed(new_notes):
+            midi = note_entry.get('midi')
+            y = self.get_midi_row(midi) if midi is not None else self.get_note_row(note_entry['note'])
+            level = self.get_velocity_level(note_entry.get('velocity', 0.5))
+            self.roll.stamp(note_entry['timestamp'], y, level)
+        
+        if self.note_buffer:
+            self._last_stamped = self.note_buffer[-1]
     
     def draw_piano_roll(self, current_time: float):
         """Draw the piano roll visualization"""
-        # Create empty piano roll grid
-        grid = [[' ' for _ in range(self.display_width)] for _ in range(self.total_rows)]
-        
-        # Time window (past window_seconds)
-        time_start = current_time - self.window_seconds
-        time_end = current_time
-        time_range = time_end - time_start
-        
-        # Plot notes in the buffer
-        for note_entry in self.note_buffer:
-            timestamp = note_entry['timestamp']
-            if timestamp < time_start or timestamp > time_end:
-                continue
-            
-            # Calculate x position (time axis)
-            x = int(((timestamp - time_start) / time_range) * (self.display_width - 1))
-            x = max(0, min(x, self.display_width - 1))
-            
-            # Calculate y position (pitch axis)
-            y = self.get_note_row(note_entry['note'])
-            if y < 0 or y >= self.total_rows:
-                continue
-            
-            # Draw note with character representing velocity
-            char = self.get_velocity_char(note_entry.get('velocity', 0.5))
-            grid[y][x] = char
+        # Scroll by the elapsed columns, then add only the new notes
+        self.roll.advance(current_time)
+        self._stamp_new_notes()
+        
+        # Notes are colored by the recent average score, computed once per frame
+        avg_score = sum(self.recent_scores) / len(self.recent_scores) if self.recent_scores else 50
+        color = self.get_color_for_score(avg_score)
         
-        # Convert grid to colored output
+        # Convert roll levels to colored output
+        level_cells = [' '] + [f"{color}{char}\033[0m" for char in VELOCITY_CHARS[1:]]
+        empty_row = ' ' * self.display_width
         lines = []
-        for row_idx, row in enumerate(grid):
-            # Get note name for this row
-            octave = self.octave_range[1] - (row_idx // self.notes_per_octave)
-            note_idx = 11 - (row_idx % self.notes_per_octave)
-            note_name = f"{self.note_names[note_idx]}{octave}"
-            
-            # Build row string with colors
-            row_str = f"{note_name:>4} │"
-            for char in row:
-                if char != ' ':
-                    # Color based on recent average score
-                    avg_score = sum(self.recent_scores) / len(self.recent_scores) if self.recent_scores else 50
-                    color = self.get_color_for_score(avg_score)
-                    row_str += f"{color}{char}\033[0m"
-                else:
-                    row_str += char
-            row_str += "│"
-            lines.append(row_str)
+        for row_idx, levels in enumerate(self.roll.view()):
+            if levels.any():
+                row_str = ''.join([level_cells[level] for level in levels.tolist()])
+            else:
+                row_str = empty_row
+            lines.append(f"{self.row_labels[row_idx]} │{row_str}│")
         
         return lines
     
@@ -212,33 +227,40 @@ class PianoRollUI:
             return
         
         self.last_update_time = current_time
+        self.render_frame(metrics, current_time)
         
-        # Clear screen
-        self.clear_screen()
+        # Store score for trend calculation
+        self.recent_scores.append(metrics.get('honor_score', 0))
+    
+    def render_frame(self, metrics: Dict, current_time: float):
+        """Draw one frame (only the cells that changed since the last frame are written)"""
+        self.renderer.render(self.build_frame(metrics, current_time))
+    
+    def build_frame(self, metrics: Dict, current_time: float) -> List[str]:
+        """Build the lines of one piano roll frame"""
+        lines = []
         
         # Header with theme
-        print(format_with_theme("═" * 90, self.theme.primary))
-        print(format_with_theme(f"{Icons.MUSIC}  HONORHERO PIANO ROLL  {Icons.MUSIC}".center(90), 
-                               self.theme.accent + Colors.BOLD))
-        print(format_with_theme("Espejo temporal de tu interpretación".center(90), self.theme.dim_text))
-        print(format_with_theme("═" * 90, self.theme.primary))
+        lines.append(format_with_theme("═" * 90, self.theme.primary))
+        lines.append(format_with_theme(f"{Icons.MUSIC}  HONORHERO PIANO ROLL  {Icons.MUSIC}".center(90), 
+                                       self.theme.accent + Colors.BOLD))
+        lines.append(format_with_theme("Espejo temporal de tu interpretación".center(90), self.theme.dim_text))
+        lines.append(format_with_theme("═" * 90, self.theme.primary))
         # Use raw profile and mode names without color codes for centering
         profile_mode_text = f"Perfil: {self.profile['name']} | Modo: {self.mode['name']}"
-        print(profile_mode_text.center(90))
-        print()
+        lines.append(profile_mode_text.center(90))
+        lines.append("")
         
         # Piano roll visualization
-        print(format_with_theme("┌" + "─" * 4 + "┬" + "─" * 80 + "┐", self.theme.primary))
-        print(f"│{'NOTA':^4}│{format_with_theme('← PASADO', self.theme.dim_text):^40}{format_with_theme('PRESENTE →', self.theme.accent):^50}│")
-        print(format_with_theme("├" + "─" * 4 + "┼" + "─" * 80 + "┤", self.theme.primary))
+        lines.append(format_with_theme("┌" + "─" * 4 + "┬" + "─" * 80 + "┐", self.theme.primary))
+        lines.append(f"│{'NOTA':^4}│{format_with_theme('← PASADO', self.theme.dim_text):^40}{format_with_theme('PRESENTE →', self.theme.accent):^50}│")
+        lines.append(format_with_theme("├" + "─" * 4 + "┼" + "─" * 80 + "┤", self.theme.primary))
         
         # Draw the piano roll
-        roll_lines = self.draw_piano_roll(current_time)
-        for line in roll_lines:
-            print(line)
+        lines.extend(self.draw_piano_roll(current_time))
         
-        print(format_with_theme("└" + "─" * 4 + "┴" + "─" * 80 + "┘", self.theme.primary))
-        print()
+        lines.append(format_with_theme("└" + "─" * 4 + "┴" + "─" * 80 + "┘", self.theme.primary))
+        lines.append("")
         
         # Current metrics
         honor_score = metrics.get('honor_score', 0)
@@ -247,71 +269,79 @@ class PianoRollUI:
         
         # Score display with theme
         color = self.get_color_for_score(honor_score)
-        print(f"{color}╔{'═' * 88}╗{Colors.RESET}")
-        print(f"{color}║{f'HONOR SCORE: {honor_score:.1f} - {tier}':^88}║{Colors.RESET}")
-        print(f"{color}╚{'═' * 88}╝{Colors.RESET}")
-        print()
+        lines.append(f"{color}╔{'═' * 88}╗{Colors.RESET}")
+        lines.append(f"{color}║{f'HONOR SCORE: {honor_score:.1f} - {tier}':^88}║{Colors.RESET}")
+        lines.append(f"{color}╚{'═' * 88}╝{Colors.RESET}")
+        lines.append("")
         
         # Trend indicator
-        print(self.draw_trend_indicator())
-        print()
+        lines.append(self.draw_trend_indicator())
+        lines.append("")
         
         # Mini component display with icons
         comp_str = "  ".join([f"{name.upper()}: {score:.0f}" for name, score in components.items()])
-        print(format_with_theme(f"{Icons.CHART} {comp_str}", self.theme.info))
-        print()
+        lines.append(format_with_theme(f"{Icons.CHART} {comp_str}", self.theme.info))
+        lines.append("")
         
         # Legend
-        print(format_with_theme(f"Leyenda: {Icons.BAR_FULL} fuerte  ▓ medio  ▒ suave  {Icons.BAR_EMPTY} muy suave", 
-                               self.theme.dim_text))
-        print()
-        print(format_with_theme("Presiona Ctrl+C para detener...", self.theme.dim_text))
+        lines.append(format_with_theme(f"Leyenda: {Icons.BAR_FULL} fuerte  ▓ medio  ▒ suave  {Icons.BAR_EMPTY} muy suave", 
+                                       self.theme.dim_text))
+        lines.append("")
+        lines.append(format_with_theme("Presiona Ctrl+C para detener...", self.theme.dim_text))
         
-        # Store score for trend calculation
-        self.recent_scores.append(honor_score)
+        return lines
     
-    def on_update(self, metrics: Dict):
-        """Callback for real-time updates from HonorHero engine"""
-        # Extract note information from the pitch analyzer
-        # This is called by the engine with current metrics
-        current_time = time.time()
+    def record_note(self, metrics: Dict, pitch: Optional[Dict], timestamp: float):
+        """Add the latest detected pitch to the note buffer"""
+        if not pitch or pitch.get('frequency', 0) <= 0:
+            return
+        
+        frequency = pitch['frequency']
+        midi = pitch.get('midi')
+        if midi is None:
+            midi = nearest_midi(frequency)
         
-        # Get pitch information if available
         components = metrics.get('components', {})
-        pitch_score = components.get('pitch', 50)
         
-        # Try to get note from engine's pitch analyzer
-        if hasattr(self.engine.pitch_analyzer, 'pitch_history') and self.engine.pitch_analyzer.pitch_history:
-            recent_pitch = self.engine.pitch_analyzer.pitch_history[-1]
-            frequency = recent_pitch.get('frequency', 0)
-            
-            if frequency > 0:
-                # Convert frequency to note
-                try:
-                    note_number = librosa.hz_to_midi(frequency)
-                    closest_note = round(note_number)
-                    note_name = librosa.midi_to_note(closest_note)
-                    
-                    # Get velocity from dynamics
-                    velocity = components.get('dynamics', 50) / 100.0
-                    
-                    # Add to buffer
-                    self.note_buffer.append({
-                        'timestamp': current_time,
-                        'note': note_name,
-                        'frequency': frequency,
-                        'score': pitch_score,
-                        'velocity': velocity
-                    })
-                except (ValueError, IndexError):
-                    # Ignore invalid note conversions
-                    pass
+        # Get velocity from dynamics
+        velocity = components.get('dynamics', 50) / 100.0
+        
+        # Add to buffer
+        self.note_buffer.append({
+            'timestamp': timestamp,
+            'midi': midi,
+            'frequency': frequency,
+            'score': components.get('pitch', 50),
+            'velocity': velocity
+        })
+    
+    def on_update(self, metrics: Dict):
+        """Callback for real-time updates from HonorHero engine (draws on the caller's thread)"""
+        pitch_history = self.engine.pitch_analyzer.pitch_history
+        self.record_note(metrics, pitch_history[-1] if pitch_history else None, time.time())
         
         # Display the frame
         self.display_frame(metrics)
     
+    def render_snapshot(self, snapshot: Dict, fresh: bool):
+        """
+        Render thread frame
+        
+        Args:
+            snapshot: Latest metrics snapshot published by the engine
+            fresh: True the first time this snapshot is drawn
+        """
+        current_time = time.time()
+        if fresh:
+            self.record_note(snapshot, snapshot.get('pitch'), snapshot.get('time', current_time))
+            self.recent_scores.append(snapshot.get('honor_score', 0))
+        
+        # Redrawn every frame so the roll keeps scrolling between updates
+        self.render_frame(snapshot, current_time)
+    
     def display_final_results(self, results: Dict):
         """Display final performance summary with achievements"""
+        self.renderer.close()
         self.clear_screen()
         
         print(format_with_theme("=" * 90, self.theme.primary))
@@ -376,6 +406,14 @@ class PianoRollUI:
         seconds = int(duration % 60)
         print(format_with_theme(f"{Icons.ROCKET} Duración: {minutes:02d}:{seconds:02d}", self.theme.secondary))
         print(format_with_theme(f"{Icons.MUSIC} Notas tocadas: {len(self.note_buffer)}", self.theme.secondary))
+        render_stats = self.render_thread.get_stats()
+        if render_stats['frames']:
+            print(format_with_theme(
+                f"Render: {render_stats['frames']} cuadros, {render_stats['dropped_frames']} perdidos, "
+                f"{render_stats['avg_render_ms']:.1f} ms promedio, "
+                f"{self.renderer.get_stats()['bytes_per_frame']:.0f} bytes/cuadro",
+                self.theme.dim_text
+            ))
         print()
         
         # Show achievement progress
@@ -404,8 +442,9 @@ class PianoRollUI:
             duration = self.mode['duration']
         
         try:
-            # Start engine with our callback
-            self.engine.start_performance(self.on_update)
+            # Start the engine and draw its snapshots on the render thread
+            self.engine.start_performance()
+            self.render_thread.start()
             
             # Run for specified duration or until interrupted
             if duration:
@@ -420,6 +459,7 @@ class PianoRollUI:
             
         finally:
             # Stop and show results
+            self.render_thread.stop()
             results = self.engine.stop_performance()
             self.display_final_results(results)
 
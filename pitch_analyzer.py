@@ -4,17 +4,34 @@ Analyzes pitch accuracy and deviation from expected notes
 """
 
 import numpy as np
-import librosa
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 import config
+from feature_extractor import FeatureFrame
+from note_utils import hz_to_midi, midi_to_note
+from streaming_stats import RunningMean
+from timeseries import TimeSeries
+from pitch_backends import PitchBackend, get_pitch_backend
+
+
+# One pitch_history entry
+PITCH_RECORD = [('frequency', np.float32), ('midi', np.int16), ('deviation', np.float32)]
 
 
 class PitchAnalyzer:
     """Analyzes pitch accuracy with tolerant thresholds"""
     
-    def __init__(self, tolerance: float = config.PITCH_TOLERANCE):
+    def __init__(self, tolerance: float = config.PITCH_TOLERANCE,
+                 history_size: Optional[int] = config.PITCH_HISTORY_SIZE,
+                 decay: Optional[float] = config.PITCH_SCORE_DECAY,
+                 backend: Union[str, PitchBackend] = None,
+                 min_confidence: float = config.MIN_CONFIDENCE):
         self.tolerance = tolerance  # cents
-        self.pitch_history = []
+        self.backend = get_pitch_backend(backend)
+        self.min_confidence = min_confidence
+        self.history_size = history_size
+        self.pitch_history = TimeSeries(history_size, PITCH_RECORD)
+        # Running score accumulator, updated in analyze()
+        self.score_stats = RunningMean(decay=decay)
         
     def analyze(self, audio_chunk: np.ndarray, sample_rate: int) -> dict:
         """
@@ -27,38 +44,41 @@ class PitchAnalyzer:
         Returns:
             Dictionary with pitch analysis results
         """
-        # Extract pitch using librosa
-        pitches, magnitudes = librosa.piptrack(
-            y=audio_chunk,
-            sr=sample_rate,
-            fmin=librosa.note_to_hz('C2'),
-            fmax=librosa.note_to_hz('C7')
-        )
+        # Extract the most prominent pitch with the configured backend
+        avg_pitch, confidence = self.backend.estimate(audio_chunk, sample_rate)
+        return self._score_pitch(avg_pitch, confidence)
+    
+    def analyze_frame(self, frame: FeatureFrame) -> dict:
+        """
+        Analyze pitch from a block's shared features
         
-        # Get the most prominent pitch
-        pitch_values = []
-        for t in range(pitches.shape[1]):
-            index = magnitudes[:, t].argmax()
-            pitch = pitches[index, t]
-            if pitch > 0:
-                pitch_values.append(pitch)
+        Uses frame.pitch, which the FeatureExtractor fills in with this
+        analyzer's backend (see HonorHero).
         
-        if not pitch_values:
+        Args:
+            frame: FeatureFrame of the block
+            
+        Returns:
+            Dictionary with pitch analysis results (as analyze())
+        """
+        return self._score_pitch(frame.pitch, frame.pitch_confidence)
+    
+    def _score_pitch(self, avg_pitch: float, confidence: float) -> dict:
+        """Record and score one pitch estimate"""
+        if avg_pitch <= 0 or confidence < self.min_confidence:
             return {
                 'detected': False,
                 'frequency': 0,
                 'note': None,
+                'midi': None,
                 'deviation': 0,
+                'confidence': confidence,
                 'score': 50  # Neutral score when no pitch detected
             }
         
-        # Calculate average pitch
-        avg_pitch = np.mean(pitch_values)
-        
-        # Convert to note
-        note_number = librosa.hz_to_midi(avg_pitch)
+        # Convert to note (the name is a table lookup, see note_utils)
+        note_number = hz_to_midi(avg_pitch)
         closest_note = round(note_number)
-        note_name = librosa.midi_to_note(closest_note)
         
         # Calculate deviation in cents
         deviation = 100 * (note_number - closest_note)
@@ -66,43 +86,48 @@ class PitchAnalyzer:
         # Store in history
         self.pitch_history.append({
             'frequency': avg_pitch,
+            'midi': closest_note,
             'deviation': deviation
         })
         
-        # Calculate score (0-100) based on deviation
-        # Within tolerance = 100, outside tolerance decreases score
-        if abs(deviation) <= self.tolerance:
-            score = 100
-        else:
-            # Score decreases as deviation increases beyond tolerance
-            excess = abs(deviation) - self.tolerance
-            score = max(0, 100 - (excess * 2))  # 2 points per cent deviation
+        score = self._score_deviation(deviation)
+        self.score_stats.add(score)
         
         return {
             'detected': True,
             'frequency': avg_pitch,
-            'note': note_name,
+            'note': midi_to_note(closest_note),
+            'midi': closest_note,
             'deviation': deviation,
+            'confidence': confidence,
             'score': score
         }
     
+    def _score_deviation(self, deviation: float) -> float:
+        """
+        Calculate score (0-100) based on deviation
+        
+        Within tolerance = 100, outside tolerance decreases score
+        """
+        if abs(deviation) <= self.tolerance:
+            return 100
+        # Score decreases as deviation increases beyond tolerance
+        excess = abs(deviation) - self.tolerance
+        return max(0, 100 - (excess * 2))  # 2 points per cent deviation
+    
     def get_average_score(self) -> float:
-        """Get average pitch score from history"""
-        if not self.pitch_history:
+        """Get average pitch score over the whole session (constant time)"""
+        if self.score_stats.count == 0:
             return 50.0
-        
-        scores = []
-        for entry in self.pitch_history:
-            dev = abs(entry['deviation'])
-            if dev <= self.tolerance:
-                score = 100
-            else:
-                excess = dev - self.tolerance
-                score = max(0, 100 - (excess * 2))
-            scores.append(score)
-        
-        return np.mean(scores)
+        return self.score_stats.mean
+    
+    def get_recent_score(self) -> float:
+        """Get decayed average pitch score (whole-session mean if decay is off)"""
+        if self.score_stats.count == 0:
+            return 50.0
+        return self.score_stats.recent_mean
     
     def reset(self):
         """Reset pitch history"""
-        self.pitch_history = []
+        self.pitch_history.clear()
+        self.score_stats.reset()
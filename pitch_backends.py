@@ -0,0 +1,197 @@
+"""
+Pitch Backends Module
+Pluggable pitch estimators used by PitchAnalyzer
+"""
+
+import numpy as np
+from typing import Dict, Tuple, Type, Union
+import config
+from yin_pitch import YinPitchDetector
+
+HARMONIC_HALF_WIDTH = 2  # Bins on each side of a harmonic (Hann main lobe)
+
+
+def harmonic_energy_ratio(spectrum: np.ndarray, pitches: np.ndarray, sample_rate: int,
+                          harmonics: int = config.PITCH_HARMONICS) -> np.ndarray:
+    """
+    Share of the spectral energy carried by the harmonics of a pitch
+    
+    Close to 1 for a clean tone at the estimated pitch and a few percent
+    for noise, at any level, so it works as a confidence for peak pickers.
+    
+    Args:
+        spectrum: (bins,) or (bins, frames) magnitude spectrum
+        pitches: Pitch of each frame in Hz (0 = none)
+        sample_rate: Sample rate in Hz
+        harmonics: Number of harmonics counted, fundamental included
+    
+    Returns:
+        (frames,) ratios in the range 0-1 (0 for silent or unvoiced frames)
+    """
+    power = np.square(spectrum.reshape(len(spectrum), -1))
+    bins, frames = power.shape
+    pitches = np.asarray(pitches, dtype=np.float64).reshape(-1)
+    
+    # Bins within the main lobe of every harmonic, below Nyquist
+    bin_width = sample_rate / (2 * (bins - 1))
+    centres = np.rint(np.outer(np.arange(1, harmonics + 1), pitches) / bin_width).astype(int)
+    lobe = centres[..., np.newaxis] + np.arange(-HARMONIC_HALF_WIDTH, HARMONIC_HALF_WIDTH + 1)
+    columns = np.broadcast_to(np.arange(frames)[:, np.newaxis], lobe.shape)
+    valid = (lobe >= 0) & (lobe < bins) & (pitches > 0)[:, np.newaxis]
+    mask = np.zeros((bins, frames), dtype=bool)
+    mask[lobe[valid], columns[valid]] = True  # Overlapping lobes count once
+    
+    total = power.sum(axis=0)
+    harmonic = np.where(mask, power, 0.0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, np.minimum(harmonic / total, 1.0), 0.0)
+
+
+class PitchBackend:
+    """
+    Interface for pitch estimators
+    
+    A backend turns one audio block into a single fundamental frequency
+    estimate plus a confidence value. Subclasses implement estimate().
+    """
+    
+    name = 'base'
+    
+    def estimate(self, audio_chunk: np.ndarray, sample_rate: int) -> Tuple[float, float]:
+        """
+        Estimate the pitch of an audio block
+        
+        Args:
+            audio_chunk: 1-D audio data
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            (frequency, confidence): frequency in Hz (0 when no pitch was
+            found) and confidence in the range 0-1
+        """
+        raise NotImplementedError
+    
+    def estimate_frame(self, frame) -> Tuple[float, float]:
+        """
+        Estimate the pitch of a block from its FeatureFrame
+        
+        Backends that can work from the shared spectrum override this to
+        skip their own transform; the default runs estimate() on the audio.
+        """
+        return self.estimate(frame.audio, frame.sample_rate)
+
+
+class PiptrackBackend(PitchBackend):
+    """
+    librosa.piptrack estimator (vectorized peak picking)
+    
+    Takes the strongest bin of every STFT frame with a single argmax and
+    averages the voiced frames. Piptrack finds a peak in every frame of
+    noise too, so confidence is the share of each frame's energy in the
+    harmonics of its pitch (see harmonic_energy_ratio), averaged over all
+    frames with unvoiced frames counting 0.
+    """
+    
+    name = 'piptrack'
+    
+    def __init__(self, fmin: float = config.PITCH_FMIN, fmax: float = config.PITCH_FMAX):
+        self.fmin = fmin
+        self.fmax = fmax
+    
+    def estimate(self, audio_chunk: np.ndarray, sample_rate: int) -> Tuple[float, float]:
+        # librosa is heavy to import, so only load it when this backend runs
+        import librosa
+        
+        # The same STFT piptrack would compute, kept for the confidence
+        spectrum = np.abs(librosa.stft(audio_chunk))
+        pitches, magnitudes = librosa.piptrack(
+            S=spectrum,
+            sr=sample_rate,
+            fmin=self.fmin,
+            fmax=self.fmax
+        )
+        
+        # Most prominent pitch of every frame in one pass
+        best_bins = magnitudes.argmax(axis=0)
+        frame_pitches = pitches[best_bins, np.arange(pitches.shape[1])]
+        voiced = frame_pitches > 0
+        
+        if not voiced.any():
+            return 0.0, 0.0
+        
+        confidence = harmonic_energy_ratio(spectrum, frame_pitches, sample_rate).mean()
+        return float(frame_pitches[voiced].mean()), float(confidence)
+    
+    def estimate_frame(self, frame) -> Tuple[float, float]:
+        """
+        Peak-pick the frame's spectrum instead of running another STFT
+        
+        The whole block is one analysis frame; confidence is the share of
+        its energy in the harmonics of the pitch found.
+        """
+        import librosa
+        
+        pitches, magnitudes = librosa.piptrack(
+            S=frame.spectrum[:, np.newaxis],
+            sr=frame.sample_rate,
+            n_fft=2 * (len(frame.spectrum) - 1),
+            fmin=self.fmin,
+            fmax=self.fmax
+        )
+        pitch = float(pitches[magnitudes[:, 0].argmax(), 0])
+        if pitch <= 0:
+            return 0.0, 0.0
+        return pitch, float(harmonic_energy_ratio(frame.spectrum, pitch, frame.sample_rate)[0])
+
+
+class YinBackend(PitchBackend):
+    """
+    YIN estimator for the low-latency real-time path
+    
+    Time-domain, NumPy only; confidence comes from the CMNDF dip depth.
+    """
+    
+    name = 'yin'
+    
+    def __init__(self, fmin: float = config.PITCH_FMIN, fmax: float = config.PITCH_FMAX,
+                 threshold: float = config.YIN_THRESHOLD):
+        self.detector = YinPitchDetector(fmin, fmax, threshold)
+    
+    def estimate(self, audio_chunk: np.ndarray, sample_rate: int) -> Tuple[float, float]:
+        return self.detector.estimate(audio_chunk, sample_rate)
+
+
+# Registry of available backends by name
+PITCH_BACKENDS: Dict[str, Type[PitchBackend]] = {
+    'piptrack': PiptrackBackend,
+    'yin': YinBackend,
+}
+
+
+def register_pitch_backend(name: str, backend_class: Type[PitchBackend]):
+    """
+    Register a pitch backend so it can be selected by name
+    
+    Args:
+        name: Name used in config.PITCH_BACKEND / PitchAnalyzer(backend=...)
+        backend_class: PitchBackend subclass
+    """
+    PITCH_BACKENDS[name] = backend_class
+
+
+def get_pitch_backend(backend: Union[str, PitchBackend] = None) -> PitchBackend:
+    """
+    Get a pitch backend instance
+    
+    Args:
+        backend: Backend name, an existing PitchBackend instance, or None
+                 for config.PITCH_BACKEND
+    """
+    if isinstance(backend, PitchBackend):
+        return backend
+    
+    name = backend or config.PITCH_BACKEND
+    if name not in PITCH_BACKENDS:
+        available = ', '.join(sorted(PITCH_BACKENDS))
+        raise ValueError(f"Unknown pitch backend '{name}' (available: {available})")
+    return PITCH_BACKENDS[name]()
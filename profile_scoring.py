@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Profile Scoring Module
+Scores cached performance features under every profile at once
+
+The analyzers score with one profile's tolerances while the audio plays.
+Here the same scoring rules are applied to PerformanceFeatures as array
+operations with one row per profile, so a recording gets its Honor Score
+under all profiles without running any DSP again. Every metrics tick of
+the live schedule is replayed too, because consistency is computed from
+the component scores at those ticks.
+"""
+
+import time
+import numpy as np
+from typing import Dict, List, Optional
+import config
+from feature_cache import PerformanceFeatures
+from scoring_system import ScoringSystem, TIER_NAMES
+
+# Components in the order of the score columns
+COMPONENTS = ['pitch', 'timing', 'rhythm', 'dynamics', 'consistency']
+
+
+def profile_tolerances(profiles: List[str]) -> Dict[str, np.ndarray]:
+    """Tolerance settings of several profiles as (profiles, 1) columns"""
+    names = ['PITCH_TOLERANCE', 'TIMING_TOLERANCE', 'RHYTHM_TOLERANCE',
+             'DYNAMICS_TOLERANCE', 'CONSISTENCY_THRESHOLD']
+    return {
+        name: np.array([[float(config.PROFILES[profile][name])] for profile in profiles])
+        for name in names
+    }
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+    """Cumulative sums along the last axis with a leading zero"""
+    sums = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.float64)
+    np.cumsum(values, axis=-1, out=sums[..., 1:])
+    return sums
+
+
+def score_pitch(deviations: np.ndarray, counts: np.ndarray, tolerance: np.ndarray) -> np.ndarray:
+    """
+    Average pitch score after the first `counts` detected blocks
+    
+    Args:
+        deviations: Cents from the nearest note per detected block
+        counts: Prefix lengths to evaluate
+        tolerance: (profiles, 1) pitch tolerances in cents
+    
+    Returns:
+        (profiles, len(counts)) scores, as PitchAnalyzer.get_average_score
+    """
+    excess = np.abs(deviations) - tolerance
+    scores = np.where(excess <= 0, 100.0, np.maximum(0.0, 100.0 - excess * 2))
+    sums = _prefix_sums(scores)[:, counts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, 50.0)
+
+
+def interval_moments(onset_times: np.ndarray, counts: np.ndarray,
+                     window: Optional[int] = config.RHYTHM_WINDOW) -> tuple:
+    """
+    Interval statistics after the first `counts` onsets
+    
+    Returns:
+        (intervals counted, mean, population std), one entry per count,
+        matching TimingAnalyzer.interval_stats
+    """
+    intervals = np.diff(onset_times)
+    # Sums of squares around a reference value keep the variance accurate
+    reference = float(intervals.mean()) if len(intervals) else 0.0
+    shifted = intervals - reference
+    sums = _prefix_sums(shifted)
+    squares = _prefix_sums(shifted * shifted)
+    
+    available = np.maximum(counts - 1, 0)
+    counted = available if window is None else np.minimum(available, window)
+    first = available - counted
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (sums[available] - sums[first]) / counted
+        variance = (squares[available] - squares[first]) / counted - mean * mean
+    mean = np.where(counted > 0, mean + reference, 0.0)
+    std = np.where(counted > 1, np.sqrt(np.maximum(variance, 0.0)), 0.0)
+    return counted, mean, std
+
+
+def score_timing(onset_counts: np.ndarray, counted: np.ndarray, std: np.ndarray,
+                 tolerance: np.ndarray) -> np.ndarray:
+    """Timing scores (profiles, ticks), as TimingAnalyzer.analyze_timing"""
+    excess = std - tolerance
+    scores = np.where(excess <= 0, 100.0, np.maximum(0.0, 100.0 - excess * 100))
+    return np.where(onset_counts < 2, 50.0, scores)
+
+
+def score_rhythm(counted: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 tolerance: np.ndarray) -> np.ndarray:
+    """Rhythm scores (profiles, ticks), as TimingAnalyzer.analyze_rhythm"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cv = np.where(mean > 0, std / mean, 0.0)
+    excess = cv - tolerance
+    scores = np.where(excess <= 0, 100.0, np.maximum(0.0, 100.0 - excess * 150))
+    return np.where(counted < 2, 50.0, scores)
+
+
+def level_ranges(levels_db: np.ndarray, counts: np.ndarray,
+                 window_seconds: Optional[float] = config.DYNAMICS_WINDOW) -> np.ndarray:
+    """
+    Dynamic range after the first `counts` blocks
+    
+    Whole-session range, or the range of the last window_seconds of blocks
+    as DynamicsAnalyzer computes it.
+    """
+    if len(levels_db) == 0:
+        return np.zeros(len(counts))
+    if window_seconds is None:
+        highest = np.maximum.accumulate(levels_db)
+        lowest = np.minimum.accumulate(levels_db)
+    else:
+        block_duration = config.BUFFER_SIZE / config.SAMPLE_RATE
+        window = max(2, int(round(window_seconds / block_duration)))
+        padded = np.concatenate((np.full(window - 1, np.nan), levels_db))
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        highest = np.nanmax(windows, axis=1)
+        lowest = np.nanmin(windows, axis=1)
+    last = np.maximum(counts - 1, 0)
+    return np.where(counts > 0, highest[last] - lowest[last], 0.0)
+
+
+def score_dynamics(level_counts: np.ndarray, ranges: np.ndarray,
+                   tolerance: np.ndarray) -> np.ndarray:
+    """Dynamics scores (profiles, ticks), as DynamicsAnalyzer.get_average_score"""
+    too_much = np.maximum(0.0, 100.0 - (ranges - tolerance) * 2)
+    scores = np.where(ranges < 5, 60.0 + ranges * 8, np.where(ranges <= tolerance, 100.0, too_much))
+    return np.where(level_counts < 2, 70.0, scores)
+
+
+def score_consistency(metrics: np.ndarray, threshold: np.ndarray,
+                      window: Optional[int] = config.CONSISTENCY_WINDOW,
+                      decay: Optional[float] = config.CONSISTENCY_DECAY) -> np.ndarray:
+    """
+    Final consistency score from the component scores at every tick
+    
+    Args:
+        metrics: (4, profiles, ticks) pitch, timing, rhythm and dynamics scores
+        threshold: (profiles, 1) consistency thresholds
+        window: Only the last `window` ticks count (None = all)
+        decay: Weight of the newest tick, fading older ones (None = off)
+    
+    Returns:
+        (profiles,) scores, as ConsistencyAnalyzer.analyze after the last tick
+    """
+    ticks = metrics.shape[-1]
+    if ticks == 0:
+        return np.full(threshold.shape[0], 70.0)
+    
+    if decay is not None:
+        # Exponentially weighted moments, as RunningMoments with decay
+        counted = ticks
+        weights = decay * (1 - decay) ** np.arange(ticks - 1, -1, -1)
+        weights[0] = (1 - decay) ** (ticks - 1)
+        mean = metrics @ weights
+        variance = ((metrics - mean[..., np.newaxis]) ** 2) @ weights
+    else:
+        counted = ticks if window is None else min(ticks, window)
+        recent = metrics[..., ticks - counted:]
+        mean = recent.mean(axis=-1)
+        variance = recent.var(axis=-1)
+    
+    if counted < 2:
+        consistency = np.ones(mean.shape)
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cv = np.sqrt(variance) / mean
+        consistency = np.where(mean > 0, np.maximum(0.0, 1 - cv), 0.5)
+    
+    overall = consistency.mean(axis=0)
+    threshold = threshold[:, 0]
+    return np.where(overall >= threshold, 100.0, overall / threshold * 100)
+
+
+def component_scores(features: PerformanceFeatures, profiles: List[str]) -> np.ndarray:
+    """
+    Final component scores of a recording under several profiles
+    
+    Returns:
+        (profiles, 5) array with columns in COMPONENTS order
+    """
+    tolerances = profile_tolerances(profiles)
+    # Every metrics tick, then the end of the recording
+    final = np.array([[len(features.pitch_deviations), len(features.onset_times),
+                       len(features.levels_db)]])
+    points = np.concatenate((features.update_counts.reshape(-1, 3), final))
+    pitch_counts, onset_counts, level_counts = points.T
+    
+    counted, mean, std = interval_moments(features.onset_times, onset_counts)
+    ranges = level_ranges(features.levels_db, level_counts)
+    metrics = np.stack([
+        score_pitch(features.pitch_deviations, pitch_counts, tolerances['PITCH_TOLERANCE']),
+        score_timing(onset_counts, counted, std, tolerances['TIMING_TOLERANCE']),
+        score_rhythm(counted, mean, std, tolerances['RHYTHM_TOLERANCE']),
+        score_dynamics(level_counts, ranges, tolerances['DYNAMICS_TOLERANCE'])
+    ])
+    
+    consistency = score_consistency(metrics[..., :-1], tolerances['CONSISTENCY_THRESHOLD'])
+    return np.column_stack((metrics[..., -1].T, consistency))
+
+
+def score_profiles(features: PerformanceFeatures, profiles: Optional[List[str]] = None,
+                   weights: Optional[dict] = None) -> Dict[str, Dict]:
+    """
+    Honor Score of a recording under several profiles
+    
+    Args:
+        features: PerformanceFeatures of the recording
+        profiles: Names in config.PROFILES (default: all)
+        weights: Component weights (default: config.WEIGHTS)
+    
+    Returns:
+        Dictionary of profile name -> {'final_honor_score', 'tier',
+        'components'}, the same values OfflineScorer gives with that profile
+    """
+    profiles = list(config.PROFILES) if profiles is None else list(profiles)
+    scoring = ScoringSystem(weights)
+    scores = component_scores(features, profiles)
+    columns = [COMPONENTS.index(name) for name in scoring.components]
+    honor = scoring.calculate_honor_scores(scores[:, columns])
+    
+    results = {}
+    for row, profile in enumerate(profiles):
+        results[profile] = {
+            'final_honor_score': float(honor['scores'][row]),
+            'tier': TIER_NAMES[honor['tiers'][row]],
+            'components': {name: float(scores[row, column]) for column, name in enumerate(COMPONENTS)}
+        }
+    return results
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+    from feature_cache import FeatureCache
+    
+    parser = argparse.ArgumentParser(
+        description='HonorHero profile scoring - score recordings under every profile'
+    )
+    parser.add_argument('files', nargs='+', help='Audio files (WAV, FLAC, ...)')
+    parser.add_argument(
+        '--pitch-backend',
+        type=str,
+        default=None,
+        help='Pitch backend: piptrack | yin (default: config.PITCH_BACKEND)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=None,
+        help='Feature cache directory (default: ~/.honorhero/features)'
+    )
+    args = parser.parse_args()
+    
+    cache = FeatureCache(args.cache_dir, pitch_backend=args.pitch_backend)
+    for path in args.files:
+        started = time.perf_counter()
+        features = cache.get(path)
+        extracted = time.perf_counter()
+        results = score_profiles(features)
+        scored = time.perf_counter()
+        
+        print(f"Archivo: {path} ({features.duration:.1f}s)")
+        for profile, result in results.items():
+            print(f"  {profile:<13} {result['final_honor_score']:5.1f} ({result['tier']})")
+        print(f"  Características: {(extracted - started) * 1000:.1f} ms, "
+              f"puntuación: {(scored - extracted) * 1000:.2f} ms")
+    
+    stats = cache.get_stats()
+    print(f"Caché: {stats['hits']} aciertos, {stats['misses']} extracciones")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Render Loop Module
+Latest-value mailbox and a dedicated UI render thread
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+import config
+from metrics_scheduler import MetricsScheduler
+from streaming_stats import RunningMean, RunningExtrema
+
+
+class LatestValueMailbox:
+    """
+    Single-slot mailbox holding only the newest published value
+    
+    The publisher never blocks and never queues: a new value replaces one
+    the consumer has not taken yet, so a slow UI sees the latest state
+    instead of working through a backlog.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._value = None
+        self.version = 0        # Number of values published
+        self._taken_version = 0
+        self.overwritten = 0    # Values replaced before anyone took them
+    
+    def publish(self, value: Any):
+        """Store a value, replacing any value not yet taken"""
+        with self._condition:
+            if self.version > self._taken_version:
+                self.overwritten += 1
+            self._value = value
+            self.version += 1
+            self._condition.notify_all()
+    
+    def take(self, timeout: Optional[float] = 0.0) -> Tuple[Any, bool]:
+        """
+        Get the latest value
+        
+        Args:
+            timeout: Seconds to wait for a value newer than the last one
+                     taken (0 = do not wait, None = wait indefinitely)
+        
+        Returns:
+            (value, fresh) where fresh is False if the value was already taken
+            (value is None if nothing was ever published)
+        """
+        with self._condition:
+            if self.version == self._taken_version and timeout != 0:
+                self._condition.wait_for(lambda: self.version > self._taken_version, timeout)
+            fresh = self.version > self._taken_version
+            self._taken_version = self.version
+            return self._value, fresh
+    
+    def clear(self):
+        """Drop the stored value and reset counters"""
+        with self._condition:
+            self._value = None
+            self.version = 0
+            self._taken_version = 0
+            self.overwritten = 0
+
+
+class RenderThread:
+    """
+    Draws the latest mailbox value on its own thread at a target frame rate
+    
+    Frames sit on a fixed grid (see MetricsScheduler); a frame that takes
+    longer than the frame period causes the missed frames to be dropped
+    rather than rendered late in a burst.
+    """
+    
+    def __init__(self, render: Callable[[Any, bool], None],
+                 mailbox: LatestValueMailbox,
+                 fps: float = config.UI_TARGET_FPS,
+                 redraw_idle: bool = True):
+        """
+        Args:
+            render: Called as render(value, fresh) once per frame
+            mailbox: Source of values to draw
+            fps: Target frames per second
+            redraw_idle: Also draw frames when no new value arrived
+                         (for displays that animate with time)
+        """
+        self.render = render
+        self.mailbox = mailbox
+        self.redraw_idle = redraw_idle
+        self.scheduler = MetricsScheduler(fps, callback=self._frame, name='HonorHeroRender')
+        
+        self.render_times = RunningMean()
+        self.render_extrema = RunningExtrema()
+        self.frames = 0
+        self.idle_frames = 0
+        self.errors = 0
+    
+    def start(self):
+        """Start rendering"""
+        self.scheduler.start()
+    
+    def stop(self):
+        """Stop rendering and wait for the current frame to finish"""
+        self.scheduler.stop()
+        if self.errors > 1:
+            print(f"Warning: {self.errors - 1} more render failures after the first")
+    
+    def _frame(self):
+        """Scheduler tick: draw one frame"""
+        value, fresh = self.mailbox.take()
+        if value is None or not (fresh or self.redraw_idle):
+            self.idle_frames += 1
+            return
+        
+        start = time.perf_counter()
+        try:
+            self.render(value, fresh)
+        except Exception as e:
+            # Only the first failure is printed: a frame that keeps failing
+            # would otherwise flood the terminal it draws to (see stop())
+            self.errors += 1
+            if self.errors == 1:
+                print(f"Warning: Render failed ({e})")
+            return
+        elapsed = time.perf_counter() - start
+        
+        self.render_times.add(elapsed)
+        self.render_extrema.add(elapsed)
+        self.frames += 1
+    
+    def get_stats(self) -> dict:
+        """Get frame and timing statistics"""
+        return {
+            'target_fps': self.scheduler.rate,
+            'frames': self.frames,
+            'idle_frames': self.idle_frames,
+            'dropped_frames': self.scheduler.coalesced,
+            'skipped_snapshots': self.mailbox.overwritten,
+            'render_errors': self.errors,
+            'avg_render_ms': (self.render_times.mean or 0.0) * 1000,
+            'max_render_ms': (self.render_extrema.maximum or 0.0) * 1000
+        }
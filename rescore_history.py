@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+History Re-scoring Module
+Recomputes the Honor Score and tier of every stored session
+
+Sessions keep their component scores, but honor_score and tier were fixed
+with the WEIGHTS in force when they were played. After the weights change,
+this job scores the whole history again in one vectorized pass
+(ScoringSystem.calculate_honor_scores). It writes the history back
+atomically through the storage backend and rebuilds the aggregates.
+
+A session whose score or tier changes keeps the replaced values in
+'previous_scores' ({'version', 'honor_score', 'tier', 'replaced_at'}) and
+its 'score_version' goes up by one. A stored tier that no longer matches
+its score (e.g. from older tier boundaries) counts as a change. Other
+sessions are left as they are, so running the job twice with the same
+weights does nothing the second time.
+"""
+
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import config
+from scoring_system import ScoringSystem, TIER_NAMES
+from session_history import SessionHistory
+
+# Score differences below this are rounding, not a change
+SCORE_EPSILON = 1e-9
+
+
+def component_matrix(sessions: List[Dict], components: List[str]) -> np.ndarray:
+    """
+    Stored component scores as an (N, components) array
+    
+    Components a session does not have count as 0, as in
+    ScoringSystem.calculate_honor_score.
+    """
+    matrix = np.zeros((len(sessions), len(components)), dtype=np.float64)
+    for row, session in enumerate(sessions):
+        stored = session.get('components') or {}
+        matrix[row] = [stored.get(name, 0.0) for name in components]
+    return matrix
+
+
+def rescore_sessions(sessions: List[Dict], weights: Optional[dict] = None,
+                     replaced_at: Optional[str] = None) -> Dict:
+    """
+    Re-score sessions in place
+    
+    Args:
+        sessions: Stored session dictionaries
+        weights: Component weights (default: config.WEIGHTS)
+        replaced_at: Timestamp recorded with replaced scores (default: now)
+    
+    Returns:
+        Dictionary with 'changed' and 'tier_changes' counts, the time to
+        collect the component matrix ('gather_time') and the time of the
+        vectorized pass ('score_time'), in seconds
+    """
+    scoring = ScoringSystem(weights)
+    replaced_at = replaced_at or datetime.now().isoformat()
+    
+    started = time.perf_counter()
+    matrix = component_matrix(sessions, scoring.components)
+    gathered = time.perf_counter()
+    result = scoring.calculate_honor_scores(matrix)
+    score_time = time.perf_counter() - gathered
+    
+    old_scores = np.array([session.get('honor_score', 0) for session in sessions], dtype=np.float64)
+    tiers = [TIER_NAMES[index] for index in result['tiers']]
+    # A tier stored under older tier rules is stale even if the score is not
+    stale_tiers = np.array([tier != session.get('tier') for tier, session in zip(tiers, sessions)], dtype=bool)
+    changed = np.flatnonzero((np.abs(result['scores'] - old_scores) > SCORE_EPSILON) | stale_tiers)
+    tier_changes = 0
+    for row in changed:
+        session = sessions[row]
+        tier = tiers[row]
+        version = session.get('score_version', 0)
+        session.setdefault('previous_scores', []).append({
+            'version': version,
+            'honor_score': session.get('honor_score'),
+            'tier': session.get('tier'),
+            'replaced_at': replaced_at
+        })
+        tier_changes += tier != session.get('tier')
+        session['honor_score'] = float(result['scores'][row])
+        session['tier'] = tier
+        session['score_version'] = version + 1
+    
+    return {
+        'changed': len(changed),
+        'tier_changes': tier_changes,
+        'gather_time': gathered - started,
+        'score_time': score_time
+    }
+
+
+def rescore_history(history: SessionHistory, weights: Optional[dict] = None,
+                    dry_run: bool = False) -> Dict:
+    """
+    Re-score a whole session history and write it back
+    
+    Args:
+        history: SessionHistory to re-score
+        weights: Component weights (default: config.WEIGHTS)
+        dry_run: Compute and report, but leave the storage untouched
+    
+    Returns:
+        Dictionary with session counts, per-phase times in seconds and
+        'sessions_per_second' over the whole job
+    """
+    started = time.perf_counter()
+    sessions = history.storage.load_all()
+    loaded = time.perf_counter()
+    
+    stats = rescore_sessions(sessions, weights)
+    scored = time.perf_counter()
+    
+    if not dry_run and stats['changed']:
+        history.replace_sessions(sessions)
+    finished = time.perf_counter()
+    
+    total_time = finished - started
+    stats.update({
+        'sessions': len(sessions),
+        'written': not dry_run and stats['changed'] > 0,
+        'load_time': loaded - started,
+        'update_time': scored - loaded,
+        'write_time': finished - scored,
+        'total_time': total_time,
+        'sessions_per_second': len(sessions) / total_time if total_time > 0 else 0.0
+    })
+    return stats
+
+
+def make_sessions(count: int, seed: int = 0) -> List[Dict]:
+    """Synthetic stored sessions with random components (for benchmarks)"""
+    rng = np.random.default_rng(seed)
+    scoring = ScoringSystem()
+    matrix = rng.uniform(20, 100, (count, len(scoring.components)))
+    # Score them with different weights, as if config.WEIGHTS had changed since
+    old_weights = rng.dirichlet(np.ones(len(scoring.components)))
+    result = scoring.calculate_honor_scores(matrix, old_weights)
+    
+    start = datetime(2020, 1, 1, 18, 0)
+    sessions = []
+    for row in range(count):
+        played = start + timedelta(hours=6 * row)
+        sessions.append({
+            'timestamp': played.isoformat(),
+            'date': played.strftime('%Y-%m-%d'),
+            'time': played.strftime('%H:%M:%S'),
+            'honor_score': float(result['scores'][row]),
+            'tier': TIER_NAMES[result['tiers'][row]],
+            'components': dict(zip(scoring.components, matrix[row].tolist())),
+            'duration': 300,
+            'notes': ''
+        })
+    return sessions
+
+
+def print_report(stats: Dict):
+    """Print a re-scoring report"""
+    print(f"Sesiones:        {stats['sessions']}")
+    print(f"Re-puntuadas:    {stats['changed']} ({stats['tier_changes']} cambian de nivel)")
+    print(f"Lectura:         {stats['load_time']:.2f}s")
+    print(f"Matriz N×5:      {stats['gather_time'] * 1000:.1f} ms")
+    print(f"Puntuación:      {stats['score_time'] * 1000:.1f} ms (vectorizada)")
+    print(f"Actualización:   {stats['update_time']:.2f}s")
+    print(f"Escritura:       {stats['write_time']:.2f}s" + ('' if stats['written'] else ' (sin cambios)'))
+    print(f"Rendimiento:     {stats['sessions_per_second']:,.0f} sesiones/s")
+
+
+def main():
+    """Command-line entry point"""
+    import argparse
+    import json
+    import os
+    import tempfile
+    
+    parser = argparse.ArgumentParser(
+        description='HonorHero history re-scoring - recompute Honor Scores with the current weights'
+    )
+    parser.add_argument('history', nargs='?', default=None,
+                        help='Session history file (default: ~/.honorhero/sessions.jsonl)')
+    parser.add_argument('--weights', type=str, default=None,
+                        help='Weights as JSON, e.g. \'{"pitch": 0.3, ...}\' (default: config.WEIGHTS)')
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing')
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help='Re-score N synthetic sessions in a temporary history instead')
+    parser.add_argument('--backend', type=str, default=None,
+                        help='Storage backend: jsonl | sqlite | json (default: from the file suffix)')
+    args = parser.parse_args()
+    
+    weights = json.loads(args.weights) if args.weights else None
+    
+    if args.benchmark is not None:
+        backend = args.backend or config.SESSION_BACKEND
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sessions' + {'jsonl': '.jsonl', 'sqlite': '.db', 'json': '.json'}[backend])
+            SessionHistory(path, backend).replace_sessions(make_sessions(args.benchmark))
+            print(f"Historial sintético ({backend}): {args.benchmark} sesiones")
+            print_report(rescore_history(SessionHistory(path, backend), weights))
+        return
+    
+    history = SessionHistory(args.history, args.backend)
+    print_report(rescore_history(history, weights, dry_run=args.dry_run))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Sample Clock Module
+Block timestamps derived from the audio sample count
+"""
+
+from typing import Optional
+import config
+from streaming_stats import RunningExtrema
+
+
+class SampleClock:
+    """
+    Performance clock driven by the number of samples captured
+    
+    A block's timestamp is the position of its first sample divided by the
+    sample rate, so it does not depend on when the block happens to be
+    processed. The wall clock and, when the audio driver reports it, the
+    ADC capture time of each block are tracked alongside for comparison:
+    their drift is how far they moved relative to the sample clock since
+    the first block (a constant latency does not count as drift).
+    """
+    
+    def __init__(self, sample_rate: int = config.SAMPLE_RATE):
+        self.reset(sample_rate)
+    
+    def reset(self, sample_rate: Optional[int] = None):
+        """Start again at sample zero"""
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        self.position = 0           # Sample index after the last block
+        self.blocks = 0
+        self.sample_time = 0.0      # Timestamp of the last block
+        self.wall_origin = None     # Wall minus sample time at the first block
+        self.adc_origin = None      # ADC minus sample time at the first ADC reading
+        self.wall_drift = 0.0
+        self.adc_drift = None
+        self.wall_extrema = RunningExtrema()
+        self.adc_extrema = RunningExtrema()
+    
+    def block_time(self, frames: int, position: Optional[int] = None,
+                   adc_time: Optional[float] = None,
+                   wall_time: Optional[float] = None) -> float:
+        """
+        Timestamp the next block
+        
+        Args:
+            frames: Samples in the block
+            position: Sample index of the block's first sample as counted by
+                      the capture (default: right after the previous block)
+            adc_time: Driver time the block's first sample was captured
+            wall_time: Wall-clock time the block is being processed
+        
+        Returns:
+            Block timestamp in seconds on the sample clock
+        """
+        if position is None:
+            position = self.position
+        self.position = position + frames
+        self.blocks += 1
+        self.sample_time = position / self.sample_rate
+        
+        if wall_time is not None:
+            if self.wall_origin is None:
+                self.wall_origin = wall_time - self.sample_time
+            self.wall_drift = wall_time - self.sample_time - self.wall_origin
+            self.wall_extrema.add(self.wall_drift)
+        
+        if adc_time is not None:
+            if self.adc_origin is None:
+                self.adc_origin = adc_time - self.sample_time
+            self.adc_drift = adc_time - self.sample_time - self.adc_origin
+            self.adc_extrema.add(self.adc_drift)
+        
+        return self.sample_time
+    
+    def get_stats(self) -> dict:
+        """
+        Get both clocks and their drift
+        
+        Returns:
+            Dictionary with the sample-clock time of the last block, the
+            wall and ADC times on the same origin, and current and largest
+            drift in milliseconds (ADC values are None without driver times)
+        """
+        adc_available = self.adc_drift is not None
+        return {
+            'blocks': self.blocks,
+            'sample_time': self.sample_time,
+            'wall_time': self.sample_time + self.wall_drift,
+            'adc_time': self.sample_time + self.adc_drift if adc_available else None,
+            'wall_drift_ms': self.wall_drift * 1000,
+            'adc_drift_ms': self.adc_drift * 1000 if adc_available else None,
+            'max_wall_drift_ms': _largest(self.wall_extrema) * 1000,
+            'max_adc_drift_ms': _largest(self.adc_extrema) * 1000 if adc_available else None
+        }
+
+
+def _largest(extrema: RunningExtrema) -> float:
+    """Largest absolute value seen by an extrema accumulator"""
+    if extrema.count == 0:
+        return 0.0
+    return max(abs(extrema.minimum), abs(extrema.maximum))
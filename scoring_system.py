@@ -3,16 +3,52 @@ Scoring System Module
 Calculates Honor Score and assigns qualitative tiers
 """
 
+import numpy as np
 import config
-from typing import Dict, Tuple
+from bisect import bisect_right
+from typing import Dict, Optional, Tuple, Union
+from streaming_stats import RunningMean
+from timeseries import TimeSeries
+
+# Tier names in config order; score_history stores the index
+TIER_NAMES = list(config.SCORE_TIERS)
+
+# A tier runs from its lower bound up to the next tier's lower bound, so
+# scores between the configured integer ranges (e.g. 79.5) still get one
+TIER_LOWER_BOUNDS = sorted(min_score for min_score, _ in config.SCORE_TIERS.values())
+_TIERS_BY_BOUND = np.array(
+    sorted(range(len(TIER_NAMES)), key=lambda index: config.SCORE_TIERS[TIER_NAMES[index]][0]),
+    dtype=np.int8
+)
+_BOUNDS = np.array(TIER_LOWER_BOUNDS, dtype=np.float64)
+
+
+def tier_index(score: float) -> int:
+    """Index in TIER_NAMES of the tier a score falls in"""
+    return int(_TIERS_BY_BOUND[max(0, bisect_right(TIER_LOWER_BOUNDS, score) - 1)])
+
+
+def tier_indices(scores: np.ndarray) -> np.ndarray:
+    """Vectorized tier_index for an array of scores"""
+    positions = np.searchsorted(_BOUNDS, scores, side='right') - 1
+    return _TIERS_BY_BOUND[np.maximum(positions, 0)]
 
 
 class ScoringSystem:
     """Calculates Honor Score (0-100) with qualitative tiers"""
     
-    def __init__(self, weights: dict = None):
+    def __init__(self, weights: dict = None,
+                 history_size: Optional[int] = config.METRICS_HISTORY_SIZE):
         self.weights = weights if weights else config.WEIGHTS
-        self.score_history = []
+        # Column order of calculate_honor_scores
+        self.components = list(self.weights)
+        self.weight_vector = np.array([self.weights[name] for name in self.components], dtype=np.float64)
+        # One record per evaluation: score, tier index and component scores
+        fields = [('score', np.float32), ('tier', np.int8)]
+        fields += [(component, np.float32) for component in self.weights]
+        self.score_history = TimeSeries(history_size, fields)
+        # Whole-session average, exact even when the history is bounded
+        self.score_stats = RunningMean()
         
     def calculate_honor_score(self, metrics: Dict[str, float]) -> Dict:
         """
@@ -42,11 +78,11 @@ class ScoringSystem:
         tier = self._get_tier(honor_score)
         
         # Store in history
-        self.score_history.append({
-            'score': honor_score,
-            'tier': tier,
-            'components': metrics.copy()
-        })
+        record = {component: metrics.get(component, 0) for component in self.weights}
+        record['score'] = honor_score
+        record['tier'] = TIER_NAMES.index(tier)
+        self.score_history.append(record)
+        self.score_stats.add(honor_score)
         
         return {
             'honor_score': honor_score,
@@ -55,12 +91,38 @@ class ScoringSystem:
             'message': self._get_message(tier)
         }
     
+    def calculate_honor_scores(self, matrix: np.ndarray,
+                               weights: Union[np.ndarray, None] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate Honor Scores for many sets of component scores at once
+        
+        Nothing is recorded in score_history: this is for batch re-scoring
+        and analytics, not for a running session.
+        
+        Args:
+            matrix: (N, components) scores, columns in self.components order
+            weights: (components,) weight vector or (K, components) matrix of
+                     weight sets (default: this system's weights)
+        
+        Returns:
+            Dictionary with 'scores' (clipped to 0-100) and 'tiers' (indices
+            into TIER_NAMES), shaped (N,) for one weight vector or (N, K)
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        weights = self.weight_vector if weights is None else np.asarray(weights, dtype=np.float64)
+        if matrix.shape[-1] != len(self.components) or weights.shape[-1] != len(self.components):
+            raise ValueError(f"Expected {len(self.components)} columns ({', '.join(self.components)})")
+        
+        scores = matrix @ weights.T
+        np.clip(scores, 0, 100, out=scores)
+        return {
+            'scores': scores,
+            'tiers': tier_indices(scores)
+        }
+    
     def _get_tier(self, score: float) -> str:
         """Get qualitative tier for score"""
-        for tier_name, (min_score, max_score) in config.SCORE_TIERS.items():
-            if min_score <= score <= max_score:
-                return tier_name
-        return 'Fragmentado'  # Default
+        return TIER_NAMES[tier_index(score)]
     
     def _get_message(self, tier: str) -> str:
         """Get encouraging message for tier"""
@@ -73,30 +135,29 @@ class ScoringSystem:
         return messages.get(tier, 'Sigue adelante.')
     
     def get_average_score(self) -> float:
-        """Get average Honor Score from history"""
-        if not self.score_history:
+        """Get average Honor Score over all evaluations"""
+        if self.score_stats.count == 0:
             return 0.0
-        
-        scores = [entry['score'] for entry in self.score_history]
-        return sum(scores) / len(scores)
+        return self.score_stats.mean
     
     def get_progress_summary(self) -> Dict:
         """Get summary of progress over time"""
-        if not self.score_history:
+        if not len(self.score_history):
             return {
                 'total_evaluations': 0,
                 'average_score': 0,
                 'trend': 'N/A'
             }
         
-        total = len(self.score_history)
+        total = self.score_stats.count
         avg_score = self.get_average_score()
         
-        # Calculate trend (comparing first half to second half)
-        if total >= 4:
-            mid = total // 2
-            first_half_avg = sum(e['score'] for e in self.score_history[:mid]) / mid
-            second_half_avg = sum(e['score'] for e in self.score_history[mid:]) / (total - mid)
+        # Calculate trend (comparing first half to second half of the kept history)
+        scores = self.score_history.column('score').astype(np.float64)
+        if len(scores) >= 4:
+            mid = len(scores) // 2
+            first_half_avg = float(scores[:mid].mean())
+            second_half_avg = float(scores[mid:].mean())
             
             if second_half_avg > first_half_avg + 5:
                 trend = 'Mejorando'
@@ -110,10 +171,11 @@ class ScoringSystem:
         return {
             'total_evaluations': total,
             'average_score': avg_score,
-            'current_tier': self.score_history[-1]['tier'] if total > 0 else 'N/A',
+            'current_tier': TIER_NAMES[self.score_history[-1]['tier']],
             'trend': trend
         }
     
     def reset(self):
         """Reset score history"""
-        self.score_history = []
+        self.score_history.clear()
+        self.score_stats.reset()
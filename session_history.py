@@ -3,55 +3,233 @@ Session History Module
 Tracks and persists practice sessions for progress tracking
 """
 
-import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pathlib import Path
+import config
+from session_storage import get_storage, migrate_sessions
+
+# Default file name per storage backend
+DEFAULT_FILENAMES = {
+    'json': 'sessions.json',
+    'jsonl': 'sessions.jsonl',
+    'sqlite': 'sessions.db',
+}
+
+
+class SessionAggregates:
+    """
+    Incrementally maintained session statistics
+    
+    Updated once per added session so get_statistics() never rescans the
+    history: counts, score sum/extrema, practice time, a tier histogram and
+    a per-day session index (for streaks).
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.total_score = 0.0
+        self.highest_score = None
+        self.lowest_score = None
+        self.total_time = 0.0
+        self.tier_counts = {}
+        self.day_counts = {}
+        self.last_date = None
+    
+    @classmethod
+    def from_sessions(cls, sessions: List[Dict]) -> 'SessionAggregates':
+        """Build aggregates from a full session list"""
+        aggregates = cls()
+        for session in sessions:
+            aggregates.add(session)
+        return aggregates
+    
+    def add(self, session: Dict):
+        """Fold one session into the aggregates"""
+        score = session['honor_score']
+        self.count += 1
+        self.total_score += score
+        if self.highest_score is None or score > self.highest_score:
+            self.highest_score = score
+        if self.lowest_score is None or score < self.lowest_score:
+            self.lowest_score = score
+        self.total_time += session.get('duration', 0)
+        
+        tier = session.get('tier')
+        self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+        
+        date = session.get('date')
+        if date:
+            self.day_counts[date] = self.day_counts.get(date, 0) + 1
+            if self.last_date is None or date > self.last_date:
+                self.last_date = date
+    
+    def current_streak(self, today=None) -> int:
+        """
+        Consecutive practice days ending today or yesterday
+        
+        Walks back from the most recent practice day, so the cost is the
+        length of the streak, not the size of the history.
+        """
+        if not self.last_date:
+            return 0
+        
+        today = today or datetime.now().date()
+        try:
+            day = datetime.strptime(self.last_date, '%Y-%m-%d').date()
+        except ValueError:
+            return 0
+        
+        if (today - day).days > 1:
+            return 0
+        
+        streak = 0
+        while day.strftime('%Y-%m-%d') in self.day_counts:
+            streak += 1
+            day -= timedelta(days=1)
+        return streak
+    
+    def most_common_tier(self) -> str:
+        """Most frequently achieved tier"""
+        if not self.tier_counts:
+            return 'N/A'
+        return max(self.tier_counts, key=self.tier_counts.get)
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for persistence"""
+        return {
+            'count': self.count,
+            'total_score': self.total_score,
+            'highest_score': self.highest_score,
+            'lowest_score': self.lowest_score,
+            'total_time': self.total_time,
+            'tier_counts': self.tier_counts,
+            'day_counts': self.day_counts,
+            'last_date': self.last_date
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SessionAggregates':
+        """Create aggregates from a persisted dictionary"""
+        aggregates = cls()
+        for key, value in data.items():
+            if hasattr(aggregates, key):
+                setattr(aggregates, key, value)
+        return aggregates
 
 
 class SessionHistory:
     """
     Manages practice session history and persistence
     
-    Sessions are stored locally as JSON for privacy and simplicity.
+    Sessions are stored locally for privacy and simplicity, through a
+    pluggable backend (see session_storage.py): append-only JSON lines by
+    default, SQLite, or the original JSON file.
     """
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, backend: str = None):
         """
         Initialize session history manager
         
         Args:
-            storage_path: Path to JSON storage file (default: ~/.honorhero/sessions.json)
+            storage_path: Path to storage file (default: ~/.honorhero/sessions.jsonl)
+            backend: 'json' | 'jsonl' | 'sqlite' (default: inferred from the
+                     file suffix, or config.SESSION_BACKEND for the default path)
         """
         if storage_path is None:
             home = Path.home()
             storage_dir = home / '.honorhero'
             storage_dir.mkdir(exist_ok=True)
-            storage_path = storage_dir / 'sessions.json'
+            backend = backend or config.SESSION_BACKEND
+            storage_path = storage_dir / DEFAULT_FILENAMES[backend]
+            
+            # One-shot migration from the original sessions.json
+            legacy_path = storage_dir / 'sessions.json'
+            if storage_path != legacy_path and legacy_path.exists() and not storage_path.exists():
+                migrate_sessions(legacy_path, storage_path, 'json', backend)
         
         self.storage_path = Path(storage_path)
-        self.sessions = self._load_sessions()
+        self.storage = get_storage(self.storage_path, backend)
+        self._sessions = None  # Loaded lazily, only when the full list is needed
+        self._aggregates = None
+        self._fingerprint = None  # Storage fingerprint the aggregates match
+    
+    @property
+    def sessions(self) -> List[Dict]:
+        """All sessions (loaded from storage on first access)"""
+        if self._sessions is None:
+            self._sessions = self._load_sessions()
+        return self._sessions
+    
+    @sessions.setter
+    def sessions(self, sessions: List[Dict]):
+        self._sessions = sessions
     
     def _load_sessions(self) -> List[Dict]:
-        """Load sessions from JSON file"""
-        if not self.storage_path.exists():
-            return []
-        
+        """Load sessions from storage"""
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            return self.storage.load_all()
+        except (IOError, ValueError):
             return []
     
     def _save_sessions(self):
-        """Save sessions to JSON file"""
+        """Save the full session list to storage"""
         try:
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(self.sessions, f, indent=2, ensure_ascii=False)
+            self.storage.replace_all(self.sessions)
         except IOError as e:
             print(f"Warning: Could not save session history to {self.storage_path}: {e}")
             print("Your session data for this run will not be persisted.")
+        
+        self._aggregates = SessionAggregates.from_sessions(self.sessions)
+        self._save_aggregates()
+    
+    @property
+    def aggregates(self) -> SessionAggregates:
+        """
+        Aggregate statistics, loaded from storage when still valid
+        
+        Persisted aggregates carry the storage fingerprint they were built
+        from; if the history changed behind our back they are rebuilt once.
+        """
+        if self._aggregates is None:
+            data = None
+            try:
+                data = self.storage.load_aggregates()
+                fingerprint = self.storage.fingerprint()
+            except (IOError, ValueError):
+                fingerprint = None
+            
+            if data and fingerprint is not None and data.get('fingerprint') == fingerprint:
+                self._aggregates = SessionAggregates.from_dict(data.get('aggregates', {}))
+                self._fingerprint = fingerprint
+            else:
+                self._aggregates = SessionAggregates.from_sessions(self.sessions)
+                self._save_aggregates()
+        return self._aggregates
+    
+    def _save_aggregates(self):
+        """Persist aggregates tagged with the current storage fingerprint"""
+        self._fingerprint = None
+        try:
+            fingerprint = self.storage.fingerprint()
+            if fingerprint is not None:
+                self.storage.save_aggregates({
+                    'fingerprint': fingerprint,
+                    'aggregates': self._aggregates.to_dict()
+                })
+                self._fingerprint = fingerprint
+        except IOError as e:
+            print(f"Warning: Could not save session statistics for {self.storage_path}: {e}")
+    
+    def _storage_changed(self) -> bool:
+        """Whether the storage was written since the aggregates were built"""
+        if self._fingerprint is None:
+            return False
+        try:
+            return self.storage.fingerprint() != self._fingerprint
+        except (IOError, ValueError):
+            return True
     
     def add_session(self, session_data: Dict):
         """
@@ -73,12 +251,48 @@ class SessionHistory:
             'notes': session_data.get('notes', '')
         }
         
-        self.sessions.append(session)
-        self._save_sessions()
+        # Validate aggregates against the storage before it changes. Another
+        # SessionHistory or process may have appended since they were built;
+        # then reload them (or rebuild from the stored sessions).
+        aggregates = self.aggregates
+        if self._storage_changed():
+            self._sessions = None
+            self._aggregates = None
+            aggregates = self.aggregates
+        
+        try:
+            self.storage.append(session)
+        except IOError as e:
+            print(f"Warning: Could not save session history to {self.storage_path}: {e}")
+            print("Your session data for this run will not be persisted.")
+            return
+        
+        if self._sessions is not None:
+            self._sessions.append(session)
+        
+        aggregates.add(session)
+        self._save_aggregates()
+    
+    def replace_sessions(self, sessions: List[Dict]):
+        """
+        Atomically replace every stored session and rebuild the aggregates
+        
+        Unlike the internal save, storage errors are raised: callers such
+        as the re-scoring job must not report success for a failed write.
+        
+        Args:
+            sessions: The complete new session list, oldest first
+        """
+        self.storage.replace_all(sessions)
+        self.sessions = sessions
+        self._aggregates = SessionAggregates.from_sessions(sessions)
+        self._save_aggregates()
     
     def get_recent_sessions(self, count: int = 10) -> List[Dict]:
         """Get most recent sessions"""
-        return self.sessions[-count:] if self.sessions else []
+        if self._sessions is not None:
+            return self._sessions[-count:] if self._sessions and count > 0 else []
+        return self.storage.recent(count)
     
     def get_sessions_by_date(self, date: str) -> List[Dict]:
         """
@@ -87,7 +301,9 @@ class SessionHistory:
         Args:
             date: Date string in format 'YYYY-MM-DD'
         """
-        return [s for s in self.sessions if s.get('date') == date]
+        if self._sessions is not None:
+            return [s for s in self._sessions if s.get('date') == date]
+        return self.storage.by_date(date)
     
     def get_all_sessions(self) -> List[Dict]:
         """Get all sessions"""
@@ -100,7 +316,9 @@ class SessionHistory:
         Returns:
             Dictionary with statistics
         """
-        if not self.sessions:
+        aggregates = self.aggregates
+        
+        if aggregates.count == 0:
             return {
                 'total_sessions': 0,
                 'total_practice_time': 0,
@@ -110,78 +328,23 @@ class SessionHistory:
                 'current_streak': 0
             }
         
-        scores = [s['honor_score'] for s in self.sessions]
-        total_time = sum(s.get('duration', 0) for s in self.sessions)
-        
-        # Calculate streak
-        streak = self._calculate_streak()
-        
         return {
-            'total_sessions': len(self.sessions),
-            'total_practice_time': total_time,
-            'average_score': sum(scores) / len(scores),
-            'highest_score': max(scores),
-            'lowest_score': min(scores),
-            'current_streak': streak,
+            'total_sessions': aggregates.count,
+            'total_practice_time': aggregates.total_time,
+            'average_score': aggregates.total_score / aggregates.count,
+            'highest_score': aggregates.highest_score,
+            'lowest_score': aggregates.lowest_score,
+            'current_streak': self._calculate_streak(),
             'most_common_tier': self._get_most_common_tier()
         }
     
     def _calculate_streak(self) -> int:
         """Calculate current practice streak (consecutive days)"""
-        if not self.sessions:
-            return 0
-        
-        # Get unique dates
-        dates = sorted(set(s['date'] for s in self.sessions), reverse=True)
-        
-        if not dates:
-            return 0
-        
-        # Check if practiced today or yesterday
-        from datetime import datetime
-        today = datetime.now().date()
-        
-        try:
-            # Try Python 3.7+ fromisoformat
-            last_practice = datetime.fromisoformat(dates[0]).date()
-        except (ValueError, AttributeError):
-            # Fallback for older Python or invalid format
-            try:
-                last_practice = datetime.strptime(dates[0], '%Y-%m-%d').date()
-            except ValueError:
-                return 0
-        
-        days_diff = (today - last_practice).days
-        if days_diff > 1:
-            return 0
-        
-        # Count consecutive days
-        streak = 1
-        for i in range(len(dates) - 1):
-            try:
-                current = datetime.fromisoformat(dates[i]).date()
-                next_date = datetime.fromisoformat(dates[i + 1]).date()
-            except (ValueError, AttributeError):
-                try:
-                    current = datetime.strptime(dates[i], '%Y-%m-%d').date()
-                    next_date = datetime.strptime(dates[i + 1], '%Y-%m-%d').date()
-                except ValueError:
-                    break
-            
-            if (current - next_date).days == 1:
-                streak += 1
-            else:
-                break
-        
-        return streak
+        return self.aggregates.current_streak()
     
     def _get_most_common_tier(self) -> str:
         """Get the most frequently achieved tier"""
-        if not self.sessions:
-            return 'N/A'
-        
-        tiers = [s['tier'] for s in self.sessions]
-        return max(set(tiers), key=tiers.count)
+        return self.aggregates.most_common_tier()
     
     def compare_with_previous(self, current_score: float, 
                              current_components: Dict) -> Dict:
@@ -195,19 +358,20 @@ class SessionHistory:
         Returns:
             Dictionary with comparison data
         """
-        if len(self.sessions) < 1:
+        # Get recent sessions (the last one is the previous session)
+        recent = self.get_recent_sessions(5)
+        if len(recent) < 1:
             return {
                 'has_history': False,
                 'message': '¡Primera sesión! Establece tu línea base.'
             }
         
         # Get last session
-        last_session = self.sessions[-1]
+        last_session = recent[-1]
         last_score = last_session['honor_score']
         score_diff = current_score - last_score
         
         # Get average of recent sessions
-        recent = self.get_recent_sessions(5)
         avg_recent = sum(s['honor_score'] for s in recent) / len(recent)
         
         # Find improved components
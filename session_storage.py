@@ -0,0 +1,341 @@
+"""
+Session Storage Module
+Pluggable persistence backends for SessionHistory
+
+- JSONStorage:   the original single JSON array (compatibility)
+- JSONLStorage:  append-only JSON lines, one session per line
+- SQLiteStorage: SQLite database indexed by date
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def atomic_write_text(path: Path, text: str):
+    """Write a file atomically (temporary file in the same directory + rename)"""
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class SessionStorage:
+    """
+    Interface for session persistence backends
+    
+    Sessions are dictionaries as built by SessionHistory.add_session and
+    are returned oldest first.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, path):
+        self.path = Path(path)
+    
+    def load_all(self) -> List[Dict]:
+        """Load every stored session"""
+        raise NotImplementedError
+    
+    def append(self, session: Dict):
+        """Store one new session"""
+        raise NotImplementedError
+    
+    def replace_all(self, sessions: List[Dict]):
+        """Atomically replace the stored sessions"""
+        raise NotImplementedError
+    
+    def count(self) -> int:
+        """Number of stored sessions"""
+        return len(self.load_all())
+    
+    def recent(self, count: int) -> List[Dict]:
+        """Most recent sessions, oldest first"""
+        if count <= 0:
+            return []
+        return self.load_all()[-count:]
+    
+    def by_date(self, date: str) -> List[Dict]:
+        """Sessions from a 'YYYY-MM-DD' date"""
+        return [s for s in self.load_all() if s.get('date') == date]
+    
+    def fingerprint(self) -> Optional[list]:
+        """
+        Cheap value that changes whenever the stored sessions change
+        
+        Used to tell whether persisted aggregates are still valid. None
+        means the backend does not persist aggregates.
+        """
+        return None
+    
+    def load_aggregates(self) -> Optional[Dict]:
+        """Load persisted aggregate statistics (None if unavailable)"""
+        return None
+    
+    def save_aggregates(self, aggregates: Dict):
+        """Persist aggregate statistics"""
+        pass
+
+
+class JSONStorage(SessionStorage):
+    """Original format: the whole history as one indented JSON array"""
+    
+    name = 'json'
+    
+    def load_all(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+    
+    def append(self, session: Dict):
+        sessions = self.load_all()
+        sessions.append(session)
+        self.replace_all(sessions)
+    
+    def replace_all(self, sessions: List[Dict]):
+        atomic_write_text(self.path, json.dumps(sessions, indent=2, ensure_ascii=False))
+
+
+class JSONLStorage(SessionStorage):
+    """Append-only JSON lines: adding a session writes a single line"""
+    
+    name = 'jsonl'
+    
+    def _lines(self):
+        """Iterate over non-empty lines of the file"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    
+    @staticmethod
+    def _parse(lines) -> List[Dict]:
+        """Parse lines, skipping any that are corrupt (e.g. a torn last write)"""
+        sessions = []
+        for line in lines:
+            try:
+                sessions.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return sessions
+    
+    def load_all(self) -> List[Dict]:
+        try:
+            return self._parse(self._lines())
+        except IOError:
+            return []
+    
+    def append(self, session: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(session, ensure_ascii=False) + '\n')
+    
+    def replace_all(self, sessions: List[Dict]):
+        atomic_write_text(
+            self.path,
+            ''.join(json.dumps(s, ensure_ascii=False) + '\n' for s in sessions)
+        )
+    
+    def count(self) -> int:
+        return sum(1 for _ in self._lines())
+    
+    def recent(self, count: int) -> List[Dict]:
+        if count <= 0:
+            return []
+        # Only the last lines are decoded
+        return self._parse(deque(self._lines(), maxlen=count))
+    
+    @property
+    def aggregates_path(self) -> Path:
+        """Sidecar file holding the aggregate statistics"""
+        return self.path.with_name(self.path.name + '.stats.json')
+    
+    def fingerprint(self) -> Optional[list]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return [0, 0]
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def load_aggregates(self) -> Optional[Dict]:
+        try:
+            with open(self.aggregates_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+    
+    def save_aggregates(self, aggregates: Dict):
+        atomic_write_text(self.aggregates_path, json.dumps(aggregates, ensure_ascii=False))
+
+
+class SQLiteStorage(SessionStorage):
+    """SQLite database with one row per session, indexed by date"""
+    
+    name = 'sqlite'
+    
+    def __init__(self, path):
+        super().__init__(path)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " timestamp TEXT, date TEXT, honor_score REAL, tier TEXT,"
+                " duration REAL, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS aggregates ("
+                " id INTEGER PRIMARY KEY CHECK (id = 1), data TEXT NOT NULL)"
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path))
+    
+    @staticmethod
+    def _row(session: Dict) -> tuple:
+        return (
+            session.get('timestamp'),
+            session.get('date'),
+            session.get('honor_score'),
+            session.get('tier'),
+            session.get('duration'),
+            json.dumps(session, ensure_ascii=False)
+        )
+    
+    def _query(self, sql: str, params: tuple = ()) -> List[Dict]:
+        with closing(self._connect()) as conn:
+            return [json.loads(data) for (data,) in conn.execute(sql, params)]
+    
+    def load_all(self) -> List[Dict]:
+        return self._query("SELECT data FROM sessions ORDER BY id")
+    
+    def append(self, session: Dict):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO sessions (timestamp, date, honor_score, tier, duration, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(session)
+            )
+    
+    def replace_all(self, sessions: List[Dict]):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions")
+            conn.executemany(
+                "INSERT INTO sessions (timestamp, date, honor_score, tier, duration, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [self._row(s) for s in sessions]
+            )
+    
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def recent(self, count: int) -> List[Dict]:
+        if count <= 0:
+            return []
+        rows = self._query("SELECT data FROM sessions ORDER BY id DESC LIMIT ?", (count,))
+        return rows[::-1]
+    
+    def by_date(self, date: str) -> List[Dict]:
+        return self._query("SELECT data FROM sessions WHERE date = ? ORDER BY id", (date,))
+    
+    def fingerprint(self) -> Optional[list]:
+        # AUTOINCREMENT ids never repeat, so (count, max id) changes on any write
+        with closing(self._connect()) as conn:
+            return list(conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM sessions").fetchone())
+    
+    def load_aggregates(self) -> Optional[Dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT data FROM aggregates WHERE id = 1").fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def save_aggregates(self, aggregates: Dict):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO aggregates (id, data) VALUES (1, ?)",
+                (json.dumps(aggregates, ensure_ascii=False),)
+            )
+
+
+STORAGE_BACKENDS = {
+    'json': JSONStorage,
+    'jsonl': JSONLStorage,
+    'sqlite': SQLiteStorage,
+}
+
+# File suffixes used to pick a backend when none is given
+SUFFIX_BACKENDS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.db': 'sqlite',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+}
+
+
+def get_storage(path, backend: str = None) -> SessionStorage:
+    """
+    Create a storage backend for a path
+    
+    Args:
+        path: Storage file path
+        backend: 'json' | 'jsonl' | 'sqlite' (default: inferred from the
+                 file suffix, falling back to JSON)
+    """
+    if backend is None:
+        backend = SUFFIX_BACKENDS.get(Path(path).suffix.lower(), 'json')
+    if backend not in STORAGE_BACKENDS:
+        available = ', '.join(sorted(STORAGE_BACKENDS))
+        raise ValueError(f"Unknown session storage backend '{backend}' (available: {available})")
+    return STORAGE_BACKENDS[backend](path)
+
+
+def migrate_sessions(source_path, target_path, source_backend: str = None,
+                     target_backend: str = None) -> int:
+    """
+    Copy every session from one storage to another (one shot)
+    
+    The source is left untouched. The target is replaced, so running the
+    migration twice does not duplicate sessions.
+    
+    Returns:
+        Number of sessions migrated
+    """
+    sessions = get_storage(source_path, source_backend).load_all()
+    get_storage(target_path, target_backend).replace_all(sessions)
+    return len(sessions)
+
+
+def main():
+    """Command-line entry point for migrating session history"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Migrate HonorHero session history between formats')
+    parser.add_argument('source', help='Existing history (e.g. ~/.honorhero/sessions.json)')
+    parser.add_argument('target', help='New history (.jsonl, .db/.sqlite or .json)')
+    args = parser.parse_args()
+    
+    count = migrate_sessions(args.source, args.target)
+    print(f"Migradas {count} sesiones: {args.source} -> {args.target}")
+
+
+if __name__ == '__main__':
+    main()
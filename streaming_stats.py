@@ -0,0 +1,246 @@
+"""
+Streaming Statistics Module
+Constant-time accumulators used by the analyzers so that per-update cost
+does not grow with session length
+"""
+
+import numpy as np
+from collections import deque
+from typing import Optional
+
+
+class RunningMean:
+    """
+    Running mean with an optional exponentially decayed mean
+    
+    The plain mean covers every value ever added. When decay is set
+    (weight of the newest value, 0-1), a decayed mean that follows recent
+    values is maintained alongside it.
+    """
+    
+    def __init__(self, decay: Optional[float] = None):
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.decay = decay
+        self.count = 0
+        self.total = 0.0
+        self.decayed_mean = None
+    
+    def add(self, value: float):
+        """Add a value to the accumulator"""
+        self.count += 1
+        self.total += value
+        
+        if self.decay is not None:
+            if self.decayed_mean is None:
+                self.decayed_mean = float(value)
+            else:
+                self.decayed_mean += self.decay * (value - self.decayed_mean)
+    
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of all values, or None if empty"""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+    
+    @property
+    def recent_mean(self) -> Optional[float]:
+        """Decayed mean if decay is enabled, otherwise the plain mean"""
+        if self.decayed_mean is not None:
+            return self.decayed_mean
+        return self.mean
+    
+    def reset(self):
+        """Clear the accumulator"""
+        self.count = 0
+        self.total = 0.0
+        self.decayed_mean = None
+
+
+class RunningExtrema:
+    """Running minimum and maximum of every value added"""
+    
+    def __init__(self):
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+    
+    def add(self, value: float):
+        """Add a value to the accumulator"""
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+    
+    @property
+    def range(self) -> float:
+        """Maximum minus minimum (0 when fewer than two values)"""
+        if self.count < 2:
+            return 0.0
+        return self.maximum - self.minimum
+    
+    def reset(self):
+        """Clear the accumulator"""
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+
+
+class RunningMoments:
+    """
+    Running mean and variance (Welford's algorithm)
+    
+    By default every value ever added counts. With a window, only the last
+    `window` values count: each new value replaces the oldest in a
+    preallocated ring and both are applied in one update. With decay
+    (weight of the newest value, 0-1), older values fade exponentially
+    instead. Every update is O(1) whatever the mode.
+    """
+    
+    def __init__(self, window: Optional[int] = None, decay: Optional[float] = None):
+        if window is not None and decay is not None:
+            raise ValueError("Use either window or decay, not both")
+        if window is not None and window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.window = window
+        self.decay = decay
+        self.values = np.zeros(window, dtype=np.float64) if window is not None else None
+        self.reset()
+    
+    def add(self, value: float):
+        """Add a value to the accumulator"""
+        value = float(value)
+        self.total += 1
+        
+        if self.count == 0:
+            self.count = 1
+            self._mean = value
+            self._m2 = 0.0
+        elif self.decay is not None:
+            # Exponentially weighted mean and variance
+            self.count += 1
+            diff = value - self._mean
+            increment = self.decay * diff
+            self._mean += increment
+            self._m2 = (1 - self.decay) * (self._m2 + diff * increment)
+        elif self.window is not None and self.count == self.window:
+            # Replace the oldest value in a single step
+            oldest = self.values[(self.total - 1) % self.window]
+            old_mean = self._mean
+            self._mean += (value - oldest) / self.window
+            self._m2 += (value - oldest) * (value - self._mean + oldest - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0  # Rounding
+        else:
+            self.count += 1
+            diff = value - self._mean
+            self._mean += diff / self.count
+            self._m2 += diff * (value - self._mean)
+        
+        if self.values is not None:
+            self.values[(self.total - 1) % self.window] = value
+    
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of the values counted, or None if empty"""
+        if self.count == 0:
+            return None
+        return self._mean
+    
+    @property
+    def variance(self) -> float:
+        """Population variance of the values counted (0 when fewer than two)"""
+        if self.count < 2:
+            return 0.0
+        if self.decay is not None:
+            return self._m2
+        return self._m2 / self.count
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation (like np.std)"""
+        return float(np.sqrt(self.variance))
+    
+    def reset(self):
+        """Clear the accumulator"""
+        self.count = 0    # Values currently counted (capped at window)
+        self.total = 0    # Values ever added
+        self._mean = 0.0
+        self._m2 = 0.0    # Sum of squared deviations (variance itself with decay)
+
+
+class SlidingWindowRange:
+    """
+    Minimum, maximum and range over the last `capacity` values
+    
+    Values live in a preallocated float32 ring; two monotonic deques of
+    indices give the window extrema in amortized O(1) per value.
+    """
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.values = np.zeros(capacity, dtype=np.float32)
+        self.count = 0  # Total values ever added
+        self._max_indices = deque()  # Decreasing values, oldest first
+        self._min_indices = deque()  # Increasing values, oldest first
+    
+    def add(self, value: float):
+        """Add a value, evicting the oldest one once the window is full"""
+        index = self.count
+        oldest_kept = index - self.capacity + 1
+        
+        # Drop indices that fall out of the window before their slot is reused
+        while self._max_indices and self._max_indices[0] < oldest_kept:
+            self._max_indices.popleft()
+        while self._min_indices and self._min_indices[0] < oldest_kept:
+            self._min_indices.popleft()
+        
+        slot = index % self.capacity
+        self.values[slot] = value
+        value = self.values[slot]
+        
+        while self._max_indices and self.values[self._max_indices[-1] % self.capacity] <= value:
+            self._max_indices.pop()
+        self._max_indices.append(index)
+        
+        while self._min_indices and self.values[self._min_indices[-1] % self.capacity] >= value:
+            self._min_indices.pop()
+        self._min_indices.append(index)
+        
+        self.count += 1
+    
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+    
+    @property
+    def minimum(self) -> Optional[float]:
+        """Smallest value in the window"""
+        if not self._min_indices:
+            return None
+        return float(self.values[self._min_indices[0] % self.capacity])
+    
+    @property
+    def maximum(self) -> Optional[float]:
+        """Largest value in the window"""
+        if not self._max_indices:
+            return None
+        return float(self.values[self._max_indices[0] % self.capacity])
+    
+    @property
+    def range(self) -> float:
+        """Maximum minus minimum over the window (0 when fewer than two values)"""
+        if len(self) < 2:
+            return 0.0
+        return self.maximum - self.minimum
+    
+    def reset(self):
+        """Clear the window"""
+        self.count = 0
+        self._max_indices.clear()
+        self._min_indices.clear()
@@ -0,0 +1,210 @@
+"""
+Terminal Renderer Module
+Differential full-screen frame renderer for the terminal UIs
+"""
+
+import re
+import shutil
+import sys
+import unicodedata
+from typing import List, Optional, TextIO, Tuple
+
+# SGR (color/style) escape sequences are the only escapes frame lines contain
+SGR_PATTERN = re.compile(r'\033\[([0-9;]*)m')
+
+RESET = '\033[0m'
+HIDE_CURSOR = '\033[?25l'
+SHOW_CURSOR = '\033[?25h'
+CLEAR_SCREEN = '\033[2J'
+CLEAR_TO_EOL = '\033[K'
+CLEAR_LINE = '\033[2K'
+
+# Unchanged cells shorter than this between two changed runs are re-sent
+# instead of paying for another cursor-positioning escape
+MERGE_GAP = 4
+
+# A cell is (style, text); wide characters are followed by a ('', '') filler
+Cell = Tuple[str, str]
+WIDE_FILLER: Cell = ('', '')
+
+
+def char_width(char: str) -> int:
+    """Number of terminal columns a character occupies (0, 1 or 2)"""
+    if unicodedata.combining(char) or char in '\u200d\ufe0e\ufe0f':
+        return 0
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+
+def parse_line(line: str) -> List[Cell]:
+    """
+    Split a line with SGR escapes into one cell per terminal column
+    
+    Each cell carries the full style active when it was written, so two
+    frames can be compared cell by cell.
+    """
+    cells: List[Cell] = []
+    style = ''
+    position = 0
+    for match in SGR_PATTERN.finditer(line):
+        _append_text(cells, line[position:match.start()], style)
+        params = match.group(1)
+        if params in ('', '0'):
+            style = ''
+        else:
+            style += match.group(0)
+        position = match.end()
+    _append_text(cells, line[position:], style)
+    return cells
+
+
+def _append_text(cells: List[Cell], text: str, style: str):
+    """Append plain text to a cell list"""
+    for char in text:
+        width = char_width(char)
+        if width == 0:
+            # Combining marks and variation selectors join the previous cell
+            if cells:
+                index = len(cells) - 1
+                if cells[index] == WIDE_FILLER and index > 0:
+                    index -= 1
+                prev_style, prev_text = cells[index]
+                cells[index] = (prev_style, prev_text + char)
+            continue
+        cells.append((style, char))
+        if width == 2:
+            cells.append(WIDE_FILLER)
+
+
+class TerminalRenderer:
+    """
+    Keeps the previous frame and redraws only the cells that changed
+    
+    Every frame is assembled into one string and written with a single
+    write call, which avoids flicker from clearing the screen and keeps
+    the bytes sent per frame low over slow links such as SSH.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self.previous: List[List[Cell]] = []
+        self.terminal_size = None
+        self.active = False
+        
+        # Statistics
+        self.frames = 0
+        self.full_redraws = 0
+        self.bytes_total = 0
+        self.last_frame_bytes = 0
+    
+    def invalidate(self):
+        """Force the next frame to be drawn in full"""
+        self.previous = []
+        self.active = False
+    
+    def render(self, lines: List[str]) -> int:
+        """
+        Draw a frame
+        
+        Args:
+            lines: Frame content, one string per screen row (may contain SGR escapes)
+        
+        Returns:
+            Number of bytes written for this frame
+        """
+        stream = self.stream or sys.stdout
+        
+        # A resized terminal reflows the old frame, so start over
+        size = shutil.get_terminal_size()
+        if size != self.terminal_size:
+            self.terminal_size = size
+            self.invalidate()
+        
+        out = []
+        if not self.active:
+            out.append(HIDE_CURSOR + CLEAR_SCREEN)
+            self.full_redraws += 1
+            self.active = True
+        
+        frame = [parse_line(line) for line in lines]
+        for row, cells in enumerate(frame):
+            old = self.previous[row] if row < len(self.previous) else []
+            if cells != old:
+                self._diff_row(out, row, old, cells)
+        
+        # Rows the previous frame had but this one does not
+        for row in range(len(frame), len(self.previous)):
+            out.append(f'\033[{row + 1};1H{CLEAR_LINE}')
+        
+        # Park the cursor below the frame
+        out.append(f'\033[{len(frame) + 1};1H')
+        
+        data = ''.join(out)
+        stream.write(data)
+        stream.flush()
+        
+        self.previous = frame
+        self.frames += 1
+        self.last_frame_bytes = len(data.encode('utf-8'))
+        self.bytes_total += self.last_frame_bytes
+        return self.last_frame_bytes
+    
+    def _diff_row(self, out: List[str], row: int, old: List[Cell], new: List[Cell]):
+        """Emit cursor moves and text for the changed runs of one row"""
+        length = len(new)
+        col = 0
+        while col < length:
+            if col < len(old) and old[col] == new[col]:
+                col += 1
+                continue
+            
+            # Extend the run over short stretches of unchanged cells
+            start = col
+            end = col + 1
+            gap = 0
+            while end < length and gap < MERGE_GAP:
+                if end < len(old) and old[end] == new[end]:
+                    gap += 1
+                else:
+                    gap = 0
+                end += 1
+            end -= gap
+            
+            # Never start a run on the right half of a wide character
+            while start > 0 and new[start] == WIDE_FILLER:
+                start -= 1
+            
+            out.append(f'\033[{row + 1};{start + 1}H')
+            style = ''
+            for cell_style, text in new[start:end]:
+                if (cell_style, text) == WIDE_FILLER:
+                    continue
+                if cell_style != style:
+                    out.append(RESET + cell_style)
+                    style = cell_style
+                out.append(text)
+            if style:
+                out.append(RESET)
+            col = end
+        
+        if len(old) > length:
+            out.append(f'\033[{row + 1};{length + 1}H{CLEAR_TO_EOL}')
+    
+    def close(self):
+        """Restore the cursor and move below the last frame"""
+        if self.active:
+            stream = self.stream or sys.stdout
+            stream.write(f'\033[{len(self.previous) + 1};1H{RESET}{SHOW_CURSOR}')
+            stream.flush()
+        self.invalidate()
+    
+    def get_stats(self) -> dict:
+        """Get rendering statistics"""
+        return {
+            'frames': self.frames,
+            'full_redraws': self.full_redraws,
+            'bytes_total': self.bytes_total,
+            'bytes_last_frame': self.last_frame_bytes,
+            'bytes_per_frame': self.bytes_total / self.frames if self.frames else 0.0
+        }
@@ -0,0 +1,255 @@
+"""
+Tests for the ring-buffered audio capture pipeline
+Runs without a sound device by driving the stream callback directly
+"""
+
+import numpy as np
+import sys
+import os
+import threading
+from unittest import mock
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import audio_capture
+from audio_capture import AudioBlockPool, AudioCapture, AudioRingBuffer
+
+
+def test_ring_buffer_order_and_overflow():
+    """Test FIFO order and overflow counting of the ring buffer"""
+    print("Testing AudioRingBuffer...")
+    
+    ring = AudioRingBuffer(capacity=4, block_size=8)
+    
+    for i in range(6):
+        ring.write(np.full(8, i, dtype=np.float32))
+    
+    assert ring.available() == 4, "Ring should hold exactly its capacity"
+    assert ring.overflows == 2, f"Two blocks should be dropped, got {ring.overflows}"
+    
+    seen = []
+    while ring.available():
+        seen.append(int(ring.peek()[0]))
+        ring.advance()
+    
+    assert seen == [0, 1, 2, 3], f"Blocks should come out in order, got {seen}"
+    assert ring.peek() is None, "Empty ring should return None"
+    
+    print(f"  ✓ Order preserved: {seen}")
+    print(f"  ✓ Overflows counted: {ring.overflows}")
+    print()
+
+
+def test_worker_consumes_callback_blocks():
+    """Test that the worker thread receives every captured block"""
+    print("Testing capture worker thread...")
+    
+    capture = AudioCapture(buffer_size=64, threaded=True, ring_blocks=16)
+    received = []
+    threads = set()
+    
+    def on_block(audio_chunk, sample_rate):
+        threads.add(threading.current_thread().name)
+        received.append((audio_chunk.ndim, float(audio_chunk[0])))
+    
+    capture.start_worker(on_block)
+    
+    # Simulate PortAudio delivering (frames, channels) blocks
+    for i in range(10):
+        indata = np.full((64, 1), i, dtype=np.float32)
+        capture._ring_callback(indata, 64, None, None)
+    
+    capture.stop()
+    
+    assert len(received) == 10, f"Expected 10 blocks, got {len(received)}"
+    assert all(ndim == 1 for ndim, _ in received), "Blocks should be 1-D mono"
+    assert [v for _, v in received] == list(range(10)), "Blocks should arrive in order"
+    assert threads == {'HonorHeroAnalysis'}, "Analysis should run on the worker thread"
+    
+    stats = capture.get_overflow_stats()
+    assert stats['blocks_captured'] == 10
+    assert stats['blocks_processed'] == 10
+    assert stats['dropped_blocks'] == 0
+    
+    print(f"  ✓ Worker processed {stats['blocks_processed']} blocks")
+    print()
+
+
+def test_slow_analyzer_counts_dropped_blocks():
+    """Test that a stalled analyzer shows up as dropped blocks"""
+    print("Testing overflow counters with a slow analyzer...")
+    
+    capture = AudioCapture(buffer_size=32, threaded=True, ring_blocks=4)
+    release = threading.Event()
+    
+    def slow_block(audio_chunk, sample_rate):
+        release.wait()
+    
+    capture.start_worker(slow_block)
+    
+    for i in range(20):
+        capture._ring_callback(np.zeros((32, 1), dtype=np.float32), 32, None, None)
+    
+    stats = capture.get_overflow_stats()
+    release.set()
+    capture.stop()
+    
+    assert stats['dropped_blocks'] > 0, "Stalled analyzer should cause dropped blocks"
+    assert stats['blocks_captured'] == 20
+    
+    print(f"  ✓ Dropped blocks: {stats['dropped_blocks']}")
+    print()
+
+
+def test_worker_passes_block_timing():
+    """Test that positions and driver times travel with each block"""
+    print("Testing block timing through the ring...")
+    
+    class TimeInfo:
+        def __init__(self, adc):
+            self.inputBufferAdcTime = adc
+    
+    capture = AudioCapture(buffer_size=32, threaded=True, ring_blocks=4)
+    release = threading.Event()
+    received = []
+    
+    def on_block(audio_chunk, sample_rate, position, adc_time):
+        release.wait()
+        received.append((position, adc_time))
+    
+    capture.start_worker(on_block, with_timing=True)
+    for i in range(8):
+        # Host APIs without ADC times report 0
+        adc = 10.0 + i * 32 / capture.sample_rate if i % 2 == 0 else 0.0
+        capture._ring_callback(np.zeros((32, 1), dtype=np.float32), 32, TimeInfo(adc), None)
+    release.set()
+    capture.stop()
+    
+    positions = [position for position, _ in received]
+    assert positions[:4] == [0, 32, 64, 96], f"Got {positions}"
+    assert len(received) < 8, "Some blocks were dropped"
+    assert received[0][1] == 10.0 and received[1][1] is None
+    assert capture.samples_captured == 256, "Dropped blocks still advance the count"
+    
+    print(f"  ✓ Positions {positions}, {8 - len(received)} blocks dropped")
+    print()
+
+
+def test_direct_callback_uses_block_pool():
+    """Test that the callback without the worker hands out pooled mono blocks"""
+    print("Testing block pool...")
+    
+    capture = AudioCapture(buffer_size=16, threaded=False)
+    capture.block_pool = AudioBlockPool(size=2, block_size=16)
+    received = []
+    
+    for i in range(3):
+        indata = np.full((16, 1), i, dtype=np.float32)
+        capture._direct_callback(lambda chunk, sr: received.append(chunk), indata, 16, None, None)
+    
+    first = received[0]
+    assert first.ndim == 1 and first.dtype == np.float32 and first.flags.c_contiguous
+    assert received[2] is not first and np.shares_memory(received[2], first), "Buffers are reused in turn"
+    assert received[1][0] == 1.0 and received[2][0] == 2.0
+    assert capture.samples_captured == 48
+    
+    stereo = np.arange(32, dtype=np.float32).reshape(16, 2)
+    assert np.array_equal(capture.block_pool.fill(stereo), stereo[:, 0]), "First channel kept"
+    
+    print("  ✓ 1-D contiguous float32 blocks from 2 reused buffers")
+    print()
+
+
+def test_start_failure_stops_worker():
+    """Test that a device that fails to open leaves no worker running"""
+    print("Testing failed stream start...")
+    
+    class BrokenDevice:
+        @staticmethod
+        def InputStream(**kwargs):
+            raise OSError("Device unavailable")
+    
+    capture = AudioCapture(buffer_size=32, threaded=True, ring_blocks=4)
+    with mock.patch.object(audio_capture, '_load_sounddevice', return_value=BrokenDevice):
+        try:
+            capture.start(lambda chunk, sr: None)
+            assert False, "The device error should be raised"
+        except OSError:
+            pass
+    
+    assert not capture.is_capturing, "Capture should not be marked as running"
+    assert capture.worker is None, "Worker should be joined"
+    assert not any(t.name == 'HonorHeroAnalysis' for t in threading.enumerate())
+    
+    print("  ✓ Error raised, worker stopped")
+    print()
+
+
+def test_stats_reset_on_start():
+    """Test that capture counters start from zero on every session"""
+    print("Testing counters across sessions...")
+    
+    class Stream:
+        def __init__(self, **kwargs):
+            self.callback = kwargs['callback']
+        
+        def start(self):
+            for i in range(5):
+                self.callback(np.zeros((32, 1), dtype=np.float32), 32, None, 'input overflow')
+        
+        def stop(self):
+            pass
+        
+        def close(self):
+            pass
+    
+    class Device:
+        InputStream = Stream
+    
+    capture = AudioCapture(buffer_size=32, threaded=True, ring_blocks=16)
+    with mock.patch.object(audio_capture, '_load_sounddevice', return_value=Device):
+        for session in range(2):
+            capture.start(lambda chunk, sr: None)
+            capture.stop()
+            stats = capture.get_overflow_stats()
+            assert stats['blocks_captured'] == 5 and stats['blocks_processed'] == 5, f"Got {stats}"
+            assert stats['status_events'] == 5
+    
+    print("  ✓ Second session reports its own 5 blocks")
+    print()
+
+
+def run_all_tests():
+    """Run all audio capture tests"""
+    print("=" * 60)
+    print("HonorHero Audio Capture Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_ring_buffer_order_and_overflow()
+        test_worker_consumes_callback_blocks()
+        test_slow_analyzer_counts_dropped_blocks()
+        test_worker_passes_block_timing()
+        test_direct_callback_uses_block_pool()
+        test_start_failure_stops_worker()
+        test_stats_reset_on_start()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+Tests for the process-pool batch scorer
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_scorer import find_audio_files, read_manifest, iter_batch_scores
+from offline_scorer import OfflineScorer
+from test_offline_scorer import write_wav, make_scale
+
+
+def test_batch_scores_match_single_file_scores():
+    """Test that parallel batch scoring matches scoring files one by one"""
+    print("Testing batch scoring...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'week1'))
+        for i, name in enumerate(['a.wav', 'b.wav', os.path.join('week1', 'c.wav')]):
+            audio = make_scale(22050, note_seconds=0.3 + 0.1 * i, repeats=1)
+            write_wav(os.path.join(tmp, name), audio, 22050)
+        with open(os.path.join(tmp, 'broken.wav'), 'wb') as f:
+            f.write(b'not audio')
+        
+        paths = find_audio_files(tmp)
+        assert len(paths) == 4, f"Expected 4 audio files, got {paths}"
+        
+        rows = list(iter_batch_scores(paths, pitch_backend='yin', workers=2))
+        single = OfflineScorer(pitch_backend='yin')
+        expected = {p: single.score_file(p)['final_honor_score']
+                    for p in paths if not p.endswith('broken.wav')}
+    
+    assert len(rows) == 4, "Every file should produce a row"
+    errors = [row for row in rows if 'error' in row]
+    assert len(errors) == 1 and errors[0]['file'].endswith('broken.wav'), "Broken file should report an error"
+    
+    for row in rows:
+        json.dumps(row)  # Rows must be JSON-serializable
+        if 'error' not in row:
+            assert row['honor_score'] == expected[row['file']], f"Mismatch for {row['file']}"
+            assert row['wall_time'] > 0 and row['analysis_time'] > 0
+    
+    print(f"  ✓ {len(rows) - 1} files scored, 1 error reported")
+    print()
+
+
+def test_manifest_formats():
+    """Test plain and JSON-lines manifests with relative paths"""
+    print("Testing manifest parsing...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, 'takes.txt')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            f.write("# semester takes\n")
+            f.write("student1/take.wav\n\n")
+            f.write(json.dumps({'path': '/data/student2.flac', 'student': 2}) + "\n")
+        
+        paths = read_manifest(manifest)
+    
+    assert paths == [os.path.join(tmp, 'student1', 'take.wav'), '/data/student2.flac'], f"Got {paths}"
+    
+    print("  ✓ Plain and JSON manifest lines parsed")
+    print()
+
+
+def run_all_tests():
+    """Run all batch scoring tests"""
+    print("=" * 60)
+    print("HonorHero Batch Scoring Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_batch_scores_match_single_file_scores()
+        test_manifest_formats()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
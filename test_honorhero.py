@@ -13,7 +13,7 @@ from pitch_analyzer import PitchAnalyzer
 from timing_analyzer import TimingAnalyzer
 from dynamics_analyzer import DynamicsAnalyzer
 from consistency_analyzer import ConsistencyAnalyzer
-from scoring_system import ScoringSystem
+from scoring_system import ScoringSystem, TIER_NAMES
 
 
 def test_pitch_analyzer():
@@ -146,6 +146,38 @@ def test_scoring_system():
     print()
 
 
+def test_batch_honor_scores():
+    """Test the vectorized batch API against single evaluations"""
+    print("Testing ScoringSystem batch scores...")
+    
+    scorer = ScoringSystem()
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(0, 100, (500, len(scorer.components)))
+    batch = scorer.calculate_honor_scores(matrix)
+    
+    for row, score, tier in zip(matrix, batch['scores'], batch['tiers']):
+        single = scorer.calculate_honor_score(dict(zip(scorer.components, row)))
+        assert abs(single['honor_score'] - score) < 1e-9
+        assert single['tier'] == TIER_NAMES[tier]
+    assert len(scorer.score_history) == 500, "Only single evaluations are recorded"
+    
+    # Several weight sets in one call: (N, K) results
+    weight_sets = np.array([scorer.weight_vector, np.full(5, 0.2), [1, 0, 0, 0, 0]])
+    multi = scorer.calculate_honor_scores(matrix, weight_sets)
+    assert multi['scores'].shape == (500, 3) and multi['tiers'].shape == (500, 3)
+    assert np.allclose(multi['scores'][:, 0], batch['scores'])
+    assert np.allclose(multi['scores'][:, 2], matrix[:, 0])
+    
+    # Scores between the configured integer ranges belong to the lower tier
+    gaps = scorer.calculate_honor_scores(np.full((3, 5), [[79.5], [59.99], [39.2]]))
+    assert [TIER_NAMES[t] for t in gaps['tiers']] == ['Firme', 'Inestable', 'Fragmentado']
+    assert scorer._get_tier(79.5) == 'Firme'
+    
+    print(f"  ✓ {len(matrix)} rows match calculate_honor_score, 3 weight sets at once")
+    print("  ✓ 79.5 -> Firme")
+    print()
+
+
 def test_integration():
     """Test module integration"""
     print("Testing Integration...")
@@ -212,6 +244,7 @@ def run_all_tests():
         test_dynamics_analyzer()
         test_consistency_analyzer()
         test_scoring_system()
+        test_batch_honor_scores()
         test_integration()
         
         print("=" * 60)
@@ -0,0 +1,184 @@
+"""
+Tests for the onset detectors and their use in TimingAnalyzer
+"""
+
+import sys
+import os
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from onset_detector import (
+    EnergyOnsetDetector, OnsetDetector, SpectralFluxOnsetDetector,
+    get_onset_detector, register_onset_detector, ONSET_DETECTORS
+)
+from timing_analyzer import TimingAnalyzer
+from benchmark_onsets import make_clicks, make_notes, evaluate
+
+SAMPLE_RATE = 22050
+BLOCK_SIZE = 2048
+
+
+def stream(detector, audio):
+    """Feed audio block by block and collect the onsets"""
+    found = []
+    for offset in range(0, len(audio) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        found += detector.detect(audio[offset:offset + BLOCK_SIZE], SAMPLE_RATE, offset / SAMPLE_RATE)
+    return np.array(found)
+
+
+def test_clicks_found_accurately():
+    """Test that clicks are found once each, to within a couple of ms"""
+    print("Testing spectral flux on a click track...")
+    
+    audio, truth = make_clicks(6.0, SAMPLE_RATE, noise=0.003)
+    result = evaluate(stream(SpectralFluxOnsetDetector(), audio), truth)
+    
+    assert result['precision'] == 1.0 and result['recall'] == 1.0, f"Got {result}"
+    assert result['max_error_ms'] < 2.0, f"Max error {result['max_error_ms']:.2f} ms"
+    
+    print(f"  ✓ {len(truth)} clicks, max error {result['max_error_ms']:.2f} ms")
+    print()
+
+
+def test_notes_found():
+    """Test that tone onsets are found and placed within the attack"""
+    print("Testing spectral flux on note onsets...")
+    
+    audio, truth = make_notes(6.0, SAMPLE_RATE, noise=0.003)
+    result = evaluate(stream(SpectralFluxOnsetDetector(), audio), truth)
+    
+    assert result['f1'] == 1.0, f"Got {result}"
+    assert result['median_error_ms'] < 10.0, f"Median error {result['median_error_ms']:.1f} ms"
+    
+    print(f"  ✓ {len(truth)} notes, median error {result['median_error_ms']:.1f} ms")
+    print()
+
+
+def test_sustained_tone_does_not_retrigger():
+    """Test that steady tones and silence produce no onsets after the first"""
+    print("Testing sustained tone...")
+    
+    t = np.arange(int(3 * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    tone[:SAMPLE_RATE] = 0.0  # One second of silence, then the tone
+    
+    flux = stream(SpectralFluxOnsetDetector(), tone)
+    assert len(flux) == 1 and abs(flux[0] - 1.0) < 0.005, f"Got {flux}"
+    
+    energy = stream(EnergyOnsetDetector(), tone)
+    assert len(energy) > 10, "Energy detector re-triggers on every loud block"
+    
+    print(f"  ✓ Spectral flux: 1 onset, energy detector: {len(energy)}")
+    print()
+
+
+def test_block_size_independent():
+    """Test that frames continue across block boundaries"""
+    print("Testing block size independence...")
+    
+    audio, truth = make_clicks(4.0, SAMPLE_RATE, noise=0.003, seed=1)
+    reference = stream(SpectralFluxOnsetDetector(), audio)
+    
+    detector = SpectralFluxOnsetDetector()
+    found = []
+    offset = 0
+    for size in [300, 1024, 77, 4096, 513] * 40:
+        block = audio[offset:offset + size]
+        if len(block) == 0:
+            break
+        found += detector.detect(block, SAMPLE_RATE, offset / SAMPLE_RATE)
+        offset += size
+    
+    assert np.allclose(found, reference), "Same onsets regardless of block size"
+    print(f"  ✓ {len(found)} identical onsets with irregular blocks")
+    print()
+
+
+def test_registry():
+    """Test detector lookup by name"""
+    print("Testing onset detector registry...")
+    
+    assert isinstance(get_onset_detector('energy'), EnergyOnsetDetector)
+    assert isinstance(get_onset_detector(), SpectralFluxOnsetDetector)
+    detector = EnergyOnsetDetector()
+    assert get_onset_detector(detector) is detector, "Instances pass through"
+    
+    try:
+        get_onset_detector('nonexistent')
+        assert False, "Should raise ValueError"
+    except ValueError as e:
+        assert 'available' in str(e)
+    
+    class SilentDetector(OnsetDetector):
+        name = 'silent'
+        
+        def detect(self, audio_chunk, sample_rate, timestamp):
+            return []
+    
+    register_onset_detector('silent', SilentDetector)
+    try:
+        assert isinstance(get_onset_detector('silent'), SilentDetector)
+    finally:
+        del ONSET_DETECTORS['silent']
+    
+    print("  ✓ Lookup, instances, unknown names and registration")
+    print()
+
+
+def test_timing_analyzer_uses_detector():
+    """Test that TimingAnalyzer records detector onsets and intervals"""
+    print("Testing TimingAnalyzer integration...")
+    
+    audio, truth = make_clicks(6.0, SAMPLE_RATE, noise=0.003, seed=2)
+    analyzer = TimingAnalyzer(onset_detector='spectral_flux')
+    for offset in range(0, len(audio) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        result = analyzer.detect_onset(audio[offset:offset + BLOCK_SIZE], SAMPLE_RATE, offset / SAMPLE_RATE)
+        assert result['is_onset'] == bool(result['onsets'])
+    
+    assert np.allclose(analyzer.onset_times.values(), truth, atol=0.002)
+    assert np.allclose(analyzer.intervals.values(), np.diff(truth), atol=0.004)
+    assert analyzer.analyze_rhythm()['score'] == 100, "Clicks are evenly spaced"
+    count = len(analyzer.onset_times)
+    
+    analyzer.reset()
+    assert len(analyzer.onset_times) == 0
+    assert analyzer.onset_detector.flux_count == 0, "Reset clears detector state"
+    
+    print(f"  ✓ {count} onsets, rhythm score 100")
+    print()
+
+
+def run_all_tests():
+    """Run all onset detector tests"""
+    print("=" * 60)
+    print("HonorHero Onset Detector Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_clicks_found_accurately()
+        test_notes_found()
+        test_sustained_tone_does_not_retrigger()
+        test_block_size_independent()
+        test_registry()
+        test_timing_analyzer_uses_detector()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+    
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
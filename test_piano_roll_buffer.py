@@ -0,0 +1,134 @@
+"""
+Tests for the circular piano roll column buffer
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from piano_roll_buffer import PianoRollBuffer
+from piano_roll_ui import PianoRollUI
+
+
+def test_scrolling():
+    """Test that notes scroll left and fall off the window"""
+    print("Testing column scrolling...")
+    
+    roll = PianoRollBuffer(rows=4, columns=10, window_seconds=1.0)
+    roll.advance(100.0)
+    assert roll.stamp(100.0, 2, 3), "Note at the head should stamp"
+    assert roll.view()[2, -1] == 3, "Newest note is in the last column"
+    
+    scrolled = roll.advance(100.3)
+    assert scrolled == 3, f"Expected 3 columns, got {scrolled}"
+    assert roll.view()[2, -4] == 3, "Note should move left by the elapsed columns"
+    assert roll.view().sum() == 3, "Only one note present"
+    
+    roll.advance(101.05)
+    assert roll.view().sum() == 0, "Note should leave the window after window_seconds"
+    
+    # Outside the window or row range
+    assert not roll.stamp(102.0, 0, 1), "Future notes are rejected"
+    assert not roll.stamp(99.0, 0, 1), "Notes older than the window are rejected"
+    assert not roll.stamp(101.0, 9, 1), "Rows outside the roll are rejected"
+    
+    # Large jumps clear everything; the clock going backwards is ignored
+    roll.stamp(101.0, 1, 2)
+    assert roll.advance(500.0) >= 10 and roll.view().sum() == 0
+    assert roll.advance(400.0) == 0
+    
+    print("  ✓ Columns scroll with elapsed time")
+    print("  ✓ Out-of-window notes rejected")
+    print()
+
+
+def test_matches_full_replot():
+    """Test the ring against re-projecting every note each frame"""
+    print("Testing ring against full re-plot...")
+    
+    rng = np.random.default_rng(1)
+    rows, columns, window = 12, 40, 2.0
+    roll = PianoRollBuffer(rows, columns, window)
+    notes = []
+    now = 1000.0
+    
+    for frame in range(200):
+        now += rng.uniform(0.0, 0.2)
+        roll.advance(now)
+        for _ in range(rng.integers(0, 3)):
+            note = (now - rng.uniform(0, 0.05), int(rng.integers(0, rows)), int(rng.integers(1, 5)))
+            notes.append(note)
+            roll.stamp(*note)
+        
+        expected = np.zeros((rows, columns), dtype=np.uint8)
+        head = roll.column_index(now)
+        for timestamp, row, level in notes:
+            column = roll.column_index(timestamp)
+            if head - columns < column <= head:
+                expected[row, columns - 1 - (head - column)] = level
+        assert np.array_equal(roll.view(), expected), f"Mismatch at frame {frame}"
+    
+    print(f"  ✓ {len(notes)} notes over 200 frames match")
+    print()
+
+
+def test_ui_stamps_only_new_notes():
+    """Test that the UI stamps buffer entries once and supports long windows"""
+    print("Testing UI integration...")
+    
+    import time
+    
+    ui = PianoRollUI(window_seconds=600)
+    now = time.time()
+    ui.note_buffer.append({'timestamp': now - 300, 'midi': 60, 'velocity': 0.9})
+    ui.draw_piano_roll(now)
+    
+    stamped = []
+    original = ui.roll.stamp
+    ui.roll.stamp = lambda *args: stamped.append(args) or original(*args)
+    
+    ui.note_buffer.append({'timestamp': now, 'midi': 62, 'velocity': 0.5})
+    lines = ui.draw_piano_roll(now + 0.01)
+    
+    assert len(stamped) == 1, f"Only the new note should be stamped, got {stamped}"
+    assert len(lines) == ui.total_rows
+    lit = [line for line in lines if '█' in line or '▒' in line]
+    assert len(lit) == 2, "Both notes visible in a 10 minute window"
+    
+    print("  ✓ Only new notes stamped per frame")
+    print("  ✓ 600 s window renders at the same width")
+    print()
+
+
+def run_all_tests():
+    """Run all piano roll buffer tests"""
+    print("=" * 60)
+    print("HonorHero Piano Roll Buffer Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_scrolling()
+        test_matches_full_replot()
+        test_ui_stamps_only_new_notes()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
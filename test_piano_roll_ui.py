@@ -52,6 +52,29 @@ def test_note_row_conversion():
     print()
 
 
+def test_midi_row_lookup():
+    """Test MIDI number to row lookup and the engine-to-buffer path"""
+    print("Testing MIDI row lookup...")
+    
+    ui = PianoRollUI()
+    
+    assert ui.get_midi_row(60) == ui.get_note_row('C4'), "MIDI 60 is C4"
+    assert ui.get_midi_row(61) == ui.get_note_row('C#4') == ui.get_midi_row(60) - 1
+    assert ui.get_midi_row(35) == -1 and ui.get_midi_row(96) == -1, "Outside C2-B6"
+    assert ui.get_midi_row(-5) == -1 and ui.get_midi_row(500) == -1
+    assert ui.row_labels[ui.get_midi_row(61)].strip() == 'C#4'
+    
+    # Notes reach the buffer as integers, with no name round trip
+    ui.engine.pitch_analyzer.pitch_history.append({'frequency': 277.18, 'midi': 61, 'deviation': 0.0})
+    ui.display_frame = lambda metrics: None
+    ui.on_update({'components': {'pitch': 90, 'dynamics': 80}})
+    assert ui.note_buffer[-1]['midi'] == 61, f"Got {ui.note_buffer[-1]}"
+    
+    print(f"  ✓ C#4 row: {ui.get_midi_row(61)}")
+    print("  ✓ Engine notes buffered as MIDI numbers")
+    print()
+
+
 def test_color_selection():
     """Test color selection based on score"""
     print("Testing color selection...")
@@ -207,6 +230,7 @@ def run_all_tests():
     try:
         test_piano_roll_initialization()
         test_note_row_conversion()
+        test_midi_row_lookup()
         test_color_selection()
         test_velocity_character()
         test_note_buffer()
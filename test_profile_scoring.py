@@ -0,0 +1,158 @@
+"""
+Tests for the feature cache and vectorized profile scoring
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from consistency_analyzer import ConsistencyAnalyzer
+from feature_cache import FeatureCache, PerformanceFeatures
+from offline_scorer import OfflineScorer
+from profile_scoring import score_profiles, score_consistency
+from test_offline_scorer import write_wav
+
+SAMPLE_RATE = 22050
+
+
+def make_uneven_take(seconds: float = 12.0, seed: int = 3) -> np.ndarray:
+    """Notes of random length, pitch, detuning and loudness"""
+    rng = np.random.default_rng(seed)
+    notes = []
+    total = 0.0
+    while total < seconds:
+        length = rng.uniform(0.12, 0.9)
+        t = np.arange(int(SAMPLE_RATE * length)) / SAMPLE_RATE
+        freq = 220 * 2 ** ((rng.integers(0, 12) + rng.normal(0, 0.6)) / 12)
+        envelope = np.exp(-t * 3) * rng.uniform(0.02, 0.8)
+        notes.append(envelope * np.sin(2 * np.pi * freq * t) + 0.003 * rng.standard_normal(len(t)))
+        total += length
+    return np.concatenate(notes)
+
+
+def test_matches_offline_scorer():
+    """Test that every profile scores as a full offline run with that profile"""
+    print("Testing profile scores against the analyzers...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'take.wav')
+        write_wav(path, make_uneven_take(), SAMPLE_RATE)
+        
+        features = OfflineScorer(pitch_backend='yin').extract_features(path)
+        results = score_profiles(features)
+        assert list(results) == list(config.PROFILES)
+        
+        for profile in config.PROFILES:
+            expected = OfflineScorer(profile=profile, pitch_backend='yin').score_file(path)
+            result = results[profile]
+            assert abs(result['final_honor_score'] - expected['final_honor_score']) < 1e-9, profile
+            assert result['tier'] == expected['tier'], profile
+            for name, score in expected['components'].items():
+                assert abs(result['components'][name] - score) < 1e-9, f"{profile} {name}"
+            print(f"  ✓ {profile:<13} {result['final_honor_score']:5.1f} ({result['tier']})")
+    
+    scores = [results[profile]['final_honor_score'] for profile in ['therapy', 'beginner', 'advanced']]
+    assert scores == sorted(scores, reverse=True), "Stricter profiles score lower"
+    print()
+
+
+def test_cache_hits_and_keys():
+    """Test content-hash keys, hits, settings changes and damaged entries"""
+    print("Testing feature cache...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'take.wav')
+        write_wav(path, make_uneven_take(4.0), SAMPLE_RATE)
+        cache = FeatureCache(os.path.join(tmp, 'cache'), pitch_backend='yin')
+        
+        first = cache.get(path)
+        renamed = os.path.join(tmp, 'renamed.wav')
+        shutil.copy(path, renamed)
+        second = cache.get(renamed)
+        assert (cache.hits, cache.misses) == (1, 1), "Same audio, same entry"
+        assert np.array_equal(first.onset_times, second.onset_times)
+        assert np.array_equal(first.update_counts, second.update_counts)
+        
+        assert FeatureCache(cache.cache_dir, pitch_backend='piptrack').key(path) != cache.key(path)
+        saved = config.ONSET_MIN_INTERVAL
+        config.ONSET_MIN_INTERVAL = 0.2
+        try:
+            changed = cache.key(path)
+        finally:
+            config.ONSET_MIN_INTERVAL = saved
+        assert changed != cache.key(path), "Extraction settings are part of the key"
+        saved = config.PITCH_HARMONICS
+        config.PITCH_HARMONICS = saved + 1
+        try:
+            changed = cache.key(path)
+        finally:
+            config.PITCH_HARMONICS = saved
+        assert changed != cache.key(path), "Pitch confidence settings are part of the key"
+        
+        # A damaged entry is extracted again
+        entry = cache.cache_dir / f"{cache.key(path)}.npz"
+        entry.write_bytes(b'not an npz')
+        third = cache.get(path)
+        assert cache.misses == 2 and np.array_equal(third.levels_db, first.levels_db)
+        assert isinstance(PerformanceFeatures.load(entry), PerformanceFeatures)
+        
+        print(f"  ✓ {cache.get_stats()}")
+    print()
+
+
+def test_consistency_modes():
+    """Test whole-session, windowed and decayed consistency against the analyzer"""
+    print("Testing consistency replay...")
+    
+    rng = np.random.default_rng(0)
+    metrics = rng.uniform(20, 100, (4, 1, 30))
+    for options in [{}, {'window': 7}, {'decay': 0.2}]:
+        analyzer = ConsistencyAnalyzer(0.9, window=options.get('window'), decay=options.get('decay'))
+        for tick in range(metrics.shape[-1]):
+            analyzer.add_metrics(*metrics[:, 0, tick])
+        expected = analyzer.analyze()['score']
+        
+        result = score_consistency(metrics, np.array([[0.9]]), window=options.get('window'),
+                                   decay=options.get('decay'))[0]
+        assert abs(result - expected) < 1e-9, f"{options}: {result} vs {expected}"
+        print(f"  ✓ {options or 'whole session'}: {result:.2f}")
+    
+    assert score_consistency(metrics[..., :0], np.array([[0.9]]))[0] == 70, "No ticks, default score"
+    print()
+
+
+def run_all_tests():
+    """Run all profile scoring tests"""
+    print("=" * 60)
+    print("HonorHero Profile Scoring Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_matches_offline_scorer()
+        test_cache_hits_and_keys()
+        test_consistency_modes()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+    
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
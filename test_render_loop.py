@@ -0,0 +1,181 @@
+"""
+Tests for the latest-value mailbox and the UI render thread
+"""
+
+import sys
+import os
+import threading
+import time
+import io
+from contextlib import redirect_stdout
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from render_loop import LatestValueMailbox, RenderThread
+from honorhero import HonorHero
+from piano_roll_ui import PianoRollUI
+
+
+def test_mailbox_keeps_latest():
+    """Test that the mailbox only ever hands out the newest value"""
+    print("Testing latest-value mailbox...")
+    
+    mailbox = LatestValueMailbox()
+    assert mailbox.take() == (None, False), "Empty mailbox"
+    
+    for i in range(5):
+        mailbox.publish(i)
+    value, fresh = mailbox.take()
+    assert value == 4 and fresh, "Newest value should win"
+    assert mailbox.overwritten == 4, f"Expected 4 overwritten, got {mailbox.overwritten}"
+    assert mailbox.take() == (4, False), "Second take is not fresh"
+    
+    # A waiting consumer wakes up on publish
+    threading.Timer(0.05, mailbox.publish, args=('late',)).start()
+    start = time.monotonic()
+    value, fresh = mailbox.take(timeout=2.0)
+    assert value == 'late' and fresh and time.monotonic() - start < 1.0
+    
+    print("  ✓ Publisher never queues")
+    print("  ✓ Consumer can wait for a new value")
+    print()
+
+
+def test_render_thread_stats():
+    """Test frame counting, idle frames and dropped frames"""
+    print("Testing render thread...")
+    
+    mailbox = LatestValueMailbox()
+    drawn = []
+    
+    def render(value, fresh):
+        drawn.append((value, fresh))
+    
+    renderer = RenderThread(render, mailbox, fps=100, redraw_idle=False)
+    mailbox.publish('a')
+    renderer.start()
+    time.sleep(0.15)
+    renderer.stop()
+    
+    stats = renderer.get_stats()
+    assert drawn == [('a', True)], f"Only the fresh value is drawn, got {drawn}"
+    assert stats['frames'] == 1 and stats['idle_frames'] > 0
+    
+    # A renderer slower than the frame period drops frames instead of queueing
+    def slow_render(value, fresh):
+        time.sleep(0.05)
+    
+    slow = RenderThread(slow_render, mailbox, fps=50)
+    slow.start()
+    time.sleep(0.3)
+    slow.stop()
+    
+    stats = slow.get_stats()
+    assert stats['dropped_frames'] > 0, "Slow frames should drop later ones"
+    assert stats['avg_render_ms'] >= 45, f"Render time not measured: {stats}"
+    assert stats['max_render_ms'] >= stats['avg_render_ms']
+    
+    print(f"  ✓ Slow renderer: {stats['frames']} frames, {stats['dropped_frames']} dropped, "
+          f"{stats['avg_render_ms']:.1f} ms/frame")
+    print()
+
+
+def test_render_failures_do_not_flood():
+    """Test that a failing renderer warns once and reports repeats on stop"""
+    print("Testing repeated render failures...")
+    
+    mailbox = LatestValueMailbox()
+    mailbox.publish('a')
+    
+    def broken(value, fresh):
+        raise ValueError("bad frame")
+    
+    renderer = RenderThread(broken, mailbox, fps=100)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        for _ in range(50):
+            renderer._frame()
+        renderer.stop()
+    
+    lines = output.getvalue().splitlines()
+    assert lines == ["Warning: Render failed (bad frame)",
+                     "Warning: 49 more render failures after the first"], f"Got {lines}"
+    assert renderer.get_stats()['render_errors'] == 50
+    
+    print("  ✓ One warning, 49 repeats reported on stop")
+    print()
+
+
+def test_engine_publishes_snapshots():
+    """Test that metric updates publish a self-contained snapshot"""
+    print("Testing engine snapshots...")
+    
+    engine = HonorHero(use_history=False)
+    engine.is_running = True
+    engine.pitch_analyzer.pitch_history.append({'frequency': 440.0, 'midi': 69, 'deviation': 0.0})
+    engine.update_metrics()
+    
+    snapshot, fresh = engine.snapshots.take()
+    assert fresh and 'honor_score' in snapshot and 'components' in snapshot
+    assert snapshot['pitch'] == {'frequency': 440.0, 'midi': 69, 'deviation': 0.0}
+    assert snapshot['pitch'] is not engine.pitch_analyzer.pitch_history[-1], "Pitch must be copied"
+    
+    print("  ✓ Snapshot carries metrics and latest pitch")
+    print()
+
+
+def test_piano_roll_renders_snapshots():
+    """Test that notes are recorded once per snapshot, not once per frame"""
+    print("Testing piano roll snapshot rendering...")
+    
+    import io
+    
+    ui = PianoRollUI()
+    ui.renderer.stream = io.StringIO()
+    snapshot = {'honor_score': 80, 'tier': 'Firme', 'components': {'dynamics': 90},
+                'pitch': {'frequency': 261.6, 'midi': 60}, 'time': time.time()}
+    
+    ui.render_snapshot(snapshot, True)
+    ui.render_snapshot(snapshot, False)
+    ui.render_snapshot(snapshot, False)
+    
+    assert len(ui.note_buffer) == 1 and ui.note_buffer[0]['midi'] == 60
+    assert list(ui.recent_scores) == [80]
+    assert ui.renderer.get_stats()['frames'] == 3, "Idle frames still redraw the roll"
+    
+    print("  ✓ One note per snapshot, one frame per tick")
+    print()
+
+
+def run_all_tests():
+    """Run all render loop tests"""
+    print("=" * 60)
+    print("HonorHero Render Loop Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_mailbox_keeps_latest()
+        test_render_thread_stats()
+        test_render_failures_do_not_flood()
+        test_engine_publishes_snapshots()
+        test_piano_roll_renders_snapshots()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,166 @@
+"""
+Tests for re-scoring the stored session history
+"""
+
+import sys
+import os
+import tempfile
+import sqlite3
+from contextlib import closing
+from unittest import mock
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import session_storage
+from rescore_history import make_sessions, rescore_history
+from scoring_system import ScoringSystem
+from session_history import SessionHistory
+
+NEW_WEIGHTS = {'pitch': 0.4, 'timing': 0.1, 'rhythm': 0.1, 'dynamics': 0.1, 'consistency': 0.3}
+
+
+def test_rescore_keeps_previous_versions():
+    """Test new scores, versioned old scores, aggregates and a no-op rerun"""
+    print("Testing history re-scoring...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.jsonl')
+        original = make_sessions(500)
+        SessionHistory(path).replace_sessions([dict(session) for session in original])
+        
+        history = SessionHistory(path)
+        stats = rescore_history(history, NEW_WEIGHTS)
+        assert stats['sessions'] == 500 and stats['changed'] == 500 and stats['written']
+        
+        scorer = ScoringSystem(NEW_WEIGHTS)
+        stored = SessionHistory(path).get_all_sessions()
+        for before, after in zip(original, stored):
+            expected = scorer.calculate_honor_score(after['components'])
+            assert abs(after['honor_score'] - expected['honor_score']) < 1e-9
+            assert after['tier'] == expected['tier'] and after['score_version'] == 1
+            assert after['previous_scores'] == [{
+                'version': 0,
+                'honor_score': before['honor_score'],
+                'tier': before['tier'],
+                'replaced_at': after['previous_scores'][0]['replaced_at']
+            }]
+        
+        statistics = SessionHistory(path).get_statistics()
+        average = sum(session['honor_score'] for session in stored) / len(stored)
+        assert abs(statistics['average_score'] - average) < 1e-9, "Aggregates rebuilt"
+        
+        again = rescore_history(SessionHistory(path), NEW_WEIGHTS)
+        assert again['changed'] == 0 and not again['written'], "Same weights, nothing to do"
+        
+        print(f"  ✓ {stats['changed']} re-scored, {stats['tier_changes']} tier changes")
+        print(f"  ✓ {stats['sessions_per_second']:,.0f} sessions/s")
+    print()
+
+
+def test_sqlite_columns_and_dry_run():
+    """Test the SQLite score columns and that a dry run writes nothing"""
+    print("Testing SQLite re-scoring and dry runs...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.db')
+        SessionHistory(path).replace_sessions(make_sessions(200))
+        
+        dry = rescore_history(SessionHistory(path), NEW_WEIGHTS, dry_run=True)
+        assert dry['changed'] == 200 and not dry['written']
+        assert 'score_version' not in SessionHistory(path).get_all_sessions()[0]
+        
+        rescore_history(SessionHistory(path), NEW_WEIGHTS)
+        sessions = SessionHistory(path).get_all_sessions()
+        with closing(sqlite3.connect(path)) as conn:
+            columns = conn.execute("SELECT honor_score, tier FROM sessions ORDER BY id").fetchall()
+        assert columns == [(s['honor_score'], s['tier']) for s in sessions], "Indexed columns follow"
+    
+    print("  ✓ Dry run leaves storage untouched, columns updated")
+    print()
+
+
+def test_failed_write_keeps_history():
+    """Test that a failed write-back leaves the original file in place"""
+    print("Testing atomic write-back...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.jsonl')
+        SessionHistory(path).replace_sessions(make_sessions(50))
+        with open(path, 'rb') as f:
+            before = f.read()
+        
+        with mock.patch.object(session_storage.os, 'replace', side_effect=OSError('disk full')):
+            try:
+                rescore_history(SessionHistory(path), NEW_WEIGHTS)
+                assert False, "The failure should be raised"
+            except OSError:
+                pass
+        
+        with open(path, 'rb') as f:
+            assert f.read() == before, "Original history intact"
+        assert sorted(os.listdir(tmp)) == ['sessions.jsonl', 'sessions.jsonl.stats.json'], "No temporary files left"
+    
+    print("  ✓ Error raised, history unchanged")
+    print()
+
+
+def test_stale_tier_is_corrected():
+    """Test that a tier from older tier rules is fixed even if the score is unchanged"""
+    print("Testing tier-only mismatches...")
+    
+    components = {'pitch': 79.5, 'timing': 79.5, 'rhythm': 79.5, 'dynamics': 79.5, 'consistency': 79.5}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.jsonl')
+        SessionHistory(path).replace_sessions([{
+            'timestamp': '2020-01-01T18:00:00',
+            'date': '2020-01-01',
+            'time': '18:00:00',
+            'honor_score': 79.5,
+            'tier': 'Fragmentado',
+            'components': components,
+            'duration': 300,
+            'notes': ''
+        }])
+        
+        stats = rescore_history(SessionHistory(path))
+        session = SessionHistory(path).get_all_sessions()[0]
+        expected = ScoringSystem().calculate_honor_score(components)
+        assert stats['changed'] == 1 and stats['tier_changes'] == 1, f"Got {stats}"
+        assert session['honor_score'] == 79.5 and session['tier'] == expected['tier'] == 'Firme'
+        assert session['previous_scores'][0]['tier'] == 'Fragmentado' and session['score_version'] == 1
+    
+    print("  ✓ 79.5 moved from Fragmentado to Firme")
+    print()
+
+
+def run_all_tests():
+    """Run all re-scoring tests"""
+    print("=" * 60)
+    print("HonorHero History Re-scoring Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_rescore_keeps_previous_versions()
+        test_sqlite_columns_and_dry_run()
+        test_failed_write_keeps_history()
+        test_stale_tier_is_corrected()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+    
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
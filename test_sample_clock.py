@@ -0,0 +1,147 @@
+"""
+Tests for sample-clock block timestamps
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sample_clock import SampleClock
+from honorhero import HonorHero
+
+
+def test_timestamps_follow_samples():
+    """Test that timestamps come from positions, not processing times"""
+    print("Testing sample clock timestamps...")
+    
+    clock = SampleClock(1000)
+    rng = np.random.default_rng(0)
+    times = []
+    for i in range(50):
+        # Processing happens 0-40 ms after the block was captured
+        wall = i * 0.1 + 0.5 + rng.uniform(0, 0.04)
+        times.append(clock.block_time(100, wall_time=wall))
+    
+    assert np.allclose(np.diff(times), 0.1), "Intervals are exactly one block"
+    assert clock.position == 5000
+    
+    stats = clock.get_stats()
+    assert stats['blocks'] == 50 and stats['sample_time'] == 4.9
+    assert stats['max_wall_drift_ms'] <= 40.0, "Constant latency is not drift"
+    assert stats['adc_time'] is None and stats['adc_drift_ms'] is None
+    
+    print(f"  ✓ Wall jitter up to {stats['max_wall_drift_ms']:.1f} ms, intervals exact")
+    print()
+
+
+def test_positions_and_adc_drift():
+    """Test explicit positions (with gaps) and ADC clock drift"""
+    print("Testing positions and ADC drift...")
+    
+    clock = SampleClock(1000)
+    assert clock.block_time(100, position=0, adc_time=50.0) == 0.0
+    # A dropped block leaves a gap in positions
+    assert clock.block_time(100, position=200, adc_time=50.2) == 0.2
+    # The device clock runs 1% fast relative to the sample count
+    clock.block_time(100, position=1000, adc_time=51.01)
+    
+    stats = clock.get_stats()
+    assert abs(stats['adc_drift_ms'] - 10.0) < 1e-6
+    assert abs(stats['adc_time'] - 1.01) < 1e-9, "ADC time on the performance origin"
+    assert clock.position == 1100
+    
+    clock.reset(2000)
+    assert clock.sample_rate == 2000 and clock.get_stats()['blocks'] == 0
+    
+    print(f"  ✓ ADC drift {stats['adc_drift_ms']:.1f} ms")
+    print()
+
+
+def test_engine_uses_sample_clock():
+    """Test that engine timestamps ignore when blocks are processed"""
+    print("Testing engine block timestamps...")
+    
+    engine = HonorHero(use_history=False)
+    engine.is_running = True
+    engine.start_time = time.time()
+    engine.clock.reset(22050)
+    
+    seen = []
+    original = engine.process_block
+    engine.process_block = lambda chunk, sr, t: (seen.append(t), original(chunk, sr, t))
+    
+    block = np.zeros(2048, dtype=np.float32)
+    for i in range(5):
+        engine._process_audio_chunk(block, 22050, position=i * 2048, adc_time=100.0 + i * 2048 / 22050)
+        time.sleep(0.002 * (i % 2))  # Irregular processing
+    
+    assert np.allclose(seen, np.arange(5) * 2048 / 22050), f"Got {seen}"
+    
+    engine.update_metrics()
+    clock = engine.get_current_status()['clock']
+    assert clock['blocks'] == 5 and abs(clock['adc_drift_ms']) < 1e-6
+    assert engine.get_clock_statistics()['sample_time'] == seen[-1]
+    
+    print(f"  ✓ {len(seen)} blocks stamped on the sample clock")
+    print()
+
+
+def test_stop_analyzes_drained_blocks():
+    """Test that blocks drained from the ring on stop are still analyzed"""
+    print("Testing drain on stop...")
+    
+    engine = HonorHero(use_history=False)
+    engine.is_running = True
+    engine.start_time = time.time()
+    engine.clock.reset(22050)
+    
+    seen = []
+    engine.process_block = lambda chunk, sr, t: seen.append(t)
+    block = np.zeros(2048, dtype=np.float32)
+    # The worker empties the ring while audio_capture.stop() waits for it
+    engine.audio_capture.stop = lambda: [
+        engine._process_audio_chunk(block, 22050, position=i * 2048) for i in range(3)
+    ]
+    engine.stop_performance()
+    
+    assert len(seen) == 3, f"Drained blocks were discarded: {seen}"
+    assert not engine.is_running
+    
+    print(f"  ✓ {len(seen)} drained blocks analyzed")
+    print()
+
+
+def run_all_tests():
+    """Run all sample clock tests"""
+    print("=" * 60)
+    print("HonorHero Sample Clock Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_timestamps_follow_samples()
+        test_positions_and_adc_drift()
+        test_engine_uses_sample_clock()
+        test_stop_analyzes_drained_blocks()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+    
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
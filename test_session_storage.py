@@ -0,0 +1,248 @@
+"""
+Tests for the pluggable session storage backends
+"""
+
+import sys
+import os
+import json
+import tempfile
+from unittest import mock
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from session_storage import get_storage, migrate_sessions, JSONStorage, JSONLStorage, SQLiteStorage
+from session_history import SessionHistory, SessionAggregates
+from datetime import datetime, timedelta
+
+
+def make_session(i: int) -> dict:
+    """Build a stored-session dictionary"""
+    return {
+        'timestamp': f'2024-03-{1 + i // 3:02d}T10:00:{i % 60:02d}',
+        'date': f'2024-03-{1 + i // 3:02d}',
+        'time': f'10:00:{i % 60:02d}',
+        'honor_score': 50 + i,
+        'tier': 'Inestable',
+        'components': {'pitch': 60 + i},
+        'duration': 120,
+        'notes': 'ñandú'
+    }
+
+
+def test_backends_round_trip():
+    """Test append, recent, by_date and replace on every backend"""
+    print("Testing storage backends...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, expected_class in [('s.json', JSONStorage), ('s.jsonl', JSONLStorage),
+                                     ('s.db', SQLiteStorage)]:
+            storage = get_storage(os.path.join(tmp, name))
+            assert isinstance(storage, expected_class), f"{name} picked {type(storage).__name__}"
+            
+            sessions = [make_session(i) for i in range(7)]
+            for session in sessions:
+                storage.append(session)
+            
+            assert storage.load_all() == sessions, f"{name}: round trip failed"
+            assert storage.count() == 7
+            assert storage.recent(2) == sessions[-2:], f"{name}: recent() should be oldest first"
+            assert storage.by_date('2024-03-02') == sessions[3:6]
+            
+            storage.replace_all(sessions[:2])
+            assert storage.load_all() == sessions[:2], f"{name}: replace_all failed"
+            print(f"  ✓ {expected_class.__name__}")
+    print()
+
+
+def test_jsonl_is_append_only_and_tolerant():
+    """Test that JSONL appends lines and skips a torn last line"""
+    print("Testing JSONL append-only behavior...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.jsonl')
+        history = SessionHistory(path)
+        history.add_session({'final_honor_score': 70, 'tier': 'Firme', 'components': {}})
+        history.add_session({'final_honor_score': 80, 'tier': 'Íntegro', 'components': {}})
+        
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"honor_score": 9')  # Interrupted write
+        
+        with open(path, encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == 3, "Each session should be one line"
+        
+        reloaded = SessionHistory(path)
+        assert [s['honor_score'] for s in reloaded.get_recent_sessions(5)] == [70, 80]
+        assert reloaded.compare_with_previous(85, {})['last_score'] == 80
+    
+    print("  ✓ One line per session, torn line ignored")
+    print()
+
+
+def test_migration():
+    """Test explicit and automatic migration from sessions.json"""
+    print("Testing migration from JSON...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'sessions.json')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump([make_session(i) for i in range(4)], f, indent=2)
+        
+        count = migrate_sessions(legacy, os.path.join(tmp, 'sessions.db'))
+        assert count == 4
+        assert migrate_sessions(legacy, os.path.join(tmp, 'sessions.db')) == 4
+        assert get_storage(os.path.join(tmp, 'sessions.db')).count() == 4, "Re-running must not duplicate"
+        
+        # Default location migrates ~/.honorhero/sessions.json once
+        home = os.path.join(tmp, 'home')
+        os.makedirs(os.path.join(home, '.honorhero'))
+        os.replace(legacy, os.path.join(home, '.honorhero', 'sessions.json'))
+        saved_home = os.environ.get('HOME')
+        os.environ['HOME'] = home
+        try:
+            history = SessionHistory()
+        finally:
+            if saved_home is None:
+                del os.environ['HOME']
+            else:
+                os.environ['HOME'] = saved_home
+        
+        assert history.storage_path.name == 'sessions.jsonl'
+        assert len(history.sessions) == 4, "Default history should be migrated"
+        assert os.path.exists(os.path.join(home, '.honorhero', 'sessions.json')), "Original is kept"
+    
+    print("  ✓ Explicit and automatic migration")
+    print()
+
+
+def test_persistent_aggregates():
+    """Test that statistics come from persisted aggregates, not a rescan"""
+    print("Testing persistent aggregates...")
+    
+    today = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ['sessions.jsonl', 'sessions.db']:
+            added = SessionHistory(os.path.join(tmp, 'added-' + name))
+            added.add_session({'final_honor_score': 65, 'tier': 'Firme', 'components': {}, 'duration': 30})
+            added.add_session({'final_honor_score': 85, 'tier': 'Íntegro', 'components': {}, 'duration': 30})
+            added_stats = SessionHistory(os.path.join(tmp, 'added-' + name)).get_statistics()
+            assert added_stats['total_sessions'] == 2 and added_stats['average_score'] == 75
+            assert added_stats['current_streak'] == 1
+            
+            path = os.path.join(tmp, name)
+            history = SessionHistory(path)
+            
+            # Practice on the last 4 days, then a gap, then older sessions
+            sessions = []
+            for i, days_ago in enumerate([0, 0, 1, 2, 3, 5, 6, 9]):
+                day = today - timedelta(days=days_ago)
+                sessions.append({
+                    'timestamp': day.isoformat(),
+                    'date': day.strftime('%Y-%m-%d'),
+                    'time': day.strftime('%H:%M:%S'),
+                    'honor_score': 40 + 7 * i,
+                    'tier': 'Firme' if i % 3 else 'Inestable',
+                    'components': {},
+                    'duration': 60 * (i + 1),
+                    'notes': ''
+                })
+            for session in reversed(sessions):
+                history.storage.append(session)
+            
+            # First open builds and persists the aggregates, later opens reuse them
+            SessionHistory(path).get_statistics()
+            reopened = SessionHistory(path)
+            stats = reopened.get_statistics()
+            assert reopened._sessions is None, f"{name}: statistics should not load the history"
+            
+            scores = [s['honor_score'] for s in sessions]
+            assert stats['total_sessions'] == 8
+            assert stats['average_score'] == sum(scores) / 8
+            assert stats['highest_score'] == max(scores) and stats['lowest_score'] == min(scores)
+            assert stats['total_practice_time'] == sum(s['duration'] for s in sessions)
+            assert stats['current_streak'] == 4, f"{name}: expected streak 4, got {stats['current_streak']}"
+            assert stats['most_common_tier'] == 'Firme'
+            
+            # A change made behind our back invalidates the persisted aggregates
+            get_storage(path).append(dict(sessions[0], honor_score=100))
+            assert SessionHistory(path).get_statistics()['highest_score'] == 100, f"{name}: should rebuild"
+            print(f"  ✓ {name}: {stats['total_sessions']} sessions, streak {stats['current_streak']}")
+    print()
+
+
+def test_two_writers_keep_aggregates_complete():
+    """Test that sessions appended by another writer are counted"""
+    print("Testing two writers on one history...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ['sessions.jsonl', 'sessions.db']:
+            path = os.path.join(tmp, name)
+            first = SessionHistory(path)
+            second = SessionHistory(path)
+            first.add_session({'final_honor_score': 50, 'tier': 'Inestable'})
+            second.get_statistics()
+            first.add_session({'final_honor_score': 70, 'tier': 'Firme'})
+            second.add_session({'final_honor_score': 90, 'tier': 'Íntegro'})
+            
+            for history in [second, SessionHistory(path)]:
+                stats = history.get_statistics()
+                assert stats['total_sessions'] == 3, f"{name}: got {stats['total_sessions']} sessions"
+                assert stats['average_score'] == 70.0, f"{name}: got average {stats['average_score']}"
+            
+            # A failed append leaves the aggregates alone
+            with mock.patch.object(second.storage, 'append', side_effect=IOError('disk full')):
+                second.add_session({'final_honor_score': 10, 'tier': 'Fragmentado'})
+            assert second.get_statistics()['total_sessions'] == 3
+            assert SessionHistory(path).get_statistics()['total_sessions'] == 3
+            print(f"  ✓ {name}: 3 sessions from two writers, failed append not counted")
+    print()
+
+
+def test_streak_requires_recent_practice():
+    """Test that a streak ending before yesterday counts as zero"""
+    print("Testing streak boundaries...")
+    
+    aggregates = SessionAggregates()
+    for date in ['2024-01-01', '2024-01-02', '2024-01-03']:
+        aggregates.add({'honor_score': 50, 'tier': 'Inestable', 'date': date})
+    
+    assert aggregates.current_streak(datetime(2024, 1, 3).date()) == 3
+    assert aggregates.current_streak(datetime(2024, 1, 4).date()) == 3
+    assert aggregates.current_streak(datetime(2024, 1, 5).date()) == 0
+    
+    print("  ✓ Streak counts from today or yesterday only")
+    print()
+
+
+def run_all_tests():
+    """Run all session storage tests"""
+    print("=" * 60)
+    print("HonorHero Session Storage Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_backends_round_trip()
+        test_jsonl_is_append_only_and_tolerant()
+        test_migration()
+        test_persistent_aggregates()
+        test_two_writers_keep_aggregates_complete()
+        test_streak_requires_recent_practice()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+"""
+Tests for the librosa-free note conversions and lazy startup imports
+"""
+
+import subprocess
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import note_utils
+from piano_roll_ui import PianoRollUI
+from benchmark_startup import parse_importtime
+
+
+def test_note_conversions():
+    """Test note conversions against librosa"""
+    print("Testing note conversions...")
+    
+    import librosa
+    
+    for midi in range(12, 120):
+        name = note_utils.midi_to_note(midi)
+        assert name == librosa.midi_to_note(midi, unicode=False), f"Name mismatch for {midi}"
+        assert note_utils.note_to_midi(name) == midi, f"Round trip failed for {name}"
+        assert abs(note_utils.midi_to_hz(midi) - librosa.midi_to_hz(midi)) < 1e-6
+    
+    for frequency in [32.7, 110.0, 261.63, 440.0, 1046.5, 3951.07]:
+        assert abs(note_utils.hz_to_midi(frequency) - librosa.hz_to_midi(frequency)) < 1e-9
+    
+    assert note_utils.note_to_midi('Bb2') == note_utils.note_to_midi('A#2') == 46
+    assert note_utils.note_to_midi('C♯4') == 61
+    assert abs(note_utils.note_to_hz('A4') - 440.0) < 1e-9
+    
+    try:
+        note_utils.note_to_midi('H2')
+        assert False, "Invalid note names should raise"
+    except ValueError:
+        pass
+    
+    print("  ✓ Conversions match librosa")
+    print()
+
+
+def test_sharp_notes_reach_piano_roll():
+    """Test that sharp note names map onto piano roll rows"""
+    print("Testing sharp note rows...")
+    
+    ui = PianoRollUI()
+    name = note_utils.midi_to_note(round(note_utils.hz_to_midi(277.18)))
+    assert name == 'C#4', f"Got {name}"
+    row = ui.get_note_row(name)
+    assert row == ui.get_note_row('C4') - 1, "C#4 should sit one row above C4"
+    
+    print(f"  ✓ {name} -> row {row}")
+    print()
+
+
+def test_entry_points_skip_heavy_imports():
+    """Test that importing the UIs does not load librosa or sounddevice"""
+    print("Testing lazy imports...")
+    
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module in ['ui', 'piano_roll_ui', 'view_stats']:
+        code = (f"import sys; import {module}; "
+                "print(','.join(m for m in ('librosa', 'sounddevice', 'soundfile') if m in sys.modules))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, cwd=here, check=True)
+        loaded = result.stdout.strip()
+        assert loaded == '', f"{module} loaded {loaded}"
+        print(f"  ✓ {module}: no heavy imports")
+    print()
+
+
+def test_parse_importtime():
+    """Test attribution of -X importtime output to the probed module"""
+    print("Testing importtime parsing...")
+    
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |   certifi",
+        "import time:        10 |        110 | site",
+        "import time:       500 |        500 |     numpy.core",
+        "import time:       200 |        700 |   numpy",
+        "import time:        50 |         50 |   config",
+        "import time:        20 |        770 | honorhero",
+    ])
+    totals = parse_importtime(stderr, 'honorhero')
+    assert totals == {'numpy': 700, 'config': 50}, f"Got {totals}"
+    
+    print("  ✓ Direct dependencies attributed")
+    print()
+
+
+def run_all_tests():
+    """Run all startup tests"""
+    print("=" * 60)
+    print("HonorHero Startup Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_note_conversions()
+        test_sharp_notes_reach_piano_roll()
+        test_entry_points_skip_heavy_imports()
+        test_parse_importtime()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
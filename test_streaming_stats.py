@@ -0,0 +1,253 @@
+"""
+Tests for streaming statistics and the constant-time analyzer averages
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from streaming_stats import RunningMean, RunningExtrema, RunningMoments, SlidingWindowRange
+from pitch_analyzer import PitchAnalyzer
+from dynamics_analyzer import DynamicsAnalyzer
+from consistency_analyzer import ConsistencyAnalyzer
+from timing_analyzer import TimingAnalyzer
+
+
+def test_running_mean():
+    """Test plain and decayed running means"""
+    print("Testing RunningMean...")
+    
+    values = [10, 20, 30, 40, 100]
+    
+    stats = RunningMean()
+    for v in values:
+        stats.add(v)
+    assert abs(stats.mean - np.mean(values)) < 1e-9, "Mean should match numpy"
+    assert stats.recent_mean == stats.mean, "Without decay recent mean is the mean"
+    
+    decayed = RunningMean(decay=0.5)
+    for v in values:
+        decayed.add(v)
+    # 10 -> 15 -> 22.5 -> 31.25 -> 65.625
+    assert abs(decayed.recent_mean - 65.625) < 1e-9, f"Got {decayed.recent_mean}"
+    
+    decayed.reset()
+    assert decayed.mean is None and decayed.recent_mean is None, "Reset should clear"
+    
+    print(f"  ✓ Mean: {stats.mean:.2f}")
+    print("  ✓ Decayed mean follows recent values")
+    print()
+
+
+def test_pitch_average_is_incremental():
+    """Test that the pitch average matches a full recomputation"""
+    print("Testing PitchAnalyzer running average...")
+    
+    analyzer = PitchAnalyzer(history_size=3)
+    sample_rate = 22050
+    t = np.arange(2048) / sample_rate
+    
+    # Slightly detuned tones so scores differ
+    scores = []
+    for freq in [440, 445, 452, 460, 430]:
+        result = analyzer.analyze(0.5 * np.sin(2 * np.pi * freq * t), sample_rate)
+        if result['detected']:
+            scores.append(result['score'])
+    
+    assert len(analyzer.pitch_history) == 3, "Raw history should be bounded"
+    assert analyzer.score_stats.count == 5 == len(scores), "Accumulator should see every detection"
+    expected = float(np.mean(scores))
+    assert abs(analyzer.get_average_score() - expected) < 1e-9, \
+        f"Expected {expected}, got {analyzer.get_average_score()}"
+    
+    analyzer.reset()
+    assert analyzer.get_average_score() == 50.0, "Empty analyzer should be neutral"
+    
+    print("  ✓ History bounded, accumulator complete")
+    print()
+
+
+def test_sliding_window_range():
+    """Test monotonic-deque window extrema against brute force"""
+    print("Testing SlidingWindowRange...")
+    
+    rng = np.random.default_rng(0)
+    values = rng.normal(-30, 10, size=500).astype(np.float32)
+    
+    window = SlidingWindowRange(capacity=25)
+    extrema = RunningExtrema()
+    for i, v in enumerate(values):
+        window.add(v)
+        extrema.add(float(v))
+        recent = values[max(0, i - 24):i + 1]
+        assert window.maximum == float(recent.max()), f"Max mismatch at {i}"
+        assert window.minimum == float(recent.min()), f"Min mismatch at {i}"
+    
+    assert len(window) == 25, "Window should stay at capacity"
+    assert abs(extrema.range - float(values.max() - values.min())) < 1e-4
+    
+    print(f"  ✓ Window range: {window.range:.2f} dB")
+    print(f"  ✓ Session range: {extrema.range:.2f} dB")
+    print()
+
+
+def test_dynamics_range_modes():
+    """Test whole-session and windowed dynamic range in DynamicsAnalyzer"""
+    print("Testing DynamicsAnalyzer dynamic range...")
+    
+    session = DynamicsAnalyzer(history_size=10)
+    windowed = DynamicsAnalyzer(window_seconds=1.0)
+    
+    # One loud block followed by a long quiet passage
+    loud = np.full(2048, 0.5)
+    quiet = np.full(2048, 0.05)
+    for chunk in [loud] + [quiet] * 40:
+        session.analyze(chunk)
+        windowed.analyze(chunk)
+    
+    assert len(session.db_history) == 10, "History should be bounded"
+    assert abs(session.get_dynamic_range() - 20.0) < 1e-6, "Session range should remember the loud block"
+    assert windowed.get_dynamic_range() < 1e-3, "Window should have forgotten the loud block"
+    
+    print(f"  ✓ Session range: {session.get_dynamic_range():.1f} dB")
+    print(f"  ✓ Windowed range: {windowed.get_dynamic_range():.1f} dB")
+    print()
+
+
+def test_running_moments():
+    """Test Welford mean/std in cumulative, window and decay modes"""
+    print("Testing RunningMoments...")
+    
+    rng = np.random.default_rng(1)
+    values = rng.normal(70, 12, size=400)
+    
+    session = RunningMoments()
+    window = RunningMoments(window=30)
+    for i, v in enumerate(values):
+        session.add(v)
+        window.add(v)
+        recent = values[max(0, i - 29):i + 1]
+        assert abs(window.mean - recent.mean()) < 1e-9, f"Window mean mismatch at {i}"
+        assert abs(window.std - recent.std()) < 1e-9, f"Window std mismatch at {i}"
+    
+    assert abs(session.mean - values.mean()) < 1e-9 and abs(session.std - values.std()) < 1e-9
+    assert window.count == 30 and window.total == 400
+    
+    # Decay: weights decay * (1 - decay)^age, the first value keeps the rest
+    decay = 0.2
+    decayed = RunningMoments(decay=decay)
+    for v in values[:50]:
+        decayed.add(v)
+    weights = decay * (1 - decay) ** np.arange(49)[::-1]
+    weights = np.concatenate(([(1 - decay) ** 49], weights))
+    mean = np.sum(weights * values[:50])
+    assert abs(decayed.mean - mean) < 1e-9
+    assert abs(decayed.variance - np.sum(weights * (values[:50] - mean) ** 2)) < 1e-9
+    
+    for bad in [dict(window=0), dict(decay=0), dict(window=5, decay=0.5)]:
+        try:
+            RunningMoments(**bad)
+            assert False, f"Should reject {bad}"
+        except ValueError:
+            pass
+    
+    window.reset()
+    assert window.mean is None and window.variance == 0.0
+    
+    print(f"  ✓ Session std: {session.std:.2f}, window std: {recent.std():.2f}")
+    print("  ✓ Decayed moments match explicit weights")
+    print()
+
+
+def test_consistency_window_follows_recent_playing():
+    """Test that windowed consistency forgets an erratic start"""
+    print("Testing ConsistencyAnalyzer window mode...")
+    
+    session = ConsistencyAnalyzer()
+    recent = ConsistencyAnalyzer(window=20)
+    decayed = ConsistencyAnalyzer(decay=0.2)
+    for i in range(100):
+        # Wild swings for 40 updates, then steady playing
+        score = 20 + 60 * (i % 2) if i < 40 else 80
+        for analyzer in (session, recent, decayed):
+            analyzer.add_metrics(score, score, score, score)
+    
+    assert recent.analyze()['overall_consistency'] == 1.0, "Window only sees steady playing"
+    assert decayed.analyze()['overall_consistency'] > 0.99
+    assert session.analyze()['overall_consistency'] < 0.8, "Whole session remembers the start"
+    
+    print(f"  ✓ Session: {session.analyze()['overall_consistency']:.2f}, "
+          f"window: {recent.analyze()['overall_consistency']:.2f}")
+    print()
+
+
+def test_timing_statistics_are_incremental():
+    """Test that timing/rhythm scores match a recomputation over the intervals"""
+    print("Testing TimingAnalyzer running interval statistics...")
+    
+    rng = np.random.default_rng(2)
+    onsets = np.cumsum(np.concatenate((rng.uniform(0.15, 1.2, 30), np.full(20, 0.5))))
+    loud = np.full(64, 0.5)
+    
+    session = TimingAnalyzer(onset_detector='energy')
+    recent = TimingAnalyzer(onset_detector='energy', rhythm_window=10)
+    for t in onsets:
+        session.detect_onset(loud, 22050, t)
+        recent.detect_onset(loud, 22050, t)
+    
+    intervals = np.diff(onsets)
+    timing = session.analyze_timing()
+    assert abs(timing['average_interval'] - intervals.mean()) < 1e-9
+    assert abs(timing['timing_variance'] - intervals.std()) < 1e-9
+    
+    cv = intervals.std() / intervals.mean()
+    expected = 100 if cv <= session.rhythm_tolerance else max(0, 100 - (cv - session.rhythm_tolerance) * 150)
+    assert abs(session.analyze_rhythm()['score'] - expected) < 1e-9
+    
+    assert recent.analyze_rhythm()['consistency'] > 0.999, "Window sees only the steady end"
+    assert len(recent.intervals) == 49, "History is still recorded in full"
+    
+    recent.reset()
+    assert recent.analyze_rhythm()['score'] == 50, "Reset clears the statistics"
+    
+    print(f"  ✓ Session rhythm score: {session.analyze_rhythm()['score']:.1f}")
+    print("  ✓ Windowed rhythm follows the last 10 intervals")
+    print()
+
+
+def run_all_tests():
+    """Run all streaming statistics tests"""
+    print("=" * 60)
+    print("HonorHero Streaming Statistics Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_running_mean()
+        test_pitch_average_is_incremental()
+        test_sliding_window_range()
+        test_dynamics_range_modes()
+        test_running_moments()
+        test_consistency_window_follows_recent_playing()
+        test_timing_statistics_are_incremental()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,168 @@
+"""
+Tests for the differential terminal renderer
+"""
+
+import io
+import re
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from terminal_renderer import TerminalRenderer, parse_line, WIDE_FILLER
+from piano_roll_ui import PianoRollUI
+
+CURSOR_MOVE = re.compile(r'\033\[(\d+);(\d+)H')
+
+
+def new_writes(renderer: TerminalRenderer, lines) -> str:
+    """Render a frame and return only what it wrote"""
+    before = len(renderer.stream.getvalue())
+    renderer.render(lines)
+    return renderer.stream.getvalue()[before:]
+
+
+def test_parse_line():
+    """Test splitting styled lines into terminal cells"""
+    print("Testing line parsing...")
+    
+    cells = parse_line('\033[31mab\033[0mc')
+    assert cells == [('\033[31m', 'a'), ('\033[31m', 'b'), ('', 'c')], f"Got {cells}"
+    
+    # Wide characters take two columns, variation selectors none
+    cells = parse_line('a🎵b✨️')
+    assert len(cells) == 6, f"Got {cells}"
+    assert cells[2] == WIDE_FILLER and cells[4] == ('', '✨️')
+    
+    print("  ✓ Styles tracked per cell")
+    print("  ✓ Wide characters occupy two cells")
+    print()
+
+
+def test_unchanged_frame_is_cheap():
+    """Test that repeating a frame writes almost nothing"""
+    print("Testing unchanged frames...")
+    
+    renderer = TerminalRenderer(io.StringIO())
+    frame = ['\033[32m' + 'x' * 80 + '\033[0m'] * 40
+    first = renderer.render(frame)
+    second = renderer.render(frame)
+    
+    assert first > 3200, "First frame is drawn in full"
+    assert second < 16, f"Unchanged frame wrote {second} bytes"
+    
+    stats = renderer.get_stats()
+    assert stats['frames'] == 2 and stats['full_redraws'] == 1
+    assert stats['bytes_total'] == first + second
+    
+    print(f"  ✓ Full frame: {first} bytes, unchanged frame: {second} bytes")
+    print()
+
+
+def test_changed_cells_only():
+    """Test that only changed cells are rewritten at the right position"""
+    print("Testing changed cells...")
+    
+    renderer = TerminalRenderer(io.StringIO())
+    renderer.render(['hello world', 'second line', 'third'])
+    
+    written = new_writes(renderer, ['hello World', 'second line', 'third'])
+    moves = CURSOR_MOVE.findall(written)
+    assert ('1', '7') in moves, f"Should jump to the changed cell, got {moves}"
+    assert 'World' not in written and 'W' in written, "Only the changed cell is sent"
+    assert 'second' not in written
+    
+    # Shorter rows are cleared to the end of line, missing rows erased
+    written = new_writes(renderer, ['hello', 'second line'])
+    assert '\033[1;6H\033[K' in written, f"Got {written!r}"
+    assert '\033[3;1H\033[2K' in written, f"Got {written!r}"
+    
+    # Styles are re-applied for changed styled cells
+    written = new_writes(renderer, ['hello', 'second \033[31mline\033[0m'])
+    assert '\033[31mline' in written and written.count('\033[0m') >= 1
+    
+    print("  ✓ Cursor positioned on changed cells")
+    print("  ✓ Shrinking frames cleared")
+    print()
+
+
+def test_wide_character_changes():
+    """Test redrawing over wide characters"""
+    print("Testing wide character diffs...")
+    
+    renderer = TerminalRenderer(io.StringIO())
+    renderer.render(['ab🎵cd'])
+    written = new_writes(renderer, ['ab🎶cd'])
+    assert '\033[1;3H🎶' in written, f"Got {written!r}"
+    
+    written = new_writes(renderer, ['abxycd'])
+    assert '\033[1;3Hxy' in written, f"Got {written!r}"
+    
+    print("  ✓ Wide characters replaced in place")
+    print()
+
+
+def test_piano_roll_uses_renderer():
+    """Test that the piano roll writes one frame per display call"""
+    print("Testing piano roll rendering...")
+    
+    import time
+    
+    class CountingStream(io.StringIO):
+        writes = 0
+        
+        def write(self, data):
+            CountingStream.writes += 1
+            return super().write(data)
+    
+    ui = PianoRollUI()
+    ui.renderer.stream = CountingStream()
+    metrics = {'honor_score': 75, 'tier': 'Firme', 'components': {'pitch': 80}}
+    
+    for i in range(5):
+        ui.note_buffer.append({'timestamp': time.time(), 'midi': 60 + i, 'frequency': 261.6,
+                               'score': 80, 'velocity': 0.7})
+        ui.last_update_time = 0
+        ui.display_frame(metrics)
+    
+    stats = ui.renderer.get_stats()
+    assert CountingStream.writes == 5, f"Expected one write per frame, got {CountingStream.writes}"
+    assert stats['frames'] == 5 and stats['full_redraws'] == 1
+    assert stats['bytes_last_frame'] < stats['bytes_total'] / 5, "Later frames should be diffs"
+    
+    print(f"  ✓ {stats['bytes_per_frame']:.0f} bytes/frame on average")
+    print()
+
+
+def run_all_tests():
+    """Run all terminal renderer tests"""
+    print("=" * 60)
+    print("HonorHero Terminal Renderer Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_parse_line()
+        test_unchanged_frame_is_cheap()
+        test_changed_cells_only()
+        test_wide_character_changes()
+        test_piano_roll_uses_renderer()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
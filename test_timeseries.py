@@ -0,0 +1,142 @@
+"""
+Tests for the compact time-series container and bounded analyzer histories
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from timeseries import TimeSeries
+from timing_analyzer import TimingAnalyzer
+from consistency_analyzer import ConsistencyAnalyzer
+from scoring_system import ScoringSystem
+
+
+def test_growable_series():
+    """Test an unbounded series behaves like a list"""
+    print("Testing growable series...")
+    
+    series = TimeSeries(initial_size=2)
+    assert len(series) == 0 and not series, "Starts empty"
+    series.extend([1.0, 2.0, 3.0, 4.0, 5.0])
+    
+    assert len(series) == 5 and series[0] == 1.0 and series[-1] == 5.0
+    assert list(series) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert np.mean(series) == 3.0, "NumPy reductions work directly"
+    assert list(series[1:3]) == [2.0, 3.0], "Slices return arrays"
+    assert isinstance(series[-1], float), "Elements come back as Python floats"
+    
+    try:
+        series[5]
+        assert False, "Out of range should raise"
+    except IndexError:
+        pass
+    
+    print("  ✓ Grows on demand, list-like access")
+    print()
+
+
+def test_ring_series():
+    """Test a bounded series keeps only the newest entries"""
+    print("Testing ring series...")
+    
+    series = TimeSeries(capacity=4, dtype=np.float32)
+    for i in range(10):
+        series.append(i)
+    
+    assert len(series) == 4 and series.total == 10
+    assert list(series) == [6.0, 7.0, 8.0, 9.0], f"Got {list(series)}"
+    assert series[0] == 6.0 and series[-2] == 8.0
+    assert np.array_equal(np.asarray(series), [6, 7, 8, 9])
+    assert series.nbytes == 16, "Four float32 slots"
+    
+    series.clear()
+    assert len(series) == 0 and series.total == 0
+    series.append(1.5)
+    assert list(series) == [1.5]
+    
+    print("  ✓ Oldest entries evicted in order")
+    print()
+
+
+def test_record_series():
+    """Test structured records round-trip as dicts"""
+    print("Testing record series...")
+    
+    series = TimeSeries(capacity=3, dtype=[('frequency', np.float32), ('midi', np.int16)])
+    for midi in range(60, 65):
+        series.append({'frequency': 440.0, 'midi': midi})
+    
+    assert series[-1] == {'frequency': 440.0, 'midi': 64}
+    assert isinstance(series[-1]['midi'], int)
+    assert list(series.column('midi')) == [62, 63, 64]
+    
+    print("  ✓ Records stored as columns, read back as dicts")
+    print()
+
+
+def test_analyzer_histories_are_bounded():
+    """Test that long sessions keep memory fixed"""
+    print("Testing bounded analyzer histories...")
+    
+    timing = TimingAnalyzer(history_size=100, onset_detector='energy')
+    loud = np.full(64, 0.5)
+    for i in range(1000):
+        timing.detect_onset(loud, 22050, i * 0.5)
+    assert len(timing.onset_times) == 100 and len(timing.intervals) == 100
+    assert timing.onset_times[-1] == 499.5
+    assert timing.analyze_rhythm()['score'] == 100, "Perfectly regular onsets"
+    
+    consistency = ConsistencyAnalyzer(history_size=50)
+    for i in range(500):
+        consistency.add_metrics(80, 70, 60, 50)
+    assert all(len(values) == 50 for values in consistency.metric_history.values())
+    assert consistency.analyze()['overall_consistency'] == 1.0
+    
+    scoring = ScoringSystem(history_size=20)
+    for score in range(100):
+        scoring.calculate_honor_score({name: score for name in scoring.weights})
+    summary = scoring.get_progress_summary()
+    assert len(scoring.score_history) == 20
+    assert summary['total_evaluations'] == 100, "Count covers the whole session"
+    assert abs(summary['average_score'] - 49.5) < 1e-6, "Average covers the whole session"
+    assert summary['current_tier'] == 'Íntegro' and summary['trend'] == 'Mejorando'
+    
+    print("  ✓ Timing, consistency and score histories bounded")
+    print("  ✓ Session totals still exact")
+    print()
+
+
+def run_all_tests():
+    """Run all time-series tests"""
+    print("=" * 60)
+    print("HonorHero Time Series Tests")
+    print("=" * 60)
+    print()
+    
+    try:
+        test_growable_series()
+        test_ring_series()
+        test_record_series()
+        test_analyzer_histories_are_bounded()
+        
+        print("=" * 60)
+        print("✅ All tests passed!")
+        print("=" * 60)
+        return True
+        
+    except Exception as e:
+        print("=" * 60)
+        print(f"❌ Test failed: {e}")
+        print("=" * 60)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
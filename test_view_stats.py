@@ -51,6 +51,11 @@ def test_get_tier_for_score():
     assert get_tier_for_score(40) == "Inestable"
     assert get_tier_for_score(39) == "Fragmentado"
     
+    # Fractional scores between the integer ranges
+    assert get_tier_for_score(79.5) == "Firme"
+    assert get_tier_for_score(39.9) == "Fragmentado"
+    assert get_tier_for_score(101) == "N/A"
+    
     print("  ✓ Tier calculation works correctly")
     print(f"    85 -> {get_tier_for_score(85)}")
     print(f"    70 -> {get_tier_for_score(70)}")
@@ -0,0 +1,125 @@
+"""
+Time Series Module
+Compact NumPy-backed histories with optional ring-buffer capacity
+"""
+
+import numpy as np
+from typing import Optional, Union
+
+
+class TimeSeries:
+    """
+    Append-only history stored in a preallocated NumPy array
+    
+    Without a capacity the array grows geometrically; with a capacity it
+    becomes a ring that keeps only the most recent entries, so memory stays
+    fixed however long a session runs.
+    
+    A plain dtype holds one number per entry. A structured dtype (a list of
+    (name, type) fields) holds records: appending takes a dict and indexing
+    returns a dict of Python scalars, like the lists of dicts it replaces.
+    Indexing, len(), iteration and np.asarray() work as with a list.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None,
+                 dtype: Union[str, list, np.dtype] = np.float64,
+                 initial_size: int = 256):
+        """
+        Args:
+            capacity: Maximum entries kept (None = unbounded)
+            dtype: Element type, or a list of (name, type) fields for records
+            initial_size: Starting allocation when unbounded
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self.fields = self.dtype.names
+        size = capacity if capacity is not None else max(1, initial_size)
+        self._data = np.zeros(size, dtype=self.dtype)
+        self._start = 0   # Index of the oldest entry (ring mode)
+        self._length = 0
+        self.total = 0    # Entries ever appended, including overwritten ones
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def append(self, value):
+        """Add an entry (a dict for record series), evicting the oldest if full"""
+        if self.capacity is None:
+            if self._length == len(self._data):
+                grown = np.zeros(len(self._data) * 2, dtype=self.dtype)
+                grown[:self._length] = self._data
+                self._data = grown
+            index = self._length
+            self._length += 1
+        elif self._length < self.capacity:
+            index = (self._start + self._length) % self.capacity
+            self._length += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        
+        if self.fields:
+            self._data[index] = tuple(value.get(name, 0) for name in self.fields)
+        else:
+            self._data[index] = value
+        self.total += 1
+    
+    def extend(self, values):
+        """Append several entries"""
+        for value in values:
+            self.append(value)
+    
+    def _position(self, index: int) -> int:
+        """Storage index of a logical (possibly negative) index"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("TimeSeries index out of range")
+        if self.capacity is None:
+            return index
+        return (self._start + index) % self.capacity
+    
+    def _convert(self, item):
+        """Turn a stored element into Python scalars"""
+        if self.fields:
+            return {name: item[name].item() for name in self.fields}
+        return item.item()
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.values()[index]
+        return self._convert(self._data[self._position(index)])
+    
+    def __iter__(self):
+        for item in self.values():
+            yield self._convert(item)
+    
+    def values(self) -> np.ndarray:
+        """Entries in order, oldest first (a view when no wrap-around)"""
+        if self.capacity is None or self._start + self._length <= self.capacity:
+            return self._data[self._start:self._start + self._length]
+        return np.concatenate((self._data[self._start:], self._data[:self._start + self._length - self.capacity]))
+    
+    def column(self, name: str) -> np.ndarray:
+        """One field of a record series, oldest first"""
+        return self.values()[name]
+    
+    def __array__(self, dtype=None, copy=None):
+        values = self.values()
+        return values.astype(dtype) if dtype is not None else values
+    
+    def clear(self):
+        """Remove all entries (keeps the allocation)"""
+        self._start = 0
+        self._length = 0
+        self.total = 0
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for entries"""
+        return self._data.nbytes
+    
+    def __repr__(self) -> str:
+        return f"TimeSeries(len={self._length}, capacity={self.capacity}, dtype={self.dtype})"
@@ -4,19 +4,42 @@ Analyzes timing accuracy and rhythm consistency
 """
 
 import numpy as np
-from typing import List
+from typing import List, Optional, Union
 import config
+from feature_extractor import FeatureFrame
+from onset_detector import OnsetDetector, get_onset_detector
+from streaming_stats import RunningMoments
+from timeseries import TimeSeries
 
 
 class TimingAnalyzer:
-    """Analyzes timing and rhythm with tolerant thresholds"""
+    """
+    Analyzes timing and rhythm with tolerant thresholds
+    
+    Interval mean and spread are kept in a running accumulator as onsets
+    arrive, so the timing and rhythm scores can be queried at any rate
+    without touching the interval history.
+    """
     
     def __init__(self, timing_tolerance: float = config.TIMING_TOLERANCE,
-                 rhythm_tolerance: float = config.RHYTHM_TOLERANCE):
+                 rhythm_tolerance: float = config.RHYTHM_TOLERANCE,
+                 history_size: Optional[int] = config.TIMING_HISTORY_SIZE,
+                 onset_detector: Union[str, OnsetDetector] = None,
+                 rhythm_window: Optional[int] = config.RHYTHM_WINDOW):
+        """
+        Args:
+            timing_tolerance: Interval standard deviation (s) that still scores 100
+            rhythm_tolerance: Interval coefficient of variation that still scores 100
+            history_size: Onsets/intervals kept (None = unbounded)
+            onset_detector: Detector name or instance (default: config.ONSET_DETECTOR)
+            rhythm_window: Score only the last N intervals (None = whole session)
+        """
         self.timing_tolerance = timing_tolerance
         self.rhythm_tolerance = rhythm_tolerance
-        self.onset_times = []
-        self.intervals = []
+        self.onset_detector = get_onset_detector(onset_detector)
+        self.onset_times = TimeSeries(history_size)
+        self.intervals = TimeSeries(history_size)
+        self.interval_stats = RunningMoments(window=rhythm_window)
         
     def detect_onset(self, audio_chunk: np.ndarray, sample_rate: int,
                      timestamp: float) -> dict:
@@ -24,32 +47,50 @@ class TimingAnalyzer:
         Detect note onsets for timing analysis
         
         Args:
-            audio_chunk: Audio data
+            audio_chunk: Audio data following the previous chunk
             sample_rate: Sample rate in Hz
-            timestamp: Current timestamp
+            timestamp: Time of the chunk's first sample in seconds
             
         Returns:
-            Dictionary with onset detection results
+            Dictionary with onset detection results ('onsets' holds the
+            onset times found, which may lie in the previous chunk)
+        """
+        energy = float(np.dot(audio_chunk, audio_chunk))
+        return self._add_block(audio_chunk, sample_rate, timestamp, energy)
+    
+    def analyze_frame(self, frame: FeatureFrame) -> dict:
         """
-        # Simple energy-based onset detection
-        energy = np.sum(audio_chunk ** 2)
-        threshold = 0.01  # Tolerant threshold
+        Detect note onsets from a block's shared features
         
-        is_onset = energy > threshold
+        The onset detector still reads frame.audio: it needs hop-sized
+        frames, which are finer than the block-level spectrum.
         
-        if is_onset and (not self.onset_times or 
-                        timestamp - self.onset_times[-1] > 0.1):  # Minimum 100ms between onsets
-            self.onset_times.append(timestamp)
+        Args:
+            frame: FeatureFrame of the block
             
+        Returns:
+            Dictionary with onset detection results (as detect_onset())
+        """
+        return self._add_block(frame.audio, frame.sample_rate, frame.timestamp, frame.energy)
+    
+    def _add_block(self, audio_chunk: np.ndarray, sample_rate: int,
+                   timestamp: float, energy: float) -> dict:
+        """Run the onset detector on one block and record its onsets"""
+        onsets = self.onset_detector.detect(audio_chunk, sample_rate, timestamp)
+        
+        for onset in onsets:
             # Calculate interval if we have previous onset
-            if len(self.onset_times) > 1:
-                interval = self.onset_times[-1] - self.onset_times[-2]
+            if self.onset_times:
+                interval = onset - self.onset_times[-1]
                 self.intervals.append(interval)
+                self.interval_stats.add(interval)
+            self.onset_times.append(onset)
         
         return {
-            'is_onset': is_onset,
+            'is_onset': bool(onsets),
             'energy': energy,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            'onsets': onsets
         }
     
     def analyze_timing(self, expected_timing: float = None) -> dict:
@@ -69,8 +110,9 @@ class TimingAnalyzer:
                 'timing_variance': 0
             }
         
-        avg_interval = np.mean(self.intervals) if self.intervals else 0
-        timing_variance = np.std(self.intervals) if len(self.intervals) > 1 else 0
+        stats = self.interval_stats
+        avg_interval = stats.mean if stats.count else 0
+        timing_variance = stats.std if stats.count > 1 else 0
         
         # Calculate score based on consistency
         # Low variance = high score
@@ -93,7 +135,8 @@ class TimingAnalyzer:
         Returns:
             Dictionary with rhythm analysis
         """
-        if len(self.intervals) < 2:
+        stats = self.interval_stats
+        if stats.count < 2:
             return {
                 'score': 50,
                 'consistency': 0.5,
@@ -101,12 +144,11 @@ class TimingAnalyzer:
             }
         
         # Calculate rhythm consistency
-        intervals = np.array(self.intervals)
-        mean_interval = np.mean(intervals)
+        mean_interval = stats.mean
         
         # Coefficient of variation for consistency
         if mean_interval > 0:
-            cv = np.std(intervals) / mean_interval
+            cv = stats.std / mean_interval
             consistency = max(0, 1 - cv)
         else:
             cv = 0  # Default to 0 if mean is 0
@@ -127,5 +169,7 @@ class TimingAnalyzer:
     
     def reset(self):
         """Reset timing history"""
-        self.onset_times = []
-        self.intervals = []
+        self.onset_times.clear()
+        self.intervals.clear()
+        self.interval_stats.reset()
+        self.onset_detector.reset()
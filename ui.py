@@ -11,6 +11,7 @@ from typing import Dict
 import config
 from themes import get_theme, get_score_color, Icons, VisualFeedback, format_with_theme, Colors
 from achievements import AchievementSystem
+from render_loop import RenderThread
 
 
 class HonorHeroUI:
@@ -49,6 +50,11 @@ class HonorHeroUI:
         
         self.engine = HonorHero()
         self.last_update_time = 0
+        
+        # The screen is drawn on its own thread so terminal output never
+        # delays the engine; only new snapshots are drawn
+        self.render_thread = RenderThread(self.render_snapshot, self.engine.snapshots,
+                                          fps=config.UI_TARGET_FPS, redraw_idle=False)
         self.previous_score = 0
         
     def clear_screen(self):
@@ -72,6 +78,15 @@ class HonorHeroUI:
             return
         
         self.last_update_time = current_time
+        self.draw_update(metrics)
+    
+    def render_snapshot(self, snapshot: Dict, fresh: bool):
+        """Render thread frame: redraw when the engine published new metrics"""
+        if fresh:
+            self.draw_update(snapshot)
+    
+    def draw_update(self, metrics: Dict):
+        """Draw the real-time metrics screen"""
         self.clear_screen()
         
         honor_score = metrics.get('honor_score', 0)
@@ -238,8 +253,9 @@ class HonorHeroUI:
             duration = self.mode['duration']
         
         try:
-            # Start engine
-            self.engine.start_performance(self.display_update)
+            # Start the engine and draw its snapshots on the render thread
+            self.engine.start_performance()
+            self.render_thread.start()
             
             # Run for specified duration or until interrupted
             if duration:
@@ -254,6 +270,7 @@ class HonorHeroUI:
             
         finally:
             # Stop and show results
+            self.render_thread.stop()
             results = self.engine.stop_performance()
             self.display_final_results(results)
 
@@ -182,14 +182,13 @@ def print_weekly_view(history):
 
 def get_tier_for_score(score):
     """Get the tier name for a given score"""
-    import config
+    from scoring_system import TIER_NAMES, tier_index
     
-    for tier_name, (min_score, max_score) in config.SCORE_TIERS.items():
-        if min_score <= score <= max_score:
-            return tier_name
+    # Fallback for scores outside the 0-100 scale
+    if not 0 <= score <= 100:
+        return "N/A"
     
-    # Fallback for scores outside defined ranges
-    return "N/A"
+    return TIER_NAMES[tier_index(score)]
 
 
 def main():
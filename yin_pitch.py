@@ -0,0 +1,149 @@
+"""
+YIN Pitch Detection Module
+Low-latency monophonic pitch detector implemented with NumPy only
+"""
+
+import numpy as np
+from typing import Tuple
+import config
+from fft_utils import irfft_into, rfft_into
+
+
+class YinPitchDetector:
+    """
+    YIN fundamental frequency estimator
+    
+    Follows de Cheveigné & Kawahara (2002): the difference function is
+    computed with one FFT cross-correlation plus cumulative energies, then
+    normalized by its cumulative mean (CMNDF). The first dip below the
+    threshold gives the period, refined by parabolic interpolation.
+    Confidence is 1 - CMNDF at the chosen period.
+    """
+    
+    def __init__(self, fmin: float = config.PITCH_FMIN,
+                 fmax: float = config.PITCH_FMAX,
+                 threshold: float = config.YIN_THRESHOLD):
+        self.fmin = fmin
+        self.fmax = fmax
+        self.threshold = threshold
+        self._plan_key = None
+    
+    def _plan(self, block_size: int, sample_rate: int):
+        """Precompute lag range and FFT size for a block size / sample rate"""
+        key = (block_size, sample_rate)
+        if key == self._plan_key:
+            return
+        
+        # Longest lag must leave room for an integration window of equal size
+        self.tau_max = min(int(sample_rate / self.fmin), block_size // 2)
+        self.tau_min = max(2, int(sample_rate / self.fmax))
+        self.window = block_size - self.tau_max
+        self.n_fft = 1 << int(np.ceil(np.log2(block_size + self.window)))
+        self.lags = np.arange(1, self.tau_max + 1, dtype=np.float64)
+        
+        # Work buffers, reused for every block of this size
+        lags = self.tau_max + 1
+        self.samples = np.zeros(block_size, dtype=np.float64)
+        self.spectrum = np.zeros(self.n_fft // 2 + 1, dtype=np.complex128)
+        self.window_spectrum = np.zeros(self.n_fft // 2 + 1, dtype=np.complex128)
+        self.correlation = np.zeros(self.n_fft, dtype=np.float64)
+        self.energy = np.zeros(block_size + 1, dtype=np.float64)
+        self.diff = np.zeros(lags, dtype=np.float64)
+        self.cumulative = np.zeros(self.tau_max, dtype=np.float64)
+        self.normalized = np.zeros(lags, dtype=np.float64)
+        self.positive = np.zeros(self.tau_max, dtype=bool)
+        self.empty = np.zeros(self.tau_max, dtype=bool)
+        self.below = np.zeros(lags, dtype=bool)
+        self._plan_key = key
+    
+    def difference(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """
+        YIN difference function d(tau) for tau = 0..tau_max
+        
+        d(tau) = E(0) + E(tau) - 2 r(tau), where E(tau) is the energy of the
+        window starting at tau and r the cross-correlation, computed via FFT.
+        The result is a work buffer, overwritten by the next call.
+        """
+        x = self.samples
+        np.copyto(x, audio_chunk)
+        w = self.window
+        lags = self.tau_max + 1
+        
+        rfft_into(x, self.spectrum, self.n_fft)
+        rfft_into(x[:w], self.window_spectrum, self.n_fft)
+        np.conjugate(self.window_spectrum, out=self.window_spectrum)
+        np.multiply(self.spectrum, self.window_spectrum, out=self.spectrum)
+        irfft_into(self.spectrum, self.correlation, self.n_fft)
+        corr = self.correlation[:lags]
+        
+        # energy[i] = sum of x[:i] squared
+        energy = self.energy
+        np.multiply(x, x, out=energy[1:])
+        np.add.accumulate(energy[1:], out=energy[1:])
+        
+        diff = self.diff
+        np.subtract(energy[w:w + lags], energy[:lags], out=diff)
+        diff += energy[w]
+        corr *= 2.0
+        diff -= corr
+        np.maximum(diff, 0.0, out=diff)
+        return diff
+    
+    def cmndf(self, diff: np.ndarray) -> np.ndarray:
+        """Cumulative mean normalized difference function (a work buffer)"""
+        cumulative = np.add.accumulate(diff[1:], out=self.cumulative)
+        normalized = self.normalized
+        normalized[0] = 1.0
+        np.multiply(diff[1:], self.lags, out=normalized[1:])
+        np.greater(cumulative, 0.0, out=self.positive)
+        np.divide(normalized[1:], cumulative, out=normalized[1:], where=self.positive)
+        np.logical_not(self.positive, out=self.empty)
+        np.copyto(normalized[1:], 1.0, where=self.empty)
+        return normalized
+    
+    def estimate(self, audio_chunk: np.ndarray, sample_rate: int) -> Tuple[float, float]:
+        """
+        Estimate the pitch of an audio block
+        
+        Args:
+            audio_chunk: 1-D audio data
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            (frequency, confidence): frequency in Hz (0 when unvoiced) and
+            confidence in the range 0-1
+        """
+        if audio_chunk.ndim != 1:
+            audio_chunk = np.ravel(audio_chunk)
+        self._plan(len(audio_chunk), sample_rate)
+        if self.window < self.tau_min:
+            return 0.0, 0.0
+        
+        diff = self.difference(audio_chunk)
+        if diff[1:].max() <= 1e-12:
+            return 0.0, 0.0  # Silence / DC
+        
+        cmnd = self.cmndf(diff)
+        search = cmnd[self.tau_min:]
+        
+        # First dip below the threshold, followed down to its local minimum
+        below = np.less(search, self.threshold, out=self.below[self.tau_min:])
+        tau = int(below.argmax())
+        if below[tau]:
+            while tau + 1 < search.size and search[tau + 1] < search[tau]:
+                tau += 1
+        else:
+            tau = int(search.argmin())
+        tau += self.tau_min
+        
+        confidence = min(max(1.0 - float(cmnd[tau]), 0.0), 1.0)
+        
+        # Parabolic interpolation around the minimum
+        period = float(tau)
+        if 0 < tau < self.tau_max:
+            left, center, right = cmnd[tau - 1], cmnd[tau], cmnd[tau + 1]
+            denominator = left - 2 * center + right
+            if denominator > 0:
+                period += 0.5 * (left - right) / denominator
+        
+        return float(sample_rate / period), confidence